@@ -1,9 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import calendar
+from datetime import date
+
 from odoo.exceptions import UserError
 
 from odoo import _, api, fields, models
 
+# BIR forms whose tax due is computed from the General Ledger by the
+# ipai_bir_compliance module (read from its bir.tax.ledger when installed)
+LEDGER_FORM_MODELS = {
+    "1601c": "bir.form.1601c",
+    "2550q": "bir.form.2550q",
+}
+
 
 class FinanceBIRComplianceTask(models.Model):
     """
@@ -208,12 +218,51 @@ def _compute_overdue_status(self):
                 task.is_overdue = False
                 task.days_overdue = 0
 
+    def _get_filing_period(self):
+        """(date_from, date_to) covered by the return, based on filing frequency"""
+        self.ensure_one()
+        end = self.period_id.end_date
+        if self.filing_frequency == "quarterly":
+            last_month = ((end.month - 1) // 3 + 1) * 3
+            return (
+                date(end.year, last_month - 2, 1),
+                date(end.year, last_month, calendar.monthrange(end.year, last_month)[1]),
+            )
+        if self.filing_frequency == "annually":
+            return date(end.year, 1, 1), date(end.year, 12, 31)
+        return self.period_id.start_date, end
+
+    def action_compute_tax_amount(self):
+        """
+        Fill tax_amount from the BIR tax ledger (ipai_bir_compliance)
+        All tasks of the same form are computed with one aggregation query
+        """
+        for bir_form, model_name in LEDGER_FORM_MODELS.items():
+            tasks = self.filtered(
+                lambda t: t.bir_form == bir_form and t.period_id.end_date
+            )
+            if not tasks or model_name not in self.env:
+                continue
+
+            periods = {task: task._get_filing_period() for task in tasks}
+            tax_due = self.env[model_name].sudo()._tax_due_for_periods(
+                [(task.company_id, *period) for task, period in periods.items()]
+            )
+            for task, (date_from, date_to) in periods.items():
+                task.tax_amount = tax_due.get(
+                    (task.company_id.id, date_from, date_to), 0.0
+                )
+
     def action_prepare(self):
         """Start preparing the BIR form"""
         for task in self:
             if task.state != "pending":
                 raise UserError(_("Only pending tasks can be prepared."))
 
+        # Pre-fill amounts the General Ledger already knows
+        self.filtered(lambda t: not t.tax_amount).action_compute_tax_amount()
+
+        for task in self:
             task.write(
                 {
                     "state": "preparing",
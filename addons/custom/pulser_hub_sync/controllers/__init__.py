@@ -0,0 +1 @@
+from . import github_webhook
@@ -2,22 +2,16 @@
 import hmac
 import json
 import logging
-import os
-from datetime import datetime, timedelta
+from datetime import datetime
 
-import jwt
 import requests
 from odoo.http import request
 
 from odoo import http
 
-_logger = logging.getLogger(__name__)
+from ..models.github_token_manager import GITHUB_APP_ID, token_manager
 
-# GitHub App credentials from environment
-GITHUB_APP_ID = os.getenv("GITHUB_APP_ID", "2191216")
-GITHUB_APP_PEM_PATH = os.getenv(
-    "GITHUB_APP_PEM_PATH", os.path.expanduser("~/.github/apps/pulser-hub.pem")
-)
+_logger = logging.getLogger(__name__)
 
 # Note: CLIENT_ID and CLIENT_SECRET only needed if using OAuth user flow (we use JWT instead)
 
@@ -164,61 +158,50 @@ def commit_file_api(self, **kwargs):
             return {"status": "error", "message": str(e)}
 
     def _generate_jwt(self):
-        """Generate GitHub App JWT for authentication"""
+        """Generate GitHub App JWT for authentication (cached, see token_manager)"""
         try:
-            with open(GITHUB_APP_PEM_PATH) as pem_file:
-                private_key = pem_file.read()
-
-            now = datetime.utcnow()
-            payload = {
-                "iat": int(now.timestamp()) - 60,  # Issued 60 seconds ago
-                "exp": int(
-                    (now + timedelta(minutes=10)).timestamp()
-                ),  # Expires in 10 minutes
-                "iss": GITHUB_APP_ID,
-            }
-
-            token = jwt.encode(payload, private_key, algorithm="RS256")
-            return token
+            return token_manager.app_jwt()
         except Exception as e:
             _logger.error(f"Failed to generate JWT: {e}")
             return None
 
     def _get_installation_token(self, installation_id):
         """Get installation access token for API calls"""
-        jwt_token = self._generate_jwt()
-        if not jwt_token:
-            return None
-
         try:
-            response = requests.post(
-                f"https://api.github.com/app/installations/{installation_id}/access_tokens",
-                headers={
-                    "Authorization": f"Bearer {jwt_token}",
-                    "Accept": "application/vnd.github+json",
-                },
-            )
-            response.raise_for_status()
-            return response.json().get("token")
+            return token_manager.installation_token(installation_id)[0]
         except Exception as e:
             _logger.error(f"Failed to get installation token: {e}")
             return None
 
+    def _get_webhook_secret(self):
+        """Webhook secret, cached per worker (see WEBHOOK_SECRET_TTL)"""
+
+        def load():
+            # Note: Webhook secret should be stored in github.integration model
+            integration = request.env["github.integration"].sudo().search([], limit=1)
+            return integration.webhook_secret or None
+
+        return token_manager.webhook_secret(request.env.cr.dbname, load)
+
     def _verify_webhook_signature(self, payload_body, signature_header):
         """Verify GitHub webhook signature using HMAC-SHA256"""
-        # Note: Webhook secret should be stored in github.integration model
-        integration = request.env["github.integration"].sudo().search([], limit=1)
-        if not integration or not integration.webhook_secret:
+        secret = self._get_webhook_secret()
+        if not secret:
             _logger.warning("No webhook secret configured")
             return False
 
-        webhook_secret = integration.webhook_secret.encode("utf-8")
+        webhook_secret = secret.encode("utf-8")
         hash_object = hmac.new(
             webhook_secret, msg=payload_body, digestmod=hashlib.sha256
         )
         expected_signature = "sha256=" + hash_object.hexdigest()
 
-        return hmac.compare_digest(expected_signature, signature_header)
+        if hmac.compare_digest(expected_signature, signature_header):
+            return True
+
+        # The secret may have been rotated on another worker
+        token_manager.invalidate_webhook_secret(request.env.cr.dbname)
+        return False
 
     @http.route(
         "/odoo/github/auth/callback",
@@ -251,9 +234,9 @@ def github_oauth_callback(self, **kwargs):
 
         try:
             # Get installation token using JWT (no OAuth needed!)
-            installation_token = self._get_installation_token(installation_id)
-            if not installation_token:
-                raise Exception("Failed to get installation token")
+            installation_token, token_expires_at = token_manager.installation_token(
+                installation_id
+            )
 
             # Fetch installation details
             install_response = requests.get(
@@ -277,7 +260,7 @@ def github_oauth_callback(self, **kwargs):
                 integration.write(
                     {
                         "installation_token": installation_token,
-                        "token_expires_at": datetime.utcnow() + timedelta(hours=1),
+                        "token_expires_at": token_expires_at,
                         "account_login": install_data["account"]["login"],
                         "repository_selection": install_data.get(
                             "repository_selection", "all"
@@ -290,7 +273,7 @@ def github_oauth_callback(self, **kwargs):
                     {
                         "installation_id": installation_id,
                         "installation_token": installation_token,
-                        "token_expires_at": datetime.utcnow() + timedelta(hours=1),
+                        "token_expires_at": token_expires_at,
                         "account_login": install_data["account"]["login"],
                         "repository_selection": install_data.get(
                             "repository_selection", "all"
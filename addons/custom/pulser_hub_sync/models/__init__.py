@@ -0,0 +1 @@
+from . import github_token_manager, github_integration, github_webhook_event
@@ -1,20 +1,13 @@
 import base64
 import logging
-import os
-from datetime import datetime, timedelta
 
-import jwt
 import requests
 
 from odoo import api, fields, models
 
-_logger = logging.getLogger(__name__)
+from .github_token_manager import GITHUB_API, token_manager
 
-GITHUB_API = "https://api.github.com"
-GITHUB_APP_ID = os.getenv("GITHUB_APP_ID", "2191216")
-GITHUB_APP_PEM_PATH = os.getenv(
-    "GITHUB_APP_PEM_PATH", os.path.expanduser("~/.github/apps/pulser-hub.pem")
-)
+_logger = logging.getLogger(__name__)
 
 
 class GitHubIntegration(models.Model):
@@ -72,19 +65,26 @@ def refresh_installation_token(self, installation_id):
         if not integration:
             return False
 
-        # Check if token is expired or will expire soon (within 10 minutes)
-        if (
-            integration.token_expires_at
-            and integration.token_expires_at
-            > datetime.utcnow().replace(minute=datetime.utcnow().minute + 10)
-        ):
-            return True  # Token still valid
-
-        # Generate new JWT and get fresh installation token
-        # (Implementation would call the controller's _get_installation_token method)
-        # For now, mark as needing refresh
-        integration.write({"token_expires_at": False})
-        return False
+        try:
+            integration._get_installation_token()
+        except Exception:
+            integration.write({"token_expires_at": False})
+            return False
+        return True
+
+    def write(self, vals):
+        if "webhook_secret" in vals:
+            token_manager.invalidate_webhook_secret(self.env.cr.dbname)
+        if "installation_token" in vals and not vals["installation_token"]:
+            for record in self:
+                token_manager.invalidate(record.installation_id)
+        return super().write(vals)
+
+    def unlink(self):
+        token_manager.invalidate_webhook_secret(self.env.cr.dbname)
+        for record in self:
+            token_manager.invalidate(record.installation_id)
+        return super().unlink()
 
     def action_view_webhooks(self):
         """Open webhook events for this integration"""
@@ -101,64 +101,38 @@ def action_view_webhooks(self):
     # ========== GitHub API Methods ==========
 
     def _generate_jwt(self):
-        """Generate GitHub App JWT for authentication"""
+        """Generate GitHub App JWT for authentication (cached, see token_manager)"""
         try:
-            with open(GITHUB_APP_PEM_PATH) as pem_file:
-                private_key = pem_file.read()
-
-            now = datetime.utcnow()
-            payload = {
-                "iat": int(now.timestamp()) - 60,
-                "exp": int((now + timedelta(minutes=10)).timestamp()),
-                "iss": GITHUB_APP_ID,
-            }
-
-            token = jwt.encode(payload, private_key, algorithm="RS256")
-            return token
+            return token_manager.app_jwt()
         except Exception as e:
             _logger.error(f"Failed to generate JWT: {e}")
             return None
 
     def _get_installation_token(self):
-        """Get fresh installation token for this integration"""
-        self.ensure_one()
-
-        # Check if current token is still valid (>10 min remaining)
-        if self.installation_token and self.token_expires_at:
-            if self.token_expires_at > datetime.utcnow() + timedelta(minutes=10):
-                return self.installation_token
+        """Get installation token for this integration
 
-        # Generate new token
-        jwt_token = self._generate_jwt()
-        if not jwt_token:
-            raise Exception("Failed to generate JWT")
+        Served from the worker's token cache; falls back to the token stored
+        on the record (refreshed by another worker) and only asks GitHub for a
+        new one shortly before expiry.
+        """
+        self.ensure_one()
 
         try:
-            response = requests.post(
-                f"{GITHUB_API}/app/installations/{self.installation_id}/access_tokens",
-                headers={
-                    "Authorization": f"Bearer {jwt_token}",
-                    "Accept": "application/vnd.github+json",
-                },
-                timeout=20,
+            token, expires_at = token_manager.installation_token(
+                self.installation_id,
+                stored_token=self.installation_token,
+                stored_expires_at=self.token_expires_at,
             )
-            response.raise_for_status()
-            data = response.json()
-
-            # Update stored token
-            self.write(
-                {
-                    "installation_token": data["token"],
-                    "token_expires_at": datetime.utcnow() + timedelta(hours=1),
-                }
-            )
-
-            return data["token"]
-
         except Exception as e:
             _logger.error(f"Failed to get installation token: {e}")
             raise
 
+        # Share a newly issued token with the other workers
+        if token != self.installation_token:
+            self.write({"installation_token": token, "token_expires_at": expires_at})
+
+        return token
+
     def create_issue(self, owner, repo, title, body="", labels=None, assignees=None):
         """
         Create a GitHub issue
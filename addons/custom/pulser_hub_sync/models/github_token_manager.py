@@ -0,0 +1,195 @@
+"""Shared GitHub App credentials cache (private key, app JWT, installation tokens)"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import requests
+
+_logger = logging.getLogger(__name__)
+
+GITHUB_API = "https://api.github.com"
+GITHUB_APP_ID = os.getenv("GITHUB_APP_ID", "2191216")
+GITHUB_APP_PEM_PATH = os.getenv(
+    "GITHUB_APP_PEM_PATH", os.path.expanduser("~/.github/apps/pulser-hub.pem")
+)
+
+# GitHub accepts app JWTs for at most 10 minutes; reissue this long before
+JWT_LIFETIME = 600
+JWT_REFRESH_MARGIN = 60
+# Installation tokens live 1 hour; stop handing one out this close to expiry
+INSTALLATION_TOKEN_MARGIN = timedelta(minutes=5)
+# Seconds a webhook secret is trusted before it is read again; bounds how long
+# another worker keeps verifying with a secret changed elsewhere
+WEBHOOK_SECRET_TTL = int(os.getenv("GITHUB_WEBHOOK_SECRET_TTL", "300"))
+
+
+class GitHubTokenManager:
+    """
+    Per-worker GitHub App credentials
+
+    Every GitHub call used to read the PEM, sign a fresh RS256 JWT and POST
+    /access_tokens. The parsed key is now kept until the PEM file changes, the
+    JWT is reused for its lifetime and installation tokens are reused until
+    shortly before they expire, so a warm worker goes straight to the API.
+    """
+
+    def __init__(self, app_id=GITHUB_APP_ID, pem_path=GITHUB_APP_PEM_PATH):
+        self.app_id = app_id
+        self.pem_path = pem_path
+        self._lock = threading.Lock()
+        self._install_locks = {}  # installation_id -> Lock (one refresh at a time)
+        self._key = None  # (mtime_ns, private key)
+        self._jwt = None  # (token, exp)
+        self._tokens = {}  # installation_id -> (token, expires_at naive UTC)
+        self._secrets = {}  # dbname -> (secret, cached_at)
+
+    # ---------- App JWT ----------
+
+    def private_key(self):
+        """Private key parsed once per PEM file version"""
+        mtime = os.stat(self.pem_path).st_mtime_ns
+        with self._lock:
+            if self._key and self._key[0] == mtime:
+                return self._key[1]
+
+        with open(self.pem_path, "rb") as pem_file:
+            pem = pem_file.read()
+        try:
+            from cryptography.hazmat.primitives.serialization import (
+                load_pem_private_key,
+            )
+
+            key = load_pem_private_key(pem, password=None)
+        except ImportError:
+            key = pem  # PyJWT parses it on every encode
+
+        with self._lock:
+            self._key = (mtime, key)
+            self._jwt = None
+        return key
+
+    def app_jwt(self):
+        """App JWT, signed again only when the current one nears expiry"""
+        key = self.private_key()
+        now = int(time.time())
+        with self._lock:
+            if self._jwt and self._jwt[1] - JWT_REFRESH_MARGIN > now:
+                return self._jwt[0]
+
+        payload = {
+            "iat": now - 60,  # Issued 60 seconds ago (clock drift)
+            "exp": now + JWT_LIFETIME - 60,
+            "iss": self.app_id,
+        }
+        token = jwt.encode(payload, key, algorithm="RS256")
+        with self._lock:
+            self._jwt = (token, payload["exp"])
+        return token
+
+    # ---------- Installation tokens ----------
+
+    def installation_token(self, installation_id, stored_token=None, stored_expires_at=None):
+        """
+        Installation access token for API calls
+
+        Args:
+            installation_id: GitHub App installation ID
+            stored_token: Token persisted on github.integration, if any
+            stored_expires_at: Its expiry (naive UTC), shared by other workers
+
+        Returns:
+            tuple: (token, expires_at naive UTC)
+        """
+        installation_id = str(installation_id)
+        cached = self._valid_token(installation_id)
+        if cached:
+            return cached
+
+        if stored_token and stored_expires_at and self._fresh(stored_expires_at):
+            with self._lock:
+                self._tokens[installation_id] = (stored_token, stored_expires_at)
+            return stored_token, stored_expires_at
+
+        with self._lock:
+            install_lock = self._install_locks.setdefault(installation_id, threading.Lock())
+        with install_lock:
+            # Another thread may have refreshed while we waited
+            cached = self._valid_token(installation_id)
+            if cached:
+                return cached
+
+            response = requests.post(
+                f"{GITHUB_API}/app/installations/{installation_id}/access_tokens",
+                headers={
+                    "Authorization": f"Bearer {self.app_jwt()}",
+                    "Accept": "application/vnd.github+json",
+                },
+                timeout=20,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            expires_at = _parse_github_time(data.get("expires_at")) or (
+                datetime.utcnow() + timedelta(hours=1)
+            )
+            with self._lock:
+                self._tokens[installation_id] = (data["token"], expires_at)
+            _logger.info(
+                f"Issued installation token for {installation_id}, expires {expires_at}"
+            )
+            return data["token"], expires_at
+
+    def invalidate(self, installation_id=None):
+        """Drop cached installation tokens (all when no installation given)"""
+        with self._lock:
+            if installation_id is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(str(installation_id), None)
+
+    def _valid_token(self, installation_id):
+        with self._lock:
+            entry = self._tokens.get(installation_id)
+        if entry and self._fresh(entry[1]):
+            return entry
+        return None
+
+    @staticmethod
+    def _fresh(expires_at):
+        return expires_at - INSTALLATION_TOKEN_MARGIN > datetime.utcnow()
+
+    # ---------- Webhook secret ----------
+
+    def webhook_secret(self, dbname, loader):
+        """Webhook secret for a database, read through loader() at most every TTL"""
+        with self._lock:
+            entry = self._secrets.get(dbname)
+        if entry and time.monotonic() - entry[1] < WEBHOOK_SECRET_TTL:
+            return entry[0]
+
+        secret = loader()
+        with self._lock:
+            self._secrets[dbname] = (secret, time.monotonic())
+        return secret
+
+    def invalidate_webhook_secret(self, dbname):
+        with self._lock:
+            self._secrets.pop(dbname, None)
+
+
+def _parse_github_time(value):
+    """'2016-07-11T22:14:10Z' -> naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+token_manager = GitHubTokenManager()
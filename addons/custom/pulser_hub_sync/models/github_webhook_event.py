@@ -1,8 +1,6 @@
 import json
 import logging
 
-from odoo.addons.queue_job.job import job
-
 from odoo import api, fields, models
 
 _logger = logging.getLogger(__name__)
@@ -55,7 +53,6 @@ def action_view_payload(self):
             "target": "new",
         }
 
-    @job
     def process_webhook_async(self):
         """Process webhook event asynchronously via queue_job"""
         self.ensure_one()
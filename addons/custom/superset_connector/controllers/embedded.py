@@ -187,34 +187,13 @@ def _get_or_create_token(self, dashboard, user, force_new=False):
         Returns:
             superset.token record
         """
-        Token = request.env["superset.token"].sudo()
-
-        if not force_new:
-            # Try to find existing valid token
-            existing_token = Token.search(
-                [
-                    ("dashboard_id", "=", dashboard.id),
-                    ("user_id", "=", user.id),
-                    ("is_active", "=", True),
-                    ("expires_at", ">", datetime.now()),
-                ],
-                limit=1,
-            )
-
-            if existing_token:
-                return existing_token
-
-        # Create new token
-        token = Token.create(
-            {
-                "dashboard_id": dashboard.id,
-                "user_id": user.id,
-                "config_id": dashboard.config_id.id,
-            }
+        # Cached lookup + buffered usage accounting; see superset.token
+        return (
+            request.env["superset.token"]
+            .sudo()
+            .get_or_create_token(dashboard.id, user_id=user.id, force_new=force_new)
         )
 
-        return token
-
     def _validate_filter_param(self, key, value):
         """
         Validate and sanitize filter parameters to prevent URL injection
@@ -1,15 +1,189 @@
 """Superset SSO Token Management"""
 
 import logging
+import os
 import secrets
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import partial
 
 from odoo.exceptions import ValidationError
+from odoo.tools import config
 
 from odoo import api, fields, models
 
 _logger = logging.getLogger(__name__)
 
+# Seconds between bulk usage flushes from each worker
+USAGE_FLUSH_INTERVAL = int(config.get("superset_usage_flush_interval", 30))
+# Optional Redis URL; hits from every worker are then counted in Redis and
+# flushed by the cron instead of per worker
+USAGE_REDIS_URL = config.get("superset_usage_redis_url") or os.environ.get(
+    "SUPERSET_USAGE_REDIS_URL"
+)
+# Seconds a cached (dashboard, user) -> token entry is trusted; bounds how long
+# another worker may keep serving a token invalidated elsewhere
+TOKEN_CACHE_TTL = int(config.get("superset_token_cache_ttl", 60))
+TOKEN_CACHE_MAX_ENTRIES = 10000
+# Stop serving a cached token this close to its expiry
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+class TokenUsageBuffer:
+    """
+    Per-worker usage counters for guest tokens
+
+    get_or_create_token records hits here instead of writing the token row on
+    every dashboard view; the counters are applied in bulk by
+    superset.token.flush_token_usage(). With a Redis URL configured the
+    counters live in Redis so the cron can flush hits from all workers.
+    """
+
+    def __init__(self, redis_url=None):
+        self._lock = threading.Lock()
+        self._hits = {}  # dbname -> {token_id: [count, last_used_at]}
+        self._last_flush = {}  # dbname -> monotonic time
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except ImportError:
+                _logger.warning(
+                    "redis package not installed, Superset token usage is buffered per worker"
+                )
+
+    def record(self, dbname, token_id, used_at, count=1):
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                pipe.hincrby(self._key(dbname, "count"), token_id, count)
+                pipe.hset(self._key(dbname, "last"), token_id, used_at.isoformat())
+                pipe.execute()
+                return
+            except Exception as e:
+                _logger.warning(f"Redis usage counter failed, buffering locally: {e!s}")
+
+        with self._lock:
+            hits = self._hits.setdefault(dbname, {})
+            entry = hits.setdefault(token_id, [0, used_at])
+            entry[0] += count
+            entry[1] = max(entry[1], used_at)
+            self._last_flush.setdefault(dbname, time.monotonic())
+
+    def flush_due(self, dbname):
+        """Whether this worker's local counters are due for a flush"""
+        with self._lock:
+            started = self._last_flush.get(dbname)
+            return (
+                started is not None
+                and time.monotonic() - started >= USAGE_FLUSH_INTERVAL
+            )
+
+    def drain(self, dbname):
+        """Take all pending hits: {token_id: (count, last_used_at)}"""
+        with self._lock:
+            hits = self._hits.pop(dbname, {})
+            self._last_flush.pop(dbname, None)
+        pending = {token_id: tuple(entry) for token_id, entry in hits.items()}
+
+        if self._redis is not None:
+            try:
+                for token_id, (count, last_used) in self._drain_redis(dbname).items():
+                    if token_id in pending:
+                        count += pending[token_id][0]
+                        last_used = max(last_used, pending[token_id][1])
+                    pending[token_id] = (count, last_used)
+            except Exception as e:
+                _logger.warning(f"Could not drain Redis usage counters: {e!s}")
+
+        return pending
+
+    def restore(self, dbname, pending):
+        """Put drained hits back, e.g. when the flushing transaction rolled back"""
+        for token_id, (count, last_used) in pending.items():
+            self.record(dbname, token_id, last_used, count)
+
+    def _drain_redis(self, dbname):
+        # RENAME is atomic: hits recorded while we read go to a fresh hash
+        suffix = secrets.token_hex(4)
+        keys = {}
+        for kind in ("count", "last"):
+            key = self._key(dbname, kind)
+            if self._redis.exists(key):
+                draining = f"{key}:draining:{suffix}"
+                self._redis.rename(key, draining)
+                keys[kind] = draining
+        if not keys:
+            return {}
+
+        counts = self._redis.hgetall(keys["count"]) if "count" in keys else {}
+        lasts = self._redis.hgetall(keys["last"]) if "last" in keys else {}
+        self._redis.delete(*keys.values())
+
+        now = datetime.now()
+        return {
+            int(token_id): (
+                int(count),
+                datetime.fromisoformat(lasts[token_id].decode())
+                if token_id in lasts
+                else now,
+            )
+            for token_id, count in counts.items()
+        }
+
+    @staticmethod
+    def _key(dbname, kind):
+        return f"superset:token_usage:{dbname}:{kind}"
+
+
+class TokenCache:
+    """Per-worker (dashboard, user) -> valid token id cache, expiry aware"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # (dbname, dashboard_id, user_id) -> (token_id, expires_at, cached_at)
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return None
+        token_id, expires_at, cached_at = entry
+        if (
+            expires_at - TOKEN_EXPIRY_MARGIN <= now
+            or time.monotonic() - cached_at >= TOKEN_CACHE_TTL
+        ):
+            self.discard(key)
+            return None
+        return token_id
+
+    def set(self, key, token_id, expires_at):
+        with self._lock:
+            if len(self._entries) >= TOKEN_CACHE_MAX_ENTRIES:
+                self._entries.clear()
+            self._entries[key] = (token_id, expires_at, time.monotonic())
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_tokens(self, dbname, token_ids):
+        token_ids = set(token_ids)
+        with self._lock:
+            for key in [
+                key
+                for key, (token_id, _exp, _at) in self._entries.items()
+                if key[0] == dbname and token_id in token_ids
+            ]:
+                del self._entries[key]
+
+
+usage_buffer = TokenUsageBuffer(USAGE_REDIS_URL)
+token_cache = TokenCache()
+
 
 class SupersetToken(models.Model):
     """Manage Superset guest tokens for SSO authentication"""
@@ -97,8 +271,24 @@ def write(self, vals):
                     f"Field '{field}' cannot be modified after creation"
                 )
 
+        if "is_active" in vals or "expires_at" in vals:
+            self._discard_cached_tokens()
+
         return super().write(vals)
 
+    def unlink(self):
+        self._discard_cached_tokens()
+        return super().unlink()
+
+    def _discard_cached_tokens(self):
+        """Drop these tokens from the cache now and again after commit, in case
+        a concurrent request of this worker cached them in the meantime"""
+        dbname = self.env.cr.dbname
+        token_cache.discard_tokens(dbname, self.ids)
+        self.env.cr.postcommit.add(
+            partial(token_cache.discard_tokens, dbname, list(self.ids))
+        )
+
     def _generate_guest_token(self):
         """
         Generate cryptographically secure guest token
@@ -121,30 +311,38 @@ def get_or_create_token(self, dashboard_id, user_id=None, force_new=False):
 
         Returns:
             superset.token record
+
+        Reusing a token is read-only: the (dashboard, user) -> token lookup is
+        cached per worker and usage (use_count, last_used_at) is buffered and
+        written in bulk by flush_token_usage().
         """
         if not user_id:
             user_id = self.env.user.id
 
+        dbname = self.env.cr.dbname
+        cache_key = (dbname, dashboard_id, user_id)
+        now = fields.Datetime.now()
+
         if not force_new:
-            # Try to find existing valid token
-            existing_token = self.search(
-                [
-                    ("dashboard_id", "=", dashboard_id),
-                    ("user_id", "=", user_id),
-                    ("is_active", "=", True),
-                    ("expires_at", ">", fields.Datetime.now()),
-                ],
-                limit=1,
-            )
+            token_id = token_cache.get(cache_key, now)
+            if token_id:
+                existing_token = self.browse(token_id)
+            else:
+                # Try to find existing valid token
+                existing_token = self.search(
+                    [
+                        ("dashboard_id", "=", dashboard_id),
+                        ("user_id", "=", user_id),
+                        ("is_active", "=", True),
+                        ("expires_at", ">", now),
+                    ],
+                    limit=1,
+                )
+                if existing_token:
+                    self._cache_token_after_commit(cache_key, existing_token)
 
             if existing_token:
-                # Update last used timestamp
-                existing_token.write(
-                    {
-                        "last_used_at": fields.Datetime.now(),
-                        "use_count": existing_token.use_count + 1,
-                    }
-                )
+                self._record_usage(existing_token.id, now)
                 return existing_token
 
         # Get dashboard and config
@@ -161,11 +359,72 @@ def get_or_create_token(self, dashboard_id, user_id=None, force_new=False):
             }
         )
 
+        self._cache_token_after_commit(cache_key, token)
+
         _logger.info(
             f"Created new guest token for user {user_id}, dashboard {dashboard_id}"
         )
         return token
 
+    def _cache_token_after_commit(self, cache_key, token):
+        """Cache token for cache_key once the transaction commits
+
+        A rolled back or retried request must not leave an id without a row
+        behind it in the per-worker cache.
+        """
+        self.env.cr.postcommit.add(
+            partial(token_cache.set, cache_key, token.id, token.expires_at)
+        )
+
+    def _record_usage(self, token_id, used_at):
+        """Count a token use; flushes this worker's counters every few seconds"""
+        dbname = self.env.cr.dbname
+        usage_buffer.record(dbname, token_id, used_at)
+        if usage_buffer.flush_due(dbname):
+            self.flush_token_usage()
+
+    @api.model
+    def flush_token_usage(self):
+        """
+        Apply buffered usage counts in one bulk UPDATE
+
+        Called every few seconds by each worker and by the usage cron (which
+        also drains the Redis counters of all workers when configured).
+
+        Returns:
+            int: Number of tokens updated
+        """
+        dbname = self.env.cr.dbname
+        pending = usage_buffer.drain(dbname)
+        if not pending:
+            return 0
+
+        # Counters are only gone once the UPDATE commits; a rolled back cron
+        # run or request hands them back for the next flush
+        self.env.cr.postrollback.add(partial(usage_buffer.restore, dbname, pending))
+
+        token_ids = list(pending)
+        self.env.cr.execute(
+            """
+            UPDATE superset_token AS t
+               SET use_count = COALESCE(t.use_count, 0) + usage.hits,
+                   last_used_at = GREATEST(t.last_used_at, usage.last_used)
+              FROM unnest(%s::int[], %s::int[], %s::timestamp[])
+                   AS usage(id, hits, last_used)
+             WHERE t.id = usage.id
+            """,
+            (
+                token_ids,
+                [pending[token_id][0] for token_id in token_ids],
+                [pending[token_id][1] for token_id in token_ids],
+            ),
+        )
+        updated = self.env.cr.rowcount
+        self.invalidate_model(["use_count", "last_used_at"])
+
+        _logger.debug(f"Flushed usage for {updated} Superset tokens")
+        return updated
+
     def invalidate_token(self):
         """Invalidate this token"""
         self.ensure_one()
@@ -205,6 +464,8 @@ def get_token_stats(self):
         Returns:
             dict: Token statistics
         """
+        self.flush_token_usage()
+
         total_tokens = self.search_count([])
         active_tokens = self.search_count([("is_active", "=", True)])
         expired_tokens = self.search_count(
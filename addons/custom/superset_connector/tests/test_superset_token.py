@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta
 
+from odoo import fields
 from odoo.exceptions import ValidationError
 from odoo.tests.common import TransactionCase
 
@@ -87,7 +88,69 @@ def test_get_or_create_token_reuse(self):
         )
 
         self.assertEqual(token1.id, token2.id, "Should reuse existing valid token")
+
+        # Usage is buffered and applied in bulk
+        self.env["superset.token"].flush_token_usage()
         self.assertEqual(token2.use_count, 1, "Use count should increment")
+        self.assertTrue(token2.last_used_at, "Last used should be recorded")
+
+    def test_get_or_create_token_reuse_is_read_only(self):
+        """Test that reusing a cached token doesn't write the token row"""
+        Token = self.env["superset.token"]
+        token = Token.get_or_create_token(
+            dashboard_id=self.dashboard.id, user_id=self.test_user.id
+        )
+        Token.flush_token_usage()
+        self.env.cr.postcommit.run()  # The cache is filled on commit
+
+        with self.assertQueryCount(0):
+            for _i in range(3):
+                Token.get_or_create_token(
+                    dashboard_id=self.dashboard.id, user_id=self.test_user.id
+                )
+
+        self.assertEqual(Token.flush_token_usage(), 1)
+        self.assertEqual(token.use_count, 3)
+
+    def test_token_cached_only_after_commit(self):
+        """Test that a rolled back request leaves nothing in the worker cache"""
+        from ..models.superset_token import token_cache
+
+        token = self.env["superset.token"].get_or_create_token(
+            dashboard_id=self.dashboard.id, user_id=self.test_user.id
+        )
+        key = (self.env.cr.dbname, self.dashboard.id, self.test_user.id)
+        now = fields.Datetime.now()
+        self.assertIsNone(token_cache.get(key, now))
+
+        self.env.cr.postcommit.run()
+        self.assertEqual(token_cache.get(key, now), token.id)
+
+    def test_usage_restored_when_flush_rolls_back(self):
+        """Test that usage drained by a rolled back flush is flushed again"""
+        Token = self.env["superset.token"]
+        Token.get_or_create_token(dashboard_id=self.dashboard.id, user_id=self.test_user.id)
+        self.env.cr.postcommit.run()
+        Token.get_or_create_token(dashboard_id=self.dashboard.id, user_id=self.test_user.id)
+
+        self.assertEqual(Token.flush_token_usage(), 1)
+        self.env.cr.postrollback.run()  # As if the flushing transaction rolled back
+
+        self.assertEqual(Token.flush_token_usage(), 1, "Hits should be flushed again")
+        self.assertEqual(Token.flush_token_usage(), 0)
+
+    def test_invalidated_token_not_served_from_cache(self):
+        """Test that invalidating a token evicts it from the worker cache"""
+        token1 = self.env["superset.token"].get_or_create_token(
+            dashboard_id=self.dashboard.id, user_id=self.test_user.id
+        )
+        token1.invalidate_token()
+
+        token2 = self.env["superset.token"].get_or_create_token(
+            dashboard_id=self.dashboard.id, user_id=self.test_user.id
+        )
+
+        self.assertNotEqual(token1.id, token2.id, "Should not reuse invalidated token")
 
     def test_get_or_create_token_force_new(self):
         """Test that force_new creates a new token"""
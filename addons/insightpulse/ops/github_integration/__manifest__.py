@@ -1,6 +1,6 @@
 {
     "name": "GitHub Integration (pulser-hub)",
-    "version": "1.0.0",
+    "version": "1.1.0",
     "category": "Operations",
     "summary": "GitHub webhook and OAuth integration via pulser-hub app",
     "description": """
@@ -11,7 +11,8 @@
 
 Features:
 ---------
-* Webhook endpoint (/odoo/github/webhook) for GitHub events
+* Webhook endpoint (/odoo/github/webhook) for GitHub events, recorded once
+  per delivery and applied in batches
 * OAuth callback handler (/odoo/github/auth/callback)
 * Track pull requests, issues, and commits in Odoo
 * Trigger Odoo automated actions from GitHub events
@@ -54,6 +55,7 @@
         "views/github_issue_views.xml",
         "views/github_webhook_views.xml",
         "data/github_config.xml",
+        "data/ir_cron.xml",
     ],
     "installable": True,
     "application": False,
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Drop duplicate webhook deliveries before the delivery_id unique constraint."""
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    cr.execute(
+        """
+        DELETE FROM github_webhook_event event
+         USING github_webhook_event kept
+         WHERE event.delivery_id = kept.delivery_id
+           AND event.id > kept.id
+        """
+    )
+    _logger.info(f"Removed {cr.rowcount} duplicate GitHub webhook deliveries")
@@ -0,0 +1,8 @@
+from . import (
+    github_api,
+    github_issue,
+    github_pull_request,
+    github_repository,
+    github_webhook,
+    project_task,
+)
@@ -1,11 +1,43 @@
 # -*- coding: utf-8 -*-
 """GitHub webhook event log model."""
 
-from odoo import fields, models
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Deliveries applied per cron run; a full batch re-triggers the cron
+WEBHOOK_BATCH_SIZE = 500
+# Seconds the batch processor waits after a delivery so a burst (e.g. a
+# monorepo merge) is applied as one batch
+WEBHOOK_BATCH_DELAY = 5
+
+# Event type -> batch handler, in processing order (issues before comments so
+# /odoo-sync on an issue opened in the same batch finds it)
+WEBHOOK_HANDLERS = {
+    "pull_request": "_batch_pull_requests",
+    "pull_request_review": "_batch_pull_requests",
+    "issues": "_batch_issues",
+    "push": "_batch_pushes",
+    "issue_comment": "_batch_comments",
+}
+
+PUSH_BRANCHES = ("refs/heads/main", "refs/heads/develop")
+BOT_COMMANDS = ("odoo-sync", "odoo-link", "odoo-status")
 
 
 class GitHubWebhookEvent(models.Model):
-    """Log GitHub webhook events for debugging."""
+    """Log GitHub webhook events for debugging.
+
+    The webhook controller only records deliveries (unique per
+    X-GitHub-Delivery) and returns. Received deliveries are applied in
+    batches by a cron: all events of a batch touching the same PR or issue
+    are folded into one upsert keyed on repository + number.
+    """
 
     _name = "github.webhook.event"
     _description = "GitHub Webhook Event"
@@ -13,7 +45,7 @@ class GitHubWebhookEvent(models.Model):
 
     name = fields.Char("Name", compute="_compute_name", store=True)
     event_type = fields.Char("Event Type", required=True)
-    delivery_id = fields.Char("Delivery ID")
+    delivery_id = fields.Char("Delivery ID", index=True)
 
     payload = fields.Text("Payload")
     status = fields.Selection(
@@ -25,15 +57,416 @@ class GitHubWebhookEvent(models.Model):
         ],
         string="Status",
         default="received",
+        index=True,
     )
+    processed_at = fields.Datetime("Processed At")
 
     error_message = fields.Text("Error Message")
 
+    _sql_constraints = [
+        (
+            "unique_delivery",
+            "unique(delivery_id)",
+            "GitHub delivery already recorded!",
+        )
+    ]
+
     def _compute_name(self):
         """Compute display name."""
         for record in self:
             record.name = f"{record.event_type} - {record.create_date}"
 
+    # ========== Ingestion ==========
+
+    @api.model
+    def _ingest(self, event_type, delivery_id, payload):
+        """
+        Record a raw delivery, once per X-GitHub-Delivery.
+
+        Args:
+            event_type (str): X-GitHub-Event header value
+            delivery_id (str): X-GitHub-Delivery header value
+            payload (bytes): Raw request body
+
+        Returns:
+            github.webhook.event: New event, empty for a redelivery
+        """
+        now = fields.Datetime.now()
+        self.env.cr.execute(
+            """
+            INSERT INTO github_webhook_event
+                   (name, event_type, delivery_id, payload, status,
+                    create_uid, create_date, write_uid, write_date)
+            VALUES (%(name)s, %(event_type)s, %(delivery_id)s, %(payload)s, 'received',
+                    %(uid)s, %(now)s, %(uid)s, %(now)s)
+            ON CONFLICT (delivery_id) DO NOTHING
+            RETURNING id
+            """,
+            {
+                "name": f"{event_type} - {now}",
+                "event_type": event_type,
+                "delivery_id": delivery_id,
+                "payload": payload.decode("utf-8"),
+                "uid": self.env.uid,
+                "now": now,
+            },
+        )
+        row = self.env.cr.fetchone()
+        if not row:
+            _logger.info(f"Ignored redelivery {delivery_id} ({event_type})")
+            return self.browse()
+
+        self._schedule_batch()
+        return self.browse(row[0])
+
+    @api.model
+    def _schedule_batch(self, delay=WEBHOOK_BATCH_DELAY):
+        """Wake the batch processor shortly, coalescing bursts."""
+        cron = self.env.ref(
+            "github_integration.ir_cron_process_webhook_events",
+            raise_if_not_found=False,
+        )
+        if cron:
+            cron.sudo()._trigger(fields.Datetime.now() + timedelta(seconds=delay))
+
+    # ========== Batch processing ==========
+
+    @api.model
+    def _cron_process_webhook_events(self, limit=WEBHOOK_BATCH_SIZE):
+        """Apply received deliveries in arrival order."""
+        self.env.cr.execute(
+            """
+            SELECT id FROM github_webhook_event
+             WHERE status = 'received'
+             ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+            """,
+            (limit,),
+        )
+        events = self.browse([row[0] for row in self.env.cr.fetchall()])
+        if not events:
+            return 0
+
+        events._process_batch()
+
+        if len(events) == limit:
+            self._schedule_batch(delay=0)
+        return len(events)
+
+    def _process_batch(self):
+        """Apply deliveries with one grouped upsert per handler."""
+        now = fields.Datetime.now()
+        groups = defaultdict(list)
+        ignored = self.browse()
+        for event in self.sorted("id"):
+            handler = WEBHOOK_HANDLERS.get(event.event_type)
+            if not handler:
+                ignored |= event
+                continue
+            try:
+                groups[handler].append((event, json.loads(event.payload)))
+            except (TypeError, ValueError) as e:
+                event.write({"status": "error", "error_message": f"Invalid JSON: {e}"})
+
+        if ignored:
+            ignored.write({"status": "ignored", "processed_at": now})
+
+        for handler in dict.fromkeys(WEBHOOK_HANDLERS.values()):
+            if groups.get(handler):
+                self._apply_group(handler, groups[handler], now)
+
+        _logger.info(
+            "Processed %s GitHub deliveries (%s)",
+            len(self),
+            ", ".join(f"{handler}: {len(items)}" for handler, items in groups.items()),
+        )
+
+    def _apply_group(self, handler, items, now):
+        """Run a batch handler; on failure retry deliveries one by one."""
+        events = self.browse([event.id for event, _data in items])
+        try:
+            with self.env.cr.savepoint():
+                getattr(self, handler)(items)
+        except Exception as e:
+            self.env.invalidate_all()
+            if len(items) == 1:
+                _logger.error(f"Error processing {events.event_type}: {str(e)}")
+                events.write({"status": "error", "error_message": str(e)})
+                return
+            _logger.warning(
+                f"Batch {handler} failed ({e}), retrying {len(items)} deliveries individually"
+            )
+            for item in items:
+                self._apply_group(handler, [item], now)
+            return
+
+        events.write({"status": "processed", "processed_at": now, "error_message": False})
+
+    def _batch_pull_requests(self, items):
+        """Fold pull_request and pull_request_review events per PR."""
+        changes = {}
+        for event, data in items:
+            pr = data["pull_request"]
+            key = (data["repository"]["full_name"], pr["number"])
+            change = changes.setdefault(
+                key, {"create": None, "write": {}, "approvals": 0, "triggers": []}
+            )
+
+            if event.event_type == "pull_request_review":
+                if data["review"]["state"] == "approved":
+                    change["approvals"] += 1
+                continue
+
+            action = data["action"]
+            if action == "opened":
+                change["create"] = {
+                    "number": pr["number"],
+                    "title": pr["title"],
+                    "body": pr.get("body", ""),
+                    "repository_name": key[0],
+                    "state": pr["state"],
+                    "author": pr["user"]["login"],
+                    "url": pr["html_url"],
+                    "head_ref": pr["head"]["ref"],
+                    "base_ref": pr["base"]["ref"],
+                    "created_at": _github_datetime(pr["created_at"]),
+                }
+            elif action in ["closed", "merged"]:
+                change["write"].update(
+                    {
+                        "state": "closed",
+                        "merged": pr.get("merged", False),
+                        "closed_at": _github_datetime(pr.get("closed_at")),
+                    }
+                )
+            elif action == "synchronize":
+                change["write"]["updated_at"] = _github_datetime(pr["updated_at"])
+
+            if action in ["opened", "closed"]:
+                change["triggers"].append(f"github_pr_{action}")
+
+        records, _created = self._upsert_by_number(
+            self.env["github.pull.request"], changes
+        )
+
+        for trigger_name in ("github_pr_opened", "github_pr_closed"):
+            triggered = self.env["github.pull.request"].union(
+                *(
+                    records[key]
+                    for key, change in changes.items()
+                    if key in records and trigger_name in change["triggers"]
+                )
+            )
+            if triggered:
+                self._trigger_automated_actions(triggered, trigger_name)
+
+    def _batch_issues(self, items):
+        """Fold issues events per issue."""
+        changes = {}
+        for _event, data in items:
+            issue = data["issue"]
+            # Skip if issue is actually a PR
+            if "pull_request" in issue:
+                continue
+
+            key = (data["repository"]["full_name"], issue["number"])
+            change = changes.setdefault(key, {"create": None, "write": {}})
+
+            if data["action"] == "opened":
+                change["create"] = {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": issue.get("body", ""),
+                    "repository_name": key[0],
+                    "state": issue["state"],
+                    "author": issue["user"]["login"],
+                    "url": issue["html_url"],
+                    "created_at": _github_datetime(issue["created_at"]),
+                }
+            elif data["action"] == "closed":
+                change["write"].update(
+                    {
+                        "state": "closed",
+                        "closed_at": _github_datetime(issue.get("closed_at")),
+                    }
+                )
+
+        _records, created = self._upsert_by_number(self.env["github.issue"], changes)
+
+        # Auto-create Odoo tasks for newly tracked issues
+        if created:
+            self._create_tasks_from_issues(created)
+
+    def _batch_pushes(self, items):
+        """Log significant pushes (main/develop only) in one create."""
+        vals_list = []
+        for _event, data in items:
+            if data["ref"] not in PUSH_BRANCHES:
+                continue
+            head_commit = data.get("head_commit") or {}
+            vals_list.append(
+                {
+                    "repository_name": data["repository"]["full_name"],
+                    "ref": data["ref"],
+                    "commits_count": len(data["commits"]),
+                    "pusher": data["pusher"]["name"],
+                    "head_commit_sha": head_commit.get("id"),
+                    "head_commit_message": head_commit.get("message"),
+                }
+            )
+        if vals_list:
+            self.env["github.push.event"].create(vals_list)
+
+    def _batch_comments(self, items):
+        """Execute bot commands from issue/PR comments."""
+        sync_keys = set()
+        for _event, data in items:
+            body = data["comment"]["body"].strip()
+            if not body.startswith("/"):
+                continue
+
+            parts = body.split()
+            command = parts[0][1:]  # Remove leading /
+            if command not in BOT_COMMANDS:
+                _logger.info(f"Unsupported bot command: {command}")
+                continue
+
+            _logger.info(f"Bot command detected: {command} with args {parts[1:]}")
+            # Example: /odoo-sync - Create Odoo task from GitHub issue
+            if command == "odoo-sync":
+                sync_keys.add(
+                    (data["repository"]["full_name"], data["issue"]["number"])
+                )
+
+        if sync_keys:
+            Issue = self.env["github.issue"]
+            issues = Issue.union(*self._find_by_number(Issue, sync_keys).values())
+            if issues:
+                self._create_tasks_from_issues(issues)
+
+    # ========== Helpers ==========
+
+    def _find_by_number(self, Model, keys):
+        """Existing records for (repository_name, number) keys, in one search."""
+        if not keys:
+            return {}
+        records = Model.search(
+            [
+                ("repository_name", "in", list({repo for repo, _number in keys})),
+                ("number", "in", list({number for _repo, number in keys})),
+            ]
+        )
+        return {
+            (record.repository_name, record.number): record
+            for record in records
+            if (record.repository_name, record.number) in keys
+        }
+
+    def _upsert_by_number(self, Model, changes):
+        """
+        Apply folded changes keyed on (repository_name, number).
+
+        Records are created (in one batch) only when the batch holds their
+        "opened" event; updates for unknown records are dropped, as GitHub
+        only sends them for objects opened before the integration existed.
+
+        Returns:
+            tuple: ({key: record}, newly created records)
+        """
+        records = self._find_by_number(Model, changes)
+
+        to_create = []
+        for key, change in changes.items():
+            record = records.get(key)
+            write = dict(change["write"])
+            if change.get("approvals"):
+                write["approvals"] = (record.approvals if record else 0) + change["approvals"]
+
+            if record:
+                if write:
+                    record.write(write)
+            elif change["create"]:
+                to_create.append((key, dict(change["create"], **write)))
+
+        created = Model.browse()
+        if to_create:
+            created = Model.create([vals for _key, vals in to_create])
+            for (key, _vals), record in zip(to_create, created):
+                records[key] = record
+            _logger.info(f"Created {len(created)} {Model._name} records")
+
+        return records, created
+
+    def _create_tasks_from_issues(self, issues):
+        """Create Odoo project tasks for issues that have none yet."""
+        Task = self.env["project.task"]
+
+        existing = Task.search(
+            [
+                ("github_issue_number", "in", issues.mapped("number")),
+                ("github_repository", "in", list(set(issues.mapped("repository_name")))),
+            ]
+        )
+        linked = {(task.github_repository, task.github_issue_number) for task in existing}
+        issues = issues.filtered(
+            lambda issue: (issue.repository_name, issue.number) not in linked
+        )
+        if not issues:
+            return
+
+        tasks = Task.create(
+            [
+                {
+                    "name": issue.title,
+                    "description": issue.body,
+                    "github_issue_number": issue.number,
+                    "github_issue_url": issue.url,
+                    "github_repository": issue.repository_name,
+                }
+                for issue in issues
+            ]
+        )
+        for issue, task in zip(issues, tasks):
+            issue.odoo_task_id = task
+        _logger.info(f"Created {len(tasks)} Odoo tasks from GitHub issues")
+
+    def _trigger_automated_actions(self, records, trigger_name):
+        """Trigger Odoo automated actions based on GitHub events."""
+        if "base.automation" not in self.env:
+            return
+
+        # Find relevant automated actions (Odoo Studio feature)
+        AutomatedAction = self.env["base.automation"]
+        actions = AutomatedAction.search(
+            [
+                (
+                    "trigger",
+                    "=",
+                    "on_create" if "opened" in trigger_name else "on_write",
+                ),
+                ("model_id.model", "=", records._name),
+                ("active", "=", True),
+            ]
+        )
+
+        for action in actions:
+            try:
+                action._process(records)
+                _logger.info(f"Triggered automated action: {action.name}")
+            except Exception as e:
+                _logger.error(f"Failed to trigger action {action.name}: {str(e)}")
+
+
+def _github_datetime(value):
+    """'2024-01-31T12:00:00Z' -> naive UTC datetime for Datetime fields."""
+    if not value:
+        return False
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 
 class GitHubPushEvent(models.Model):
     """Track push events to main branches."""
@@ -1,6 +1,6 @@
 {
     "name": "InsightPulse Slack Bridge",
-    "version": "18.0.1.0.0",
+    "version": "18.0.1.1.0",
     "category": "Productivity",
     "summary": "Slack integration for InsightPulse AI agencies",
     "description": """
@@ -8,7 +8,8 @@
 =========================
 
 Slack bot integration for multi-agency Finance SSC operations:
-- Event subscriptions (app_mention, message.channels)
+- Event subscriptions (app_mention, message.channels), acknowledged
+  immediately and processed on a queue_job channel
 - Slash commands (/odoo, /expense, /bir)
 - Automated notifications for critical workflows
 - Agency-specific channel mapping
@@ -18,10 +19,11 @@
     "author": "Jake Tolentino",
     "website": "https://insightpulseai.net",
     "license": "AGPL-3",
-    "depends": ["base", "mail"],
+    "depends": ["base", "mail", "queue_job"],
     "data": [
         "security/ir.model.access.csv",
         "views/slack_channel_views.xml",
+        "views/slack_event_views.xml",
         "data/slack_data.xml",
     ],
     "installable": True,
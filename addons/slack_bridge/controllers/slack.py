@@ -41,12 +41,15 @@ class SlackController(http.Controller):
         "/slack/events", type="http", auth="public", methods=["POST"], csrf=False
     )
     def events(self, **kwargs):
-        """Handle Slack Events API callbacks"""
-        secret = (
-            request.env["ir.config_parameter"]
-            .sudo()
-            .get_param("slack.signing_secret", "")
-        )
+        """Handle Slack Events API callbacks
+
+        Events are stored once per Slack event_id and acknowledged right
+        away; the reply runs on the slack queue_job channel (see
+        slack.event). Set slack.events_async to 0 to process inline.
+        """
+        received = time.time()
+        params = request.env["ir.config_parameter"].sudo()
+        secret = params.get_param("slack.signing_secret", "")
 
         if not _verify_slack_request(request, secret):
             return http.Response(status=401)
@@ -60,53 +63,30 @@ def events(self, **kwargs):
         event = payload.get("event", {})
         event_type = event.get("type")
 
-        # Handle app mentions (@insightpulse-bot)
-        if event_type == "app_mention":
-            channel = event.get("channel")
-            text = event.get("text", "")
-            user = event.get("user")
-
-            _logger.info(f"App mention from {user} in {channel}: {text}")
-
-            # Route to ipai_agent if available
-            try:
-                if request.env.registry.get("ipai.agent"):
-                    response = (
-                        request.env["ipai.agent"]
-                        .sudo()
-                        .process_slack_mention(
-                            channel=channel, text=text, user=user, event=event
-                        )
-                    )
-                else:
-                    response = "👋 InsightPulse Odoo here. How can I help?"
-
-                request.env["slack.bridge"].sudo().post_message(channel, response)
-            except Exception as e:
-                _logger.error(f"Error processing app mention: {e}")
-                request.env["slack.bridge"].sudo().post_message(
-                    channel, f"⚠️ Error processing request: {str(e)}"
-                )
-
-        # Handle channel messages (if bot is in channel)
-        elif event_type == "message" and event.get("subtype") is None:
-            # Ignore bot messages to prevent loops
-            if event.get("bot_id"):
-                return http.Response(status=200)
-
-            channel = event.get("channel")
-            text = event.get("text", "")
-
-            # Check if this channel is mapped to an Odoo project/agency
-            channel_mapping = (
-                request.env["slack.channel"]
-                .sudo()
-                .search([("channel_id", "=", channel)], limit=1)
-            )
+        # Only mentions and plain human messages are worth a job; bot
+        # messages are ignored to prevent loops
+        if event_type not in ("app_mention", "message") or (
+            event_type == "message"
+            and (event.get("subtype") is not None or event.get("bot_id"))
+        ):
+            return http.Response(status=200)
 
-            if channel_mapping and channel_mapping.auto_respond:
-                _logger.info(f"Auto-responding to message in {channel}: {text}")
-                # Could trigger automated workflows here
+        retry_num = int(
+            request.httprequest.headers.get("X-Slack-Retry-Num", "0") or 0
+        )
+        slack_event = (
+            request.env["slack.event"]
+            .sudo()
+            ._register(payload, received=received, retry_num=retry_num)
+        )
+        if not slack_event:
+            # Slack retry of an event we already have
+            return http.Response(status=200)
+
+        if params.get_param("slack.events_async", "1") in ("0", "False", "false"):
+            slack_event.process_async()
+        else:
+            slack_event._enqueue()
 
         return http.Response(status=200)
 
@@ -0,0 +1 @@
+from . import slack_bridge, slack_channel, slack_event
@@ -0,0 +1,242 @@
+"""Slack Events API inbox: deduplicated, processed off the request thread"""
+
+import json
+import logging
+import time
+from datetime import datetime
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# queue_job channel for event processing. Its capacity bounds how many events
+# are handled concurrently, e.g. in odoo.conf: [queue_job] channels = root:4,root.slack:2
+SLACK_EVENT_CHANNEL = "root.slack"
+
+
+class SlackEvent(models.Model):
+    """Slack event received on /slack/events
+
+    Slack expects an HTTP 200 within 3 seconds and retries otherwise, so
+    the controller only stores the event (one row per Slack event_id,
+    retries are dropped) and acknowledges. The reply is produced by a
+    queue_job on the slack channel, outside the Odoo HTTP workers.
+    """
+
+    _name = "slack.event"
+    _description = "Slack Event"
+    _order = "id desc"
+    _rec_name = "event_id"
+
+    event_id = fields.Char(
+        string="Event ID", required=True, readonly=True, help="Slack event_id (Ev...)"
+    )
+    event_type = fields.Char(string="Event Type", readonly=True, index=True)
+    channel = fields.Char(string="Channel", readonly=True)
+    user = fields.Char(string="User", readonly=True)
+    payload = fields.Text(string="Payload", readonly=True)
+    state = fields.Selection(
+        selection=[
+            ("queued", "Queued"),
+            ("processing", "Processing"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        string="Status",
+        default="queued",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    error = fields.Text(string="Error", readonly=True)
+    retry_count = fields.Integer(
+        string="Slack Retries",
+        readonly=True,
+        help="Retries Slack sent for this event (dropped as duplicates)",
+    )
+
+    # Latency, in milliseconds
+    event_time = fields.Datetime(
+        string="Event Time", readonly=True, help="When Slack says the event happened"
+    )
+    received_at = fields.Datetime(string="Received At", readonly=True)
+    received_ts = fields.Float(
+        string="Received (epoch)", readonly=True, help="Sub-second receive time"
+    )
+    started_at = fields.Datetime(string="Started At", readonly=True)
+    done_at = fields.Datetime(string="Done At", readonly=True)
+    ack_ms = fields.Integer(
+        string="Ack (ms)", readonly=True, help="Request received to event stored"
+    )
+    queue_ms = fields.Integer(
+        string="Queue Wait (ms)", readonly=True, help="Event stored to processing"
+    )
+    processing_ms = fields.Integer(
+        string="Processing (ms)", readonly=True, help="Agent run and Slack reply"
+    )
+    total_ms = fields.Integer(
+        string="Total (ms)", readonly=True, help="Event received to reply posted"
+    )
+
+    _sql_constraints = [
+        (
+            "event_id_unique",
+            "UNIQUE(event_id)",
+            "This Slack event has already been received!",
+        )
+    ]
+
+    @api.model
+    def _register(self, payload, received=None, retry_num=0):
+        """Store an Events API callback once per Slack event_id
+
+        Uses INSERT .. ON CONFLICT so concurrent Slack retries neither
+        create duplicates nor abort the request transaction.
+
+        Args:
+            payload: Decoded Events API callback body
+            received: time.time() when the request arrived
+            retry_num: X-Slack-Retry-Num header value
+
+        Returns:
+            slack.event: The new event, or an empty recordset for a duplicate
+        """
+        received = received or time.time()
+        event = payload.get("event", {})
+        event_id = payload.get("event_id") or (
+            f"{event.get('channel', '')}:{event.get('event_ts') or event.get('ts', '')}"
+        )
+        event_time = payload.get("event_time")
+        now = datetime.utcnow()
+
+        self.env.cr.execute(
+            """
+            INSERT INTO slack_event
+                   (event_id, event_type, channel, "user", payload, state,
+                    retry_count, event_time, received_at, received_ts, ack_ms,
+                    create_uid, create_date, write_uid, write_date)
+            VALUES (%(event_id)s, %(event_type)s, %(channel)s, %(user)s, %(payload)s,
+                    'queued', 0, %(event_time)s, %(received_at)s, %(received)s, %(ack_ms)s,
+                    %(uid)s, %(now)s, %(uid)s, %(now)s)
+            ON CONFLICT (event_id) DO NOTHING
+            RETURNING id
+            """,
+            {
+                "event_id": event_id,
+                "event_type": event.get("type"),
+                "channel": event.get("channel"),
+                "user": event.get("user"),
+                "payload": json.dumps(payload),
+                "event_time": (
+                    datetime.utcfromtimestamp(event_time) if event_time else None
+                ),
+                "received_at": datetime.utcfromtimestamp(received),
+                "received": received,
+                "ack_ms": int((time.time() - received) * 1000),
+                "uid": self.env.uid,
+                "now": now,
+            },
+        )
+        row = self.env.cr.fetchone()
+        if row:
+            return self.browse(row[0])
+
+        self.env.cr.execute(
+            "UPDATE slack_event SET retry_count = GREATEST(retry_count, %s) WHERE event_id = %s",
+            (retry_num, event_id),
+        )
+        _logger.info(f"Dropped duplicate Slack event {event_id} (retry {retry_num})")
+        return self.browse()
+
+    def _enqueue(self):
+        """Hand events to the bounded slack queue_job channel"""
+        for event in self:
+            event.with_delay(
+                channel=SLACK_EVENT_CHANNEL,
+                identity_key=f"slack.event:{event.event_id}",
+                description=f"Slack {event.event_type} {event.event_id}",
+            ).process_async()
+
+    def process_async(self):
+        """Process a stored event (queue_job entry point)"""
+        self.ensure_one()
+        event = self.sudo()
+        if event.state == "done":
+            return
+
+        started = time.time()
+        event.write(
+            {"state": "processing", "started_at": datetime.utcfromtimestamp(started)}
+        )
+
+        try:
+            event._dispatch(json.loads(event.payload).get("event", {}))
+            state, error = "done", False
+        except Exception as e:
+            _logger.error(f"Error processing Slack event {event.event_id}: {e}")
+            state, error = "failed", str(e)
+
+        done = time.time()
+        received = event.received_ts or started
+        event.write(
+            {
+                "state": state,
+                "error": error,
+                "done_at": datetime.utcfromtimestamp(done),
+                "queue_ms": max(int((started - received) * 1000) - event.ack_ms, 0),
+                "processing_ms": int((done - started) * 1000),
+                "total_ms": int((done - received) * 1000),
+            }
+        )
+        _logger.info(
+            f"Slack event {event.event_id} {state}: queue {event.queue_ms}ms, "
+            f"processing {event.processing_ms}ms, total {event.total_ms}ms"
+        )
+
+    def _dispatch(self, event):
+        """Route an event to its handler"""
+        event_type = event.get("type")
+        if event_type == "app_mention":
+            self._handle_app_mention(event)
+        elif event_type == "message" and event.get("subtype") is None:
+            self._handle_message(event)
+
+    def _handle_app_mention(self, event):
+        """Reply to @insightpulse-bot mentions, via ipai_agent if available"""
+        channel = event.get("channel")
+        text = event.get("text", "")
+        user = event.get("user")
+
+        _logger.info(f"App mention from {user} in {channel}: {text}")
+
+        bridge = self.env["slack.bridge"].sudo()
+        try:
+            if self.env.registry.get("ipai.agent"):
+                response = self.env["ipai.agent"].sudo().process_slack_mention(
+                    channel=channel, text=text, user=user, event=event
+                )
+            else:
+                response = "👋 InsightPulse Odoo here. How can I help?"
+
+            bridge.post_message(channel, response)
+        except Exception as e:
+            bridge.post_message(channel, f"⚠️ Error processing request: {str(e)}")
+            raise
+
+    def _handle_message(self, event):
+        """Channel messages (if bot is in channel)"""
+        # Ignore bot messages to prevent loops
+        if event.get("bot_id"):
+            return
+
+        channel = event.get("channel")
+        text = event.get("text", "")
+
+        # Check if this channel is mapped to an Odoo project/agency
+        channel_mapping = self.env["slack.channel"].search(
+            [("channel_id", "=", channel)], limit=1
+        )
+
+        if channel_mapping and channel_mapping.auto_respond:
+            _logger.info(f"Auto-responding to message in {channel}: {text}")
+            # Could trigger automated workflows here
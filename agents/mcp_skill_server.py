@@ -32,6 +32,7 @@
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from agents.profile_executor import run_profile_skills
 from agents.skill_registry import (
     load_registry,
     get_profiles,
@@ -250,23 +251,12 @@ async def _run_profile(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         repo_path = arguments.get("repo_path", ".")
         fix = arguments.get("fix", False)
 
-        # Get profile skills
+        # Get profile skills; run them on the process pool (Anthropic skills
+        # are skipped) without blocking the event loop
         skill_ids = get_profile_skills(profile_id)
-        results = {}
-
-        for skill_id in skill_ids:
-            try:
-                run_skill_fn, meta = get_skill(skill_id)
-
-                # Skip Anthropic skills in profile execution
-                if meta.get("anthropic", False):
-                    results[skill_id] = {"skipped": "Anthropic skill"}
-                    continue
-
-                result = run_skill_fn({"repo_path": repo_path, "fix": fix})
-                results[skill_id] = result
-            except Exception as e:
-                results[skill_id] = {"error": str(e)}
+        results = await asyncio.to_thread(
+            run_profile_skills, skill_ids, {"repo_path": repo_path, "fix": fix}
+        )
 
         return {
             "content": [
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Profile Executor
+
+Runs the skills of a profile against one shared, read-only repository
+snapshot. The snapshot (addon directories, modules, parsed manifests and
+per-module file index) is built once per run and passed to every skill as
+``params["snapshot"]``, so validators no longer each walk the addon tree and
+re-parse every ``__manifest__.py``. Independent skills run concurrently on a
+process pool.
+
+Skills that do not know about the snapshot simply ignore the extra param.
+Runs with ``fix`` enabled modify files, so they stay serial and each skill
+reads the repository itself.
+
+Usage:
+    >>> from agents.profile_executor import run_profile_skills
+    >>> results = run_profile_skills(
+    ...     ["odoo.manifest.validate", "odoo.readme.validate"], {"repo_path": "."}
+    ... )
+"""
+
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.skill_registry import get_skill, load_registry, validate_skill_inputs
+
+
+# Same discovery rules as the visual compliance tools
+CANONICAL_ADDONS_DIR = "odoo_addons"
+KNOWN_ADDON_DIRS = ["odoo_addons", "addons", "custom_addons", "modules"]
+MANIFEST_FILES = ["__manifest__.py", "__openerp__.py"]
+
+# Upper bound for worker processes (skills are mostly I/O + AST work)
+MAX_PROFILE_WORKERS = int(os.getenv("SKILL_PROFILE_WORKERS", "4"))
+
+
+def load_manifest_dict(path: Path) -> Dict[str, Any]:
+    """
+    Parse a manifest file into a dict with ast.literal_eval.
+
+    Raises:
+        ValueError: If the file holds no dict literal or cannot be parsed
+    """
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, UnicodeDecodeError) as e:
+        raise ValueError(f"Failed to load manifest {path}: {e}")
+
+    for node in tree.body:
+        value = node.value if isinstance(node, (ast.Assign, ast.Expr)) else None
+        if isinstance(value, ast.Dict):
+            return ast.literal_eval(ast.Expression(value))
+
+    raise ValueError(f"Could not parse manifest at {path}")
+
+
+@dataclass(frozen=True)
+class ModuleSnapshot:
+    """One addon module as seen at snapshot time."""
+
+    name: str
+    path: Path
+    addons_dir: str
+    manifest_file: str
+    manifest: Optional[Dict[str, Any]]
+    manifest_error: Optional[str]
+    files: Tuple[str, ...]  # Top-level entries of the module directory
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / self.manifest_file
+
+    @property
+    def depends(self) -> Tuple[str, ...]:
+        return tuple((self.manifest or {}).get("depends", ()))
+
+    def has_file(self, name: str) -> bool:
+        return name in self.files
+
+
+@dataclass(frozen=True)
+class RepoSnapshot:
+    """
+    Immutable view of the repository's addons for one profile run.
+
+    Treat manifests as read-only: every worker receives its own pickled copy,
+    so changes would not be seen by other skills anyway.
+    """
+
+    repo_path: Path
+    addons_path: Path
+    addon_directories: Dict[str, Tuple[str, ...]]
+    modules: Tuple[ModuleSnapshot, ...]  # Modules in addons_path
+    _dependents: Dict[str, Tuple[str, ...]] = field(default_factory=dict, repr=False)
+
+    def module(self, name: str) -> Optional[ModuleSnapshot]:
+        for module in self.modules:
+            if module.name == name:
+                return module
+        return None
+
+    def dependents(self, module_name: str) -> List[str]:
+        """Modules in addons_path that list module_name in depends"""
+        return list(self._dependents.get(module_name, ()))
+
+
+def _scan_modules(directory: Path, addons_dir: str) -> List[ModuleSnapshot]:
+    modules = []
+    try:
+        entries = sorted(directory.iterdir())
+    except (FileNotFoundError, PermissionError):
+        return modules
+
+    for item in entries:
+        if not item.is_dir():
+            continue
+        try:
+            files = tuple(sorted(entry.name for entry in item.iterdir()))
+        except PermissionError:
+            continue
+
+        manifest_file = next((name for name in MANIFEST_FILES if name in files), None)
+        if not manifest_file:
+            continue
+
+        manifest, manifest_error = None, None
+        try:
+            manifest = load_manifest_dict(item / manifest_file)
+        except ValueError as e:
+            manifest_error = str(e)
+
+        modules.append(
+            ModuleSnapshot(
+                name=item.name,
+                path=item,
+                addons_dir=addons_dir,
+                manifest_file=manifest_file,
+                manifest=manifest,
+                manifest_error=manifest_error,
+                files=files,
+            )
+        )
+    return modules
+
+
+def build_snapshot(repo_path) -> RepoSnapshot:
+    """
+    Walk the addon directories once and parse every manifest.
+
+    Args:
+        repo_path: Path to repository root
+
+    Returns:
+        RepoSnapshot shared by all skills of a profile run
+    """
+    repo_path = Path(repo_path)
+
+    # Same fallback as the validators: odoo_addons/, else the repo root
+    addons_path = repo_path / CANONICAL_ADDONS_DIR
+    if not addons_path.exists():
+        addons_path = repo_path
+
+    scanned: Dict[Path, List[ModuleSnapshot]] = {}
+    addon_directories: Dict[str, Tuple[str, ...]] = {}
+    for dir_name in KNOWN_ADDON_DIRS:
+        directory = repo_path / dir_name
+        if directory.is_dir():
+            scanned[directory.resolve()] = _scan_modules(directory, dir_name)
+            names = tuple(module.name for module in scanned[directory.resolve()])
+            if names:
+                addon_directories[dir_name] = names
+
+    modules = scanned.get(addons_path.resolve())
+    if modules is None:
+        modules = _scan_modules(addons_path, addons_path.name)
+
+    dependents: Dict[str, List[str]] = {}
+    for module in modules:
+        for dependency in module.depends:
+            dependents.setdefault(dependency, []).append(module.name)
+
+    return RepoSnapshot(
+        repo_path=repo_path,
+        addons_path=addons_path,
+        addon_directories=addon_directories,
+        modules=tuple(modules),
+        _dependents={name: tuple(names) for name, names in dependents.items()},
+    )
+
+
+def invoke_skill(skill_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one skill and return its result dict.
+
+    Module-level so it can run in a worker process. Errors are returned as
+    ``{"error": ...}`` instead of raised, so one failing skill does not
+    cancel the rest of the profile.
+    """
+    try:
+        run_skill_fn, meta = get_skill(skill_id)
+        validate_skill_inputs(skill_id, params)
+        return run_skill_fn(params)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def run_profile_skills(
+    skill_ids: List[str],
+    params: Dict[str, Any],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Execute skills against a shared snapshot, concurrently where safe.
+
+    Args:
+        skill_ids: Skills to run (profile order is kept in the result)
+        params: Common skill parameters (repo_path, fix, ...)
+        max_workers: Worker processes (default: MAX_PROFILE_WORKERS;
+            1 runs every skill in this process)
+
+    Returns:
+        Dict mapping skill_id to its result dict. Anthropic (prompt-based)
+        skills are reported as ``{"skipped": "Anthropic skill"}``.
+    """
+    registry = load_registry()
+    results: Dict[str, Dict[str, Any]] = {}
+    runnable = []
+    for skill_id in skill_ids:
+        if registry.get(skill_id, {}).get("anthropic", False):
+            results[skill_id] = {"skipped": "Anthropic skill"}
+        else:
+            runnable.append(skill_id)
+
+    params = dict(params)
+    parallel = not params.get("fix", False)
+    if parallel:
+        params["snapshot"] = build_snapshot(params.get("repo_path", "."))
+
+    workers = min(max_workers or MAX_PROFILE_WORKERS, len(runnable))
+    if not parallel or workers <= 1:
+        for skill_id in runnable:
+            results[skill_id] = invoke_skill(skill_id, dict(params))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                skill_id: pool.submit(invoke_skill, skill_id, dict(params))
+                for skill_id in runnable
+            }
+            for skill_id, future in futures.items():
+                try:
+                    results[skill_id] = future.result()
+                except Exception as e:  # e.g. BrokenProcessPool
+                    results[skill_id] = {"error": str(e)}
+
+    return {skill_id: results[skill_id] for skill_id in skill_ids}
@@ -17,6 +17,7 @@
 from pathlib import Path
 from typing import Any, Dict
 
+from agents.profile_executor import run_profile_skills
 from agents.skill_registry import (
     get_skill,
     list_skills,
@@ -114,6 +115,49 @@ def parse_args():
     return parser.parse_args()
 
 
+def report_skill_result(
+    meta: Dict[str, Any], result: Dict[str, Any], output_json: bool = False
+) -> int:
+    """
+    Print a skill result and map it to an exit code.
+
+    Args:
+        meta: Skill metadata
+        result: Skill result dictionary
+        output_json: Output results in JSON format
+
+    Returns:
+        Exit code (0=success, 1=violations, 2=error)
+    """
+    # Output results
+    if output_json:
+        print(json.dumps(result, indent=2))
+    else:
+        # Human-readable output
+        if result.get("ok", False):
+            print(f"✅ {meta['name']}: PASS")
+        else:
+            print(f"❌ {meta['name']}: VIOLATIONS DETECTED")
+
+        if "total_modules" in result:
+            print(f"   Total modules: {result['total_modules']}")
+        if "compliant_modules" in result:
+            print(f"   Compliant: {result['compliant_modules']}")
+        if "violations" in result:
+            print(f"   Violations: {len(result['violations'])}")
+
+    # Return exit code
+    if result.get("ok", False):
+        return 0
+    else:
+        # Check for critical violations
+        violations = result.get("violations", [])
+        has_critical = any(
+            v.get("severity") == "CRITICAL" for v in violations
+        )
+        return 2 if has_critical else 1
+
+
 def execute_skill(skill_id: str, params: Dict[str, Any], output_json: bool = False):
     """
     Execute a single skill.
@@ -141,33 +185,7 @@ def execute_skill(skill_id: str, params: Dict[str, Any], output_json: bool = Fal
 
         result = run_skill(params)
 
-        # Output results
-        if output_json:
-            print(json.dumps(result, indent=2))
-        else:
-            # Human-readable output
-            if result.get("ok", False):
-                print(f"✅ {meta['name']}: PASS")
-            else:
-                print(f"❌ {meta['name']}: VIOLATIONS DETECTED")
-
-            if "total_modules" in result:
-                print(f"   Total modules: {result['total_modules']}")
-            if "compliant_modules" in result:
-                print(f"   Compliant: {result['compliant_modules']}")
-            if "violations" in result:
-                print(f"   Violations: {len(result['violations'])}")
-
-        # Return exit code
-        if result.get("ok", False):
-            return 0
-        else:
-            # Check for critical violations
-            violations = result.get("violations", [])
-            has_critical = any(
-                v.get("severity") == "CRITICAL" for v in violations
-            )
-            return 2 if has_critical else 1
+        return report_skill_result(meta, result, output_json)
 
     except Exception as e:
         print(f"❌ Error executing skill '{skill_id}': {e}", file=sys.stderr)
@@ -201,13 +219,32 @@ def execute_profile(
             print(f"Description: {profile['description']}")
             print()
 
-        # Execute each skill in profile
+        # Execute profile skills against one shared repository snapshot,
+        # in parallel unless fixes are enabled
         skill_ids = get_profile_skills(profile_id)
+        skill_results = run_profile_skills(skill_ids, params)
         results = {}
         max_exit_code = 0
 
         for skill_id in skill_ids:
-            exit_code = execute_skill(skill_id, params.copy(), output_json)
+            result = skill_results[skill_id]
+            if "skipped" in result:
+                continue
+
+            if "error" in result:
+                print(
+                    f"❌ Error executing skill '{skill_id}': {result['error']}",
+                    file=sys.stderr,
+                )
+                exit_code = 2
+            else:
+                _, meta = get_skill(skill_id)
+                if not output_json:
+                    print(f"Running skill: {meta['name']}")
+                    print(f"Description: {meta['description']}")
+                    print()
+                exit_code = report_skill_result(meta, result, output_json)
+
             results[skill_id] = exit_code
             max_exit_code = max(max_exit_code, exit_code)
 
@@ -145,10 +145,16 @@ def dump_manifest(self, path: Path, manifest: Dict[str, Any]) -> None:
         body = "\n".join(lines) + "\n"
         path.write_text(body, encoding="utf-8")
 
-    def check_manifest(self, path: Path) -> ManifestCheckResult:
+    def check_manifest(
+        self, path: Path, manifest: Optional[Dict[str, Any]] = None
+    ) -> ManifestCheckResult:
         """
         Validate a single manifest file.
 
+        Args:
+            path: Path to the manifest file
+            manifest: Already parsed manifest (skips reading the file)
+
         Returns:
             ManifestCheckResult with all violations found
         """
@@ -156,7 +162,8 @@ def check_manifest(self, path: Path) -> ManifestCheckResult:
         violations: List[ManifestViolation] = []
 
         try:
-            manifest = self.load_manifest(path)
+            if manifest is None:
+                manifest = self.load_manifest(path)
         except ValueError as e:
             return ManifestCheckResult(
                 module_name=module_name,
@@ -20,6 +20,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
         params: Skill parameters
             - repo_path (str): Path to repository root (default: ".")
             - fix (bool): Enable auto-fix (default: False)
+            - snapshot (RepoSnapshot): Shared repository snapshot (optional)
 
     Returns:
         Skill result dictionary:
@@ -39,8 +40,14 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
     # Initialize validator
     validator = DirectoryValidator(repo_root=repo_path)
 
-    # Find addon directories
-    addon_dirs = validator.find_addon_directories()
+    # Find addon directories (already scanned when running in a profile)
+    snapshot = params.get("snapshot")
+    if snapshot is not None:
+        addon_dirs = {
+            name: list(modules) for name, modules in snapshot.addon_directories.items()
+        }
+    else:
+        addon_dirs = validator.find_addon_directories()
 
     # Detect violations
     violations = []
@@ -20,6 +20,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
         params: Skill parameters
             - repo_path (str): Path to repository root (default: ".")
             - fix (bool): Enable auto-fix (default: False)
+            - snapshot (RepoSnapshot): Shared repository snapshot (optional)
 
     Returns:
         Skill result dictionary:
@@ -36,6 +37,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
     # Extract parameters with defaults
     repo_path = Path(params.get("repo_path", "."))
     enable_fix = params.get("fix", False)
+    snapshot = params.get("snapshot")
 
     # Determine addons path
     # Look for odoo_addons/ directory (canonical location)
@@ -47,11 +49,19 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
     # Initialize checker
     checker = ManifestChecker(addons_path=addons_path)
 
-    # Find all modules
-    modules = []
-    for item in addons_path.iterdir():
-        if item.is_dir() and (item / "__manifest__.py").exists():
-            modules.append(item)
+    # Find all modules (manifests already parsed when running in a profile)
+    manifests = {}
+    if snapshot is not None:
+        modules = []
+        for module in snapshot.modules:
+            if module.manifest_file == "__manifest__.py":
+                modules.append(module.path)
+                manifests[module.path] = module.manifest
+    else:
+        modules = []
+        for item in addons_path.iterdir():
+            if item.is_dir() and (item / "__manifest__.py").exists():
+                modules.append(item)
 
     if not modules:
         # No modules found
@@ -70,7 +80,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
         manifest_path = module_path / "__manifest__.py"
 
         # Check manifest
-        result = checker.check_manifest(manifest_path)
+        result = checker.check_manifest(manifest_path, manifests.get(module_path))
 
         if result.violations:
             # Add module context to violations
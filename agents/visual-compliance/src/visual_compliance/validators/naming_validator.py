@@ -21,6 +21,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
             - repo_path (str): Path to repository root (default: ".")
             - fix (bool): Enable auto-fix (default: False)
                          Note: Naming auto-fix requires manual intervention
+            - snapshot (RepoSnapshot): Shared repository snapshot (optional)
 
     Returns:
         Skill result dictionary:
@@ -36,6 +37,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
     # Extract parameters with defaults
     repo_path = Path(params.get("repo_path", "."))
     enable_fix = params.get("fix", False)
+    snapshot = params.get("snapshot")
 
     # Determine addons path
     addons_path = repo_path / "odoo_addons"
@@ -46,10 +48,17 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
     validator = NamingValidator(addons_root=addons_path)
 
     # Find all modules
-    modules = []
-    for item in addons_path.iterdir():
-        if item.is_dir() and (item / "__manifest__.py").exists():
-            modules.append(item)
+    if snapshot is not None:
+        modules = [
+            module.path
+            for module in snapshot.modules
+            if module.manifest_file == "__manifest__.py"
+        ]
+    else:
+        modules = []
+        for item in addons_path.iterdir():
+            if item.is_dir() and (item / "__manifest__.py").exists():
+                modules.append(item)
 
     if not modules:
         return {
@@ -77,8 +86,11 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
             suggested_name = validator.suggest_module_name(module_name)
             modules_to_rename[module_name] = suggested_name
 
-            # Find dependent modules
-            dependencies = validator.find_module_dependencies(module_path)
+            # Find dependent modules (reverse index is prebuilt in the snapshot)
+            if snapshot is not None:
+                dependencies = snapshot.dependents(module_name)
+            else:
+                dependencies = validator.find_module_dependencies(module_path)
 
             # Assess migration complexity
             complexity = "LOW"
@@ -20,6 +20,7 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
         params: Skill parameters
             - repo_path (str): Path to repository root (default: ".")
             - fix (bool): Auto-generate missing README.rst files (default: False)
+            - snapshot (RepoSnapshot): Shared repository snapshot (optional)
 
     Returns:
         Skill result dictionary:
@@ -45,10 +46,18 @@ def run_skill(params: Dict[str, Any]) -> Dict[str, Any]:
     validator = ReadmeValidator(addons_root=addons_path)
 
     # Find all modules
-    modules = []
-    for item in addons_path.iterdir():
-        if item.is_dir() and (item / "__manifest__.py").exists():
-            modules.append(item)
+    snapshot = params.get("snapshot")
+    if snapshot is not None:
+        modules = [
+            module.path
+            for module in snapshot.modules
+            if module.manifest_file == "__manifest__.py"
+        ]
+    else:
+        modules = []
+        for item in addons_path.iterdir():
+            if item.is_dir() and (item / "__manifest__.py").exists():
+                modules.append(item)
 
     if not modules:
         return {
@@ -3,23 +3,28 @@
 Provides OCR API for receipt and document scanning
 """
 
-import io
+import asyncio
 import logging
+import multiprocessing
+import os
 import time
-from typing import Optional, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, Awaitable, Callable, List, Tuple
 from datetime import datetime
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Header
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from PIL import Image
-import numpy as np
-from paddleocr import PaddleOCR
 import redis.asyncio as aioredis
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
 
+import ocr_worker
+from ocr_cache import OCRResultCache
+from ocr_jobs import JobStore, WebhookNotAllowedError, check_webhook_url, deliver_webhook
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,10 +55,161 @@
 ocr_requests_success = Counter('ocr_requests_success', 'Successful OCR requests')
 ocr_requests_failed = Counter('ocr_requests_failed', 'Failed OCR requests')
 ocr_processing_time = Histogram('ocr_processing_seconds', 'OCR processing time')
+ocr_requests_rejected = Counter('ocr_requests_rejected', 'OCR requests rejected because the inference queue was full')
+ocr_queue_depth = Gauge('ocr_queue_depth', 'OCR jobs waiting for an inference worker')
+ocr_inflight_jobs = Gauge('ocr_inflight_jobs', 'OCR jobs queued or running')
+ocr_stage_time = Histogram('ocr_stage_seconds', 'OCR time per pipeline stage', ['stage'])
+ocr_jobs_total = Counter('ocr_jobs', 'Finished async OCR jobs', ['status'])
+
+# Inference tier configuration
+OCR_INFERENCE_WORKERS = int(os.getenv("OCR_INFERENCE_WORKERS", "2"))  # OCR processes per API worker
+OCR_QUEUE_SIZE = int(os.getenv("OCR_QUEUE_SIZE", "16"))  # Jobs allowed to wait beyond the running ones
+OCR_RETRY_AFTER_SECONDS = int(os.getenv("OCR_RETRY_AFTER_SECONDS", "5"))
+
+# Result cache configuration
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+OCR_CACHE_TTL = int(os.getenv("OCR_CACHE_TTL", str(7 * 24 * 3600)))
+OCR_CACHE_MAX_ENTRY_BYTES = int(os.getenv("OCR_CACHE_MAX_ENTRY_BYTES", str(256 * 1024)))
+# Bump when extract_receipt_data changes so cached results are recomputed
+EXTRACTION_VERSION = "1"
+
+# Batch / job configuration
+OCR_BATCH_MAX_FILES = int(os.getenv("OCR_BATCH_MAX_FILES", "200"))
+OCR_BATCH_MAX_BYTES = int(os.getenv("OCR_BATCH_MAX_BYTES", str(100 * 1024 * 1024)))
+OCR_JOB_TTL = int(os.getenv("OCR_JOB_TTL", str(24 * 3600)))
+# Jobs hold their images in memory until done; beyond this /jobs answers 429
+OCR_MAX_PENDING_JOBS = int(os.getenv("OCR_MAX_PENDING_JOBS", "8"))
+OCR_JOB_HEARTBEAT_SECONDS = int(os.getenv("OCR_JOB_HEARTBEAT_SECONDS", "30"))
+# Webhook hosts allowed even though they resolve to internal addresses
+OCR_WEBHOOK_ALLOWED_HOSTS = frozenset(
+    host.strip().lower() for host in os.getenv("OCR_WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+)
+
+
+class QueueFullError(Exception):
+    """Raised when the inference queue is at capacity"""
+
+
+class InferenceTier:
+    """
+    Pool of pre-warmed PaddleOCR worker processes
+
+    Each process loads the model once (ocr_worker.init_worker). OCR jobs are
+    admitted while fewer than workers + queue_size are in flight; beyond
+    that submit() raises QueueFullError so the API can answer 429 instead
+    of piling up requests.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.inflight = 0
+        self.ready = False
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self._worker_freed = asyncio.Condition()
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.inflight - self.workers)
+
+    def start(self):
+        # spawn: paddle and the event loop's threads don't survive fork safely
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=ocr_worker.init_worker
+        )
+
+    async def warmup(self):
+        """Start every worker process and run one tiny OCR in each"""
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, ocr_worker.warmup)
+            for _ in range(self.workers)
+        ))
+        self.ready = True
+        logger.info(f"Inference tier ready: {len(set(pids))} PaddleOCR worker processes")
+
+    async def submit(self, func: Callable, *args, wait: bool = False) -> Any:
+        """
+        Run func(*args) on a worker process
+
+        By default raises QueueFullError when the queue is at capacity. With
+        wait=True the job instead waits until a worker is idle, so batch work
+        fills idle workers but never takes queue slots from interactive scans.
+        """
+        if wait:
+            async with self._worker_freed:
+                await self._worker_freed.wait_for(lambda: self.inflight < self.workers)
+                self.inflight += 1
+        elif self.inflight >= self.capacity:
+            ocr_requests_rejected.inc()
+            raise QueueFullError()
+        else:
+            self.inflight += 1
+        self._update_gauges()
+        executor = self.executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); replace the pool so
+            # later requests don't all fail. Every job in flight on the dead
+            # pool ends up here, only the first one restarts it
+            if self.executor is executor:
+                logger.error("OCR worker process died, restarting inference tier")
+                self.restart()
+            raise
+        except asyncio.CancelledError:
+            # restart() cancels the jobs still queued on the old pool; report
+            # them like the jobs that were running on it
+            if self.executor is not executor:
+                raise BrokenProcessPool("OCR worker pool was restarted") from None
+            raise
+        finally:
+            self.inflight -= 1
+            self._update_gauges()
+            async with self._worker_freed:
+                self._worker_freed.notify()
+
+    def restart(self):
+        """Replace the pool and warm the new workers in the background"""
+        old_executor = self.executor
+        self.ready = False
+        self.start()
+        if old_executor:
+            old_executor.shutdown(wait=False, cancel_futures=True)
+        self._warmup_task = asyncio.get_running_loop().create_task(self._rewarm())
+
+    async def _rewarm(self):
+        try:
+            await self.warmup()
+        except Exception as e:
+            logger.error(f"Inference tier warmup after restart failed: {e}")
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.ready = False
+
+    def _update_gauges(self):
+        ocr_inflight_jobs.set(self.inflight)
+        ocr_queue_depth.set(self.queue_depth)
+
 
 # Global variables
-ocr_engine: Optional[PaddleOCR] = None
+inference_tier = InferenceTier(OCR_INFERENCE_WORKERS, OCR_QUEUE_SIZE)
 redis_client: Optional[aioredis.Redis] = None
+result_cache: Optional[OCRResultCache] = None
+job_store = JobStore(ttl=OCR_JOB_TTL)
+background_jobs: set = set()  # Keep references so running jobs aren't garbage collected
+job_heartbeat_task: Optional[asyncio.Task] = None
 
 # Models
 class OCRResult(BaseModel):
@@ -71,41 +227,92 @@ class OCRResult(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
+class BatchItemResult(BaseModel):
+    """Result for one image of a batch or job"""
+    index: int = Field(..., description="Position of the file in the upload")
+    filename: Optional[str] = Field(None, description="Uploaded filename")
+    success: bool = Field(..., description="Whether OCR was successful")
+    cache: Optional[str] = Field(None, description="Result cache hit/miss")
+    result: Optional[OCRResult] = Field(None, description="OCR result when successful")
+    error: Optional[str] = Field(None, description="Error message when failed")
+    status_code: Optional[int] = Field(None, description="HTTP status the image would have failed /scan with")
+
+
+class BatchOCRResponse(BaseModel):
+    """Batch OCR response"""
+    success: bool = Field(..., description="Whether every image succeeded")
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+    processing_time: float = Field(..., description="Processing time in seconds")
+
+
+class OCRJob(BaseModel):
+    """Async OCR job"""
+    job_id: str
+    status: str = Field(..., description="queued, running, completed or failed")
+    total: int
+    completed: int = Field(..., description="Images processed successfully so far")
+    failed: int = Field(..., description="Images that failed so far")
+    created_at: str
+    finished_at: Optional[str] = None
+    webhook_url: Optional[str] = None
+    webhook_status: Optional[str] = Field(None, description="delivered or failed")
+    error: Optional[str] = None
+    results: Optional[List[BatchItemResult]] = Field(None, description="Per-image results once completed")
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     timestamp: str
     version: str
     ocr_engine_loaded: bool
+    inference_workers: int
+    queue_depth: int
+    queue_capacity: int
+    cache: Optional[Dict[str, Any]] = None
 
 
 # Startup/Shutdown events
 @app.on_event("startup")
 async def startup_event():
-    """Initialize OCR engine and Redis connection on startup"""
-    global ocr_engine, redis_client
+    """Initialize OCR worker processes and Redis connection on startup"""
+    global redis_client, result_cache, job_heartbeat_task
 
     try:
-        logger.info("Initializing PaddleOCR engine...")
-        ocr_engine = PaddleOCR(
-            use_angle_cls=True,
-            lang='en',
-            use_gpu=False,  # Set to True if GPU available
-            enable_mkldnn=True,  # CPU optimization
-            show_log=False
-        )
-        logger.info("PaddleOCR engine initialized successfully")
+        logger.info(f"Starting {OCR_INFERENCE_WORKERS} PaddleOCR worker processes...")
+        inference_tier.start()
+        await inference_tier.warmup()
+        logger.info("PaddleOCR inference tier initialized successfully")
 
         # Initialize Redis connection
         logger.info("Connecting to Redis...")
         redis_client = await aioredis.from_url(
-            "redis://redis:6379",
+            REDIS_URL,
             encoding="utf-8",
             decode_responses=True
         )
         await redis_client.ping()
         logger.info("Redis connection established")
 
+        job_store.redis = redis_client
+        await job_store.heartbeat(OCR_JOB_HEARTBEAT_SECONDS * 3)
+        job_heartbeat_task = asyncio.create_task(job_heartbeat())
+        orphaned = await job_store.fail_orphaned()
+        if orphaned:
+            logger.warning(f"Marked {orphaned} OCR jobs of stopped workers as failed")
+
+        if OCR_CACHE_ENABLED:
+            result_cache = OCRResultCache(
+                redis_client,
+                engine_fingerprint=f"{ocr_worker.engine_fingerprint()};extraction={EXTRACTION_VERSION}",
+                ttl=OCR_CACHE_TTL,
+                max_entry_bytes=OCR_CACHE_MAX_ENTRY_BYTES
+            )
+            logger.info(f"OCR result cache enabled (TTL {OCR_CACHE_TTL}s)")
+
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise
@@ -116,6 +323,11 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     global redis_client
 
+    inference_tier.shutdown()
+
+    if job_heartbeat_task:
+        job_heartbeat_task.cancel()
+
     if redis_client:
         await redis_client.close()
         logger.info("Redis connection closed")
@@ -221,40 +433,48 @@ async def health_check():
         status="healthy",
         timestamp=datetime.utcnow().isoformat(),
         version="1.0.0",
-        ocr_engine_loaded=ocr_engine is not None
+        ocr_engine_loaded=inference_tier.ready,
+        inference_workers=inference_tier.workers,
+        queue_depth=inference_tier.queue_depth,
+        queue_capacity=inference_tier.queue_size,
+        cache=result_cache.stats() if result_cache else None
     )
 
 
-@app.post("/api/v1/ocr/scan", response_model=OCRResult)
-async def scan_receipt(
-    file: UploadFile = File(...),
-    x_api_key: Optional[str] = Header(None)
-):
+async def process_image(
+    contents: bytes,
+    content_type: Optional[str],
+    filename: Optional[str],
+    wait: bool = False
+) -> Tuple[OCRResult, Optional[str]]:
     """
-    Scan receipt or document using OCR
+    Validate, cache-check and OCR one image
 
     Args:
-        file: Image file (JPEG, PNG)
-        x_api_key: API key for authentication (optional)
+        contents: Raw image bytes
+        content_type: Upload content type
+        filename: Upload filename (for logging)
+        wait: Wait for a free inference worker instead of failing with 429
+              (batch and job processing)
 
     Returns:
-        OCRResult: Structured OCR result with extracted data
+        (OCRResult, cache status "hit"/"miss", or None when caching is off)
+
+    Raises:
+        HTTPException: Invalid input, queue full or OCR failure
     """
     ocr_requests_total.inc()
     start_time = time.time()
 
     try:
         # Validate file type
-        if file.content_type not in ["image/jpeg", "image/png", "image/jpg"]:
+        if content_type not in ["image/jpeg", "image/png", "image/jpg"]:
             ocr_requests_failed.inc()
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Only JPEG/PNG supported."
+                detail=f"Invalid file type: {content_type}. Only JPEG/PNG supported."
             )
 
-        # Read image file
-        contents = await file.read()
-
         # Validate file size (max 10MB)
         if len(contents) > 10 * 1024 * 1024:
             ocr_requests_failed.inc()
@@ -263,18 +483,45 @@ async def scan_receipt(
                 detail="File too large. Maximum size is 10MB."
             )
 
-        # Convert to PIL Image
-        image = Image.open(io.BytesIO(contents))
-
-        # Convert to numpy array
-        img_array = np.array(image)
+        # Serve resubmitted images from the cache
+        cache_key = None
+        cache_status = None
+        if result_cache:
+            cache_key = result_cache.key(contents)
+            cached = await result_cache.get(cache_key)
+            cache_status = "hit" if cached else "miss"
+            if cached:
+                processing_time = time.time() - start_time
+                ocr_processing_time.observe(processing_time)
+                ocr_requests_success.inc()
+                logger.info(f"OCR cache hit for file: {filename}")
+                return OCRResult(**cached, processing_time=processing_time), cache_status
+
+        # Preprocess + OCR on an inference worker process
+        logger.info(f"Processing OCR for file: {filename}")
+        try:
+            output = await inference_tier.submit(ocr_worker.run_ocr, contents, time.time(), wait=wait)
+        except QueueFullError:
+            raise HTTPException(
+                status_code=429,
+                detail="OCR queue is full, retry later",
+                headers={"Retry-After": str(OCR_RETRY_AFTER_SECONDS)}
+            )
+        except BrokenProcessPool:
+            ocr_requests_failed.inc()
+            raise HTTPException(
+                status_code=503,
+                detail="OCR worker restarted, retry the request",
+                headers={"Retry-After": str(OCR_RETRY_AFTER_SECONDS)}
+            )
 
-        # Perform OCR
-        logger.info(f"Processing OCR for file: {file.filename}")
-        ocr_result = ocr_engine.ocr(img_array, cls=True)
+        for stage, seconds in output["timings"].items():
+            ocr_stage_time.labels(stage=stage).observe(seconds)
 
         # Extract structured data
-        extracted = extract_receipt_data(ocr_result[0] if ocr_result else [])
+        stage_start = time.perf_counter()
+        extracted = extract_receipt_data(output["ocr_result"])
+        ocr_stage_time.labels(stage="extract").observe(time.perf_counter() - stage_start)
 
         # Calculate average confidence
         avg_confidence = (
@@ -299,10 +546,13 @@ async def scan_receipt(
             processing_time=processing_time
         )
 
+        if cache_key:
+            await result_cache.set(cache_key, result.model_dump(exclude={"processing_time", "timestamp"}))
+
         ocr_requests_success.inc()
         logger.info(f"OCR completed successfully in {processing_time:.2f}s (confidence: {avg_confidence:.2f})")
 
-        return result
+        return result, cache_status
 
     except HTTPException:
         raise
@@ -315,6 +565,210 @@ async def scan_receipt(
         )
 
 
+async def read_uploads(files: List[UploadFile]) -> List[Tuple[Optional[str], Optional[str], bytes]]:
+    """Read a multipart batch, enforcing the file-count and total-size limits"""
+    if len(files) > OCR_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files: {len(files)}. Maximum is {OCR_BATCH_MAX_FILES} per request."
+        )
+
+    stage_start = time.perf_counter()
+    images = []
+    total_bytes = 0
+    for file in files:
+        contents = await file.read()
+        total_bytes += len(contents)
+        if total_bytes > OCR_BATCH_MAX_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch too large. Maximum is {OCR_BATCH_MAX_BYTES // (1024 * 1024)}MB per request."
+            )
+        images.append((file.filename, file.content_type, contents))
+    ocr_stage_time.labels(stage="read").observe(time.perf_counter() - stage_start)
+
+    return images
+
+
+async def process_batch(
+    images: List[Tuple[Optional[str], Optional[str], bytes]],
+    on_item: Optional[Callable[[BatchItemResult], Awaitable[None]]] = None
+) -> List[BatchItemResult]:
+    """
+    OCR a list of (filename, content_type, bytes), one result per image
+
+    Images share the inference tier with interactive scans but wait for a
+    free worker instead of being rejected, so a large batch never fills the
+    queue that /scan relies on. A failing image doesn't fail the batch.
+    """
+    async def run(index: int, filename, content_type, contents) -> BatchItemResult:
+        try:
+            result, cache_status = await process_image(contents, content_type, filename, wait=True)
+            item = BatchItemResult(index=index, filename=filename, success=True, cache=cache_status, result=result)
+        except HTTPException as e:
+            item = BatchItemResult(index=index, filename=filename, success=False, error=e.detail, status_code=e.status_code)
+        if on_item:
+            await on_item(item)
+        return item
+
+    return await asyncio.gather(*(
+        run(index, filename, content_type, contents)
+        for index, (filename, content_type, contents) in enumerate(images)
+    ))
+
+
+async def job_heartbeat():
+    """Keep this worker's job owner key alive so its jobs aren't failed as orphans"""
+    while True:
+        await asyncio.sleep(OCR_JOB_HEARTBEAT_SECONDS)
+        await job_store.heartbeat(OCR_JOB_HEARTBEAT_SECONDS * 3)
+
+
+async def run_ocr_job(job: Dict[str, Any], images: List[Tuple[Optional[str], Optional[str], bytes]]):
+    """Background task: process a submitted job and notify its webhook"""
+    job["status"] = "running"
+    await job_store.save(job)
+
+    async def track(item: BatchItemResult):
+        job["completed" if item.success else "failed"] += 1
+        await job_store.save(job)
+
+    try:
+        items = await process_batch(images, on_item=track)
+        job["results"] = [item.model_dump(mode="json") for item in items]
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error(f"OCR job {job['job_id']} failed: {e}", exc_info=True)
+        job["status"] = "failed"
+        job["error"] = str(e)
+
+    job["finished_at"] = datetime.utcnow().isoformat()
+    await job_store.save(job)
+    ocr_jobs_total.labels(status=job["status"]).inc()
+
+    if job["webhook_url"]:
+        delivered = await deliver_webhook(job["webhook_url"], job, allowed_hosts=OCR_WEBHOOK_ALLOWED_HOSTS)
+        job["webhook_status"] = "delivered" if delivered else "failed"
+        await job_store.save(job)
+
+
+@app.post("/api/v1/ocr/scan", response_model=OCRResult)
+async def scan_receipt(
+    response: Response,
+    file: UploadFile = File(...),
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Scan receipt or document using OCR
+
+    Args:
+        file: Image file (JPEG, PNG)
+        x_api_key: API key for authentication (optional)
+
+    Returns:
+        OCRResult: Structured OCR result with extracted data
+
+    Identical images are served from the result cache; the X-OCR-Cache
+    response header says whether this request was a hit or a miss.
+    """
+    # Read image file
+    stage_start = time.perf_counter()
+    contents = await file.read()
+    ocr_stage_time.labels(stage="read").observe(time.perf_counter() - stage_start)
+
+    result, cache_status = await process_image(contents, file.content_type, file.filename)
+    if cache_status:
+        response.headers["X-OCR-Cache"] = cache_status
+
+    return result
+
+
+@app.post("/api/v1/ocr/batch", response_model=BatchOCRResponse)
+async def scan_batch(
+    files: List[UploadFile] = File(...),
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Scan many receipts in one request
+
+    Args:
+        files: Image files (JPEG, PNG), sent as repeated "files" form fields
+        x_api_key: API key for authentication (optional)
+
+    Returns:
+        BatchOCRResponse: One result per file, in upload order
+
+    Use /api/v1/ocr/jobs for imports too large to wait on.
+    """
+    start_time = time.time()
+    images = await read_uploads(files)
+    items = await process_batch(images)
+    succeeded = sum(1 for item in items if item.success)
+
+    return BatchOCRResponse(
+        success=succeeded == len(items),
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        results=items,
+        processing_time=time.time() - start_time
+    )
+
+
+@app.post("/api/v1/ocr/jobs", response_model=OCRJob, status_code=202)
+async def submit_ocr_job(
+    files: List[UploadFile] = File(...),
+    webhook_url: Optional[str] = Form(None),
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Submit receipts for background OCR
+
+    Args:
+        files: Image files (JPEG, PNG), sent as repeated "files" form fields
+        webhook_url: Optional URL that receives the finished job as a JSON POST
+        x_api_key: API key for authentication (optional)
+
+    Returns:
+        OCRJob: The queued job; poll GET /api/v1/ocr/jobs/{job_id} for results
+
+    Answers 429 while OCR_MAX_PENDING_JOBS jobs are unfinished in this worker.
+    Webhooks must resolve to public addresses unless listed in
+    OCR_WEBHOOK_ALLOWED_HOSTS, and redirects are not followed.
+    """
+    if len(background_jobs) >= OCR_MAX_PENDING_JOBS:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many pending OCR jobs, retry later",
+            headers={"Retry-After": str(OCR_RETRY_AFTER_SECONDS)}
+        )
+
+    if webhook_url:
+        try:
+            await check_webhook_url(webhook_url, OCR_WEBHOOK_ALLOWED_HOSTS)
+        except WebhookNotAllowedError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    images = await read_uploads(files)
+    job = await job_store.create(len(images), webhook_url)
+
+    task = asyncio.create_task(run_ocr_job(job, images))
+    background_jobs.add(task)
+    task.add_done_callback(background_jobs.discard)
+
+    logger.info(f"Queued OCR job {job['job_id']} with {len(images)} images")
+    return OCRJob(**job)
+
+
+@app.get("/api/v1/ocr/jobs/{job_id}", response_model=OCRJob)
+async def get_ocr_job(job_id: str, x_api_key: Optional[str] = Header(None)):
+    """Job status and, once completed, per-image results"""
+    job = await job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"OCR job not found: {job_id}")
+    return OCRJob(**job)
+
+
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
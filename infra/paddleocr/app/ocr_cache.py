@@ -0,0 +1,119 @@
+"""
+Content-addressed OCR result cache
+Identical uploads (the same receipt from mobile, Concur and email) hash to
+the same key, so resubmissions are served from Redis without re-running OCR
+"""
+
+import hashlib
+import json
+import logging
+from typing import Optional, Dict, Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Metrics
+ocr_cache_hits = Counter('ocr_cache_hits', 'OCR results served from the cache')
+ocr_cache_misses = Counter('ocr_cache_misses', 'OCR cache lookups that ran OCR')
+ocr_cache_errors = Counter('ocr_cache_errors', 'Redis errors in the OCR cache (treated as misses)')
+ocr_cache_hit_ratio = Gauge('ocr_cache_hit_ratio', 'OCR cache hit ratio since process start')
+ocr_cache_stored_bytes = Counter('ocr_cache_stored_bytes', 'Bytes written to the OCR cache')
+ocr_cache_entry_bytes = Histogram(
+    'ocr_cache_entry_bytes', 'Size of cached OCR results',
+    buckets=(256, 1024, 4096, 16384, 65536, 262144)
+)
+
+
+class OCRResultCache:
+    """
+    Redis cache of OCR results keyed by SHA-256(engine params + image bytes)
+
+    The engine fingerprint is part of the key, so upgrading PaddleOCR or the
+    extraction logic never serves results produced by the old pipeline.
+    Redis failures are logged and count as misses.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        engine_fingerprint: str,
+        ttl: int = 7 * 24 * 3600,
+        max_entry_bytes: int = 256 * 1024,
+        namespace: str = "ocr:result"
+    ):
+        self.redis = redis_client
+        self.engine_fingerprint = engine_fingerprint
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.namespace = namespace
+
+        self.hits = 0
+        self.misses = 0
+        self.stored_entries = 0
+        self.stored_bytes = 0
+
+    def key(self, contents: bytes) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.engine_fingerprint.encode())
+        digest.update(b"\0")
+        digest.update(contents)
+        return f"{self.namespace}:{digest.hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None"""
+        raw = None
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(key)
+            except Exception as e:
+                ocr_cache_errors.inc()
+                logger.warning(f"OCR cache read failed: {e}")
+
+        if raw is None:
+            self.misses += 1
+            ocr_cache_misses.inc()
+        else:
+            self.hits += 1
+            ocr_cache_hits.inc()
+        ocr_cache_hit_ratio.set(self.hit_ratio)
+
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        """Store a result unless it's larger than max_entry_bytes"""
+        if self.redis is None:
+            return
+
+        payload = json.dumps(result)
+        size = len(payload.encode())
+        if size > self.max_entry_bytes:
+            logger.info(f"Not caching OCR result of {size} bytes (limit {self.max_entry_bytes})")
+            return
+
+        try:
+            await self.redis.set(key, payload, ex=self.ttl)
+        except Exception as e:
+            ocr_cache_errors.inc()
+            logger.warning(f"OCR cache write failed: {e}")
+            return
+
+        self.stored_entries += 1
+        self.stored_bytes += size
+        ocr_cache_stored_bytes.inc(size)
+        ocr_cache_entry_bytes.observe(size)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "stored_entries": self.stored_entries,
+            "stored_bytes": self.stored_bytes,
+            "ttl_seconds": self.ttl
+        }
@@ -0,0 +1,192 @@
+"""
+Async OCR job store
+Job state lives in Redis so any uvicorn worker can answer a poll for a job
+submitted to another; falls back to process memory when Redis is unavailable
+"""
+
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+import urllib.request
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """Create, update and read OCR job documents (plain dicts)"""
+
+    def __init__(self, redis_client=None, ttl: int = 24 * 3600, namespace: str = "ocr:job"):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.namespace = namespace
+        # Process that runs the jobs it creates; see heartbeat()/fail_orphaned()
+        self.owner = uuid.uuid4().hex
+        self._local: Dict[str, Dict[str, Any]] = {}
+
+    async def create(self, total: int, webhook_url: Optional[str] = None) -> Dict[str, Any]:
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "total": total,
+            "completed": 0,
+            "failed": 0,
+            "created_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "webhook_url": webhook_url,
+            "webhook_status": None,
+            "results": None,
+            "owner": self.owner
+        }
+        await self.save(job)
+        return job
+
+    async def save(self, job: Dict[str, Any]):
+        if self.redis is None:
+            self._local[job["job_id"]] = job
+            return
+
+        try:
+            await self.redis.set(f"{self.namespace}:{job['job_id']}", json.dumps(job), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"OCR job store write failed, keeping job in memory: {e}")
+            self._local[job["job_id"]] = job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if job_id in self._local:
+            return self._local[job_id]
+        if self.redis is None:
+            return None
+
+        try:
+            raw = await self.redis.get(f"{self.namespace}:{job_id}")
+        except Exception as e:
+            logger.warning(f"OCR job store read failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def heartbeat(self, ttl: int):
+        """Mark this process alive for ttl seconds"""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(f"{self.namespace}-owner:{self.owner}", "1", ex=ttl)
+        except Exception as e:
+            logger.warning(f"OCR job owner heartbeat failed: {e}")
+
+    async def fail_orphaned(self) -> int:
+        """
+        Fail queued/running jobs whose owning process is gone
+
+        Jobs run in the process that accepted them, so after a crash or
+        restart nothing will ever finish them. Jobs of other live workers
+        are recognised by their owner heartbeat and left alone.
+        """
+        if self.redis is None:
+            return 0
+
+        failed = 0
+        try:
+            async for key in self.redis.scan_iter(match=f"{self.namespace}:*"):
+                raw = await self.redis.get(key)
+                job = json.loads(raw) if raw else None
+                if not job or job.get("status") not in ("queued", "running"):
+                    continue
+                owner = job.get("owner")
+                if owner and await self.redis.exists(f"{self.namespace}-owner:{owner}"):
+                    continue
+                job["status"] = "failed"
+                job["error"] = "OCR service restarted before the job finished"
+                job["finished_at"] = datetime.utcnow().isoformat()
+                await self.save(job)
+                failed += 1
+        except Exception as e:
+            logger.warning(f"OCR job store orphan scan failed: {e}")
+        return failed
+
+
+class WebhookNotAllowedError(ValueError):
+    """Raised for webhook URLs that point at internal addresses"""
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Treat 3xx as a failed delivery instead of following it past the URL check"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_webhook_opener = urllib.request.build_opener(_NoRedirect)
+
+
+async def check_webhook_url(url: str, allowed_hosts: Iterable[str] = ()):
+    """
+    Reject webhook URLs that would make the service call internal addresses
+
+    Hosts in allowed_hosts are accepted as-is; any other host must resolve
+    to public addresses only (no loopback, private, link-local, ...).
+
+    Raises:
+        WebhookNotAllowedError: Not an http(s) URL or an internal address
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise WebhookNotAllowedError("webhook_url must be an http(s) URL")
+
+    host = parts.hostname.lower()
+    if host in allowed_hosts:
+        return
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except (socket.gaierror, UnicodeError) as e:
+        raise WebhookNotAllowedError(f"webhook host {host} does not resolve: {e}")
+
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global:
+            raise WebhookNotAllowedError(f"webhook host {host} resolves to internal address {address}")
+
+
+async def deliver_webhook(
+    url: str,
+    payload: Dict[str, Any],
+    attempts: int = 3,
+    timeout: float = 10.0,
+    allowed_hosts: Iterable[str] = ()
+) -> bool:
+    """POST the finished job to the caller's webhook, retrying with backoff"""
+    body = json.dumps(payload).encode()
+
+    def post():
+        request = urllib.request.Request(
+            url, data=body, method="POST",
+            headers={"Content-Type": "application/json", "User-Agent": "paddleocr-service"}
+        )
+        with _webhook_opener.open(request, timeout=timeout) as response:
+            return response.status
+
+    for attempt in range(1, attempts + 1):
+        try:
+            # Re-checked per attempt: the host may resolve differently by now
+            await check_webhook_url(url, allowed_hosts)
+            status = await asyncio.to_thread(post)
+            if status < 300:
+                return True
+            logger.warning(f"Webhook {url} returned {status} (attempt {attempt})")
+        except WebhookNotAllowedError as e:
+            logger.warning(f"Webhook {url} refused: {e}")
+            return False
+        except Exception as e:
+            logger.warning(f"Webhook {url} failed (attempt {attempt}): {e}")
+        if attempt < attempts:
+            await asyncio.sleep(2 ** (attempt - 1))
+
+    return False
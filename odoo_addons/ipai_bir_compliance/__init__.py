@@ -3,11 +3,10 @@
 from . import models
 
 
-def post_init_hook(cr, registry):
+def post_init_hook(env):
     """Post-installation hook to setup BIR compliance defaults"""
-    from odoo import api, SUPERUSER_ID
-
-    env = api.Environment(cr, SUPERUSER_ID, {})
+    # Backfill the tax ledger from already-posted entries
+    env['bir.tax.ledger'].rebuild()
 
     # Create default BIR configuration for each company
     companies = env['res.company'].search([])
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'InsightPulse BIR Compliance',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.1.0',
     'category': 'Accounting/Localizations',
     'summary': 'Philippine BIR Tax Forms Automation (1601-C, 2550Q, 1702-RT)',
     'description': """
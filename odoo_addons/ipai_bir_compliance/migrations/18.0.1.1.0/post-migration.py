@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Backfill bir.tax.ledger, introduced in 18.0.1.1.0, from posted entries"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    rows = env['bir.tax.ledger'].rebuild()
+    _logger.info("ipai_bir_compliance %s -> 18.0.1.1.0: tax ledger backfilled (%s rows)", version, rows)
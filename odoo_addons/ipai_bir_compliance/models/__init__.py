@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from . import bir_gl_aggregation
+from . import bir_tax_ledger
 from . import bir_form_1601c
 from . import bir_form_2550q
 from . import bir_form_1702rt
@@ -8,8 +8,18 @@
 from datetime import datetime
 import calendar
 
+from .bir_gl_aggregation import CREDIT
+
 _logger = logging.getLogger(__name__)
 
+# Account codes for withholding tax payable (Philippine COA):
+# 2151 - Withholding Tax Payable (Compensation)
+# 2152 - Withholding Tax Payable (Expanded)
+WHT_ACCOUNT_BUCKETS = {
+    'compensation': (('2151',), CREDIT),
+    'expanded': (('2152',), CREDIT),
+}
+
 
 class BIRForm1601C(models.Model):
     """BIR Form 1601-C - Monthly Remittance Return of Income Taxes Withheld"""
@@ -216,44 +226,32 @@ def _compute_deadline(self):
 
     @api.depends('company_id', 'period_start', 'period_end')
     def _compute_tax_amounts(self):
-        """Compute tax amounts from General Ledger"""
+        """Compute tax amounts from General Ledger
+
+        All records are summed by one grouped query (see bir.gl.aggregation),
+        so recomputing a year of forms for every agency doesn't load the
+        underlying move lines.
+        """
+        totals = self.env['bir.gl.aggregation'].period_totals(
+            [(record.company_id, record.period_start, record.period_end) for record in self],
+            WHT_ACCOUNT_BUCKETS,
+        )
+
         for record in self:
-            if not record.company_id or not record.period_start or not record.period_end:
-                record.tax_withheld_compensation = 0.0
-                record.tax_withheld_expanded = 0.0
-                record.tax_withheld_total = 0.0
-                continue
-
-            # Query account.move.line for withholding tax transactions
-            # Account codes for withholding tax payable (Philippine COA):
-            # 2151 - Withholding Tax Payable (Compensation)
-            # 2152 - Withholding Tax Payable (Expanded)
-
-            domain_compensation = [
-                ('company_id', '=', record.company_id.id),
-                ('date', '>=', record.period_start),
-                ('date', '<=', record.period_end),
-                ('account_id.code', '=like', '2151%'),
-                ('parent_state', '=', 'posted')  # Only posted entries
-            ]
-
-            domain_expanded = [
-                ('company_id', '=', record.company_id.id),
-                ('date', '>=', record.period_start),
-                ('date', '<=', record.period_end),
-                ('account_id.code', '=like', '2152%'),
-                ('parent_state', '=', 'posted')
-            ]
-
-            # Get move lines
-            moves_compensation = self.env['account.move.line'].search(domain_compensation)
-            moves_expanded = self.env['account.move.line'].search(domain_expanded)
-
-            # Calculate totals (credit - debit for liability accounts)
-            record.tax_withheld_compensation = sum(moves_compensation.mapped('credit')) - sum(moves_compensation.mapped('debit'))
-            record.tax_withheld_expanded = sum(moves_expanded.mapped('credit')) - sum(moves_expanded.mapped('debit'))
+            amounts = totals.get(
+                (record.company_id.id, record.period_start, record.period_end),
+                {'compensation': 0.0, 'expanded': 0.0},
+            )
+            record.tax_withheld_compensation = amounts['compensation']
+            record.tax_withheld_expanded = amounts['expanded']
             record.tax_withheld_total = record.tax_withheld_compensation + record.tax_withheld_expanded
 
+    @api.model
+    def _tax_due_for_periods(self, periods):
+        """Total tax withheld per (company_id, date_from, date_to), without creating forms"""
+        totals = self.env['bir.gl.aggregation'].period_totals(periods, WHT_ACCOUNT_BUCKETS)
+        return {key: amounts['compensation'] + amounts['expanded'] for key, amounts in totals.items()}
+
     @api.depends('tax_withheld_total', 'penalties', 'interest')
     def _compute_total(self):
         for record in self:
@@ -3,9 +3,22 @@
 from odoo import models, fields, api
 from odoo.exceptions import UserError
 import logging
+from datetime import date
+
+from .bir_gl_aggregation import CREDIT, DEBIT
 
 _logger = logging.getLogger(__name__)
 
+# Account code classes (Philippine COA):
+# 4 - Revenue
+# 5 - Cost of Sales/Services
+# 6 - Operating Expenses
+INCOME_ACCOUNT_BUCKETS = {
+    'gross_income': (('4',), CREDIT),
+    'cost_of_sales': (('5',), DEBIT),
+    'operating_expenses': (('6',), DEBIT),
+}
+
 
 class BIRForm1702RT(models.Model):
     """BIR Form 1702-RT - Annual Income Tax Return (Regular)"""
@@ -41,8 +54,76 @@ class BIRForm1702RT(models.Model):
         ('rejected', 'Rejected')
     ], string='Status', default='draft', tracking=True)
 
+    period_start = fields.Date(
+        string='Period Start',
+        compute='_compute_period_dates',
+        store=True
+    )
+
+    period_end = fields.Date(
+        string='Period End',
+        compute='_compute_period_dates',
+        store=True
+    )
+
+    currency_id = fields.Many2one(
+        'res.currency',
+        string='Currency',
+        default=lambda self: self.env.ref('base.PHP'),
+        readonly=True
+    )
+
+    gross_income = fields.Monetary(
+        string='Gross Income',
+        compute='_compute_income_amounts',
+        store=True,
+        currency_field='currency_id'
+    )
+
+    deductions = fields.Monetary(
+        string='Deductions',
+        compute='_compute_income_amounts',
+        store=True,
+        currency_field='currency_id',
+        help='Cost of sales/services plus operating expenses'
+    )
+
+    taxable_income = fields.Monetary(
+        string='Taxable Income',
+        compute='_compute_income_amounts',
+        store=True,
+        currency_field='currency_id'
+    )
+
     # TODO: Implement full 1702-RT logic in M2 (Annual return)
 
+    @api.depends('period_year')
+    def _compute_period_dates(self):
+        for record in self:
+            if record.period_year:
+                record.period_start = date(record.period_year, 1, 1)
+                record.period_end = date(record.period_year, 12, 31)
+            else:
+                record.period_start = False
+                record.period_end = False
+
+    @api.depends('company_id', 'period_start', 'period_end')
+    def _compute_income_amounts(self):
+        """Compute annual income totals from General Ledger (one grouped query for all records)"""
+        totals = self.env['bir.gl.aggregation'].period_totals(
+            [(record.company_id, record.period_start, record.period_end) for record in self],
+            INCOME_ACCOUNT_BUCKETS,
+        )
+
+        for record in self:
+            amounts = totals.get(
+                (record.company_id.id, record.period_start, record.period_end),
+                dict.fromkeys(INCOME_ACCOUNT_BUCKETS, 0.0),
+            )
+            record.gross_income = amounts['gross_income']
+            record.deductions = amounts['cost_of_sales'] + amounts['operating_expenses']
+            record.taxable_income = record.gross_income - record.deductions
+
     @api.depends('period_year')
     def _compute_name(self):
         for record in self:
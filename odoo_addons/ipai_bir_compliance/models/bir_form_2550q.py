@@ -3,9 +3,21 @@
 from odoo import models, fields, api
 from odoo.exceptions import UserError
 import logging
+import calendar
+from datetime import date
+
+from .bir_gl_aggregation import CREDIT, DEBIT
 
 _logger = logging.getLogger(__name__)
 
+# Account codes for VAT (Philippine COA):
+# 2153 - VAT Payable (Output VAT)
+# 1141 - Input VAT
+VAT_ACCOUNT_BUCKETS = {
+    'output_vat': (('2153',), CREDIT),
+    'input_vat': (('1141',), DEBIT),
+}
+
 
 class BIRForm2550Q(models.Model):
     """BIR Form 2550Q - Quarterly Value-Added Tax Return"""
@@ -48,8 +60,85 @@ class BIRForm2550Q(models.Model):
         ('rejected', 'Rejected')
     ], string='Status', default='draft', tracking=True)
 
+    period_start = fields.Date(
+        string='Period Start',
+        compute='_compute_period_dates',
+        store=True
+    )
+
+    period_end = fields.Date(
+        string='Period End',
+        compute='_compute_period_dates',
+        store=True
+    )
+
+    currency_id = fields.Many2one(
+        'res.currency',
+        string='Currency',
+        default=lambda self: self.env.ref('base.PHP'),
+        readonly=True
+    )
+
+    output_vat = fields.Monetary(
+        string='Output VAT',
+        compute='_compute_vat_amounts',
+        store=True,
+        currency_field='currency_id'
+    )
+
+    input_vat = fields.Monetary(
+        string='Input VAT',
+        compute='_compute_vat_amounts',
+        store=True,
+        currency_field='currency_id'
+    )
+
+    vat_payable = fields.Monetary(
+        string='VAT Payable',
+        compute='_compute_vat_amounts',
+        store=True,
+        currency_field='currency_id'
+    )
+
     # TODO: Implement full 2550Q logic in M1 (similar to 1601-C)
 
+    @api.depends('period_year', 'period_quarter')
+    def _compute_period_dates(self):
+        for record in self:
+            if record.period_year and record.period_quarter:
+                last_month = int(record.period_quarter) * 3
+                record.period_start = date(record.period_year, last_month - 2, 1)
+                record.period_end = date(
+                    record.period_year, last_month,
+                    calendar.monthrange(record.period_year, last_month)[1]
+                )
+            else:
+                record.period_start = False
+                record.period_end = False
+
+    @api.depends('company_id', 'period_start', 'period_end')
+    def _compute_vat_amounts(self):
+        """Compute quarterly VAT from General Ledger (one grouped query for all records)"""
+        totals = self.env['bir.gl.aggregation'].period_totals(
+            [(record.company_id, record.period_start, record.period_end) for record in self],
+            VAT_ACCOUNT_BUCKETS,
+        )
+
+        for record in self:
+            amounts = totals.get(
+                (record.company_id.id, record.period_start, record.period_end),
+                {'output_vat': 0.0, 'input_vat': 0.0},
+            )
+            record.output_vat = amounts['output_vat']
+            record.input_vat = amounts['input_vat']
+            record.vat_payable = record.output_vat - record.input_vat
+
+    @api.model
+    def _tax_due_for_periods(self, periods):
+        """VAT payable per (company_id, date_from, date_to), without creating forms"""
+        totals = self.env['bir.gl.aggregation'].period_totals(periods, VAT_ACCOUNT_BUCKETS)
+        return {key: amounts['output_vat'] - amounts['input_vat'] for key, amounts in totals.items()}
+
     @api.depends('period_year', 'period_quarter')
     def _compute_name(self):
         for record in self:
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+from datetime import date
+import logging
+
+from odoo import models, api
+from odoo.osv import expression
+
+_logger = logging.getLogger(__name__)
+
+# Normal balance of an account bucket
+CREDIT = 'credit'  # liabilities/income: credit - debit
+DEBIT = 'debit'    # assets/expenses: debit - credit
+
+
+class BIRGLAggregation(models.AbstractModel):
+    """Set-based General Ledger totals for BIR forms
+
+    Forms describe what they need as buckets of account code prefixes:
+
+        {'expanded': (('2152',), CREDIT), ...}
+
+    and ask for totals over many (company, period) pairs at once. All
+    periods of a batch are answered by one grouped query on the monthly
+    bir.tax.ledger (company, account, month), instead of loading every
+    move line into the ORM per form.
+    """
+
+    _name = 'bir.gl.aggregation'
+    _description = 'BIR General Ledger Aggregation'
+
+    def init(self):
+        # Supports bir.tax.ledger rebuilds and ad-hoc GL drill-downs: posted
+        # lines filtered by company, a handful of tax accounts and a date range
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS account_move_line_bir_company_account_date_idx
+                ON account_move_line (company_id, account_id, date)
+             WHERE parent_state = 'posted'
+        """)
+
+    @api.model
+    def period_totals(self, periods, buckets):
+        """Sum account buckets for many company periods in one query
+
+        :param periods: iterable of (company, date_from, date_to). Periods
+            must cover whole months (monthly, quarterly or annual returns).
+        :param buckets: {bucket: (code prefixes, CREDIT or DEBIT)}
+        :return: {(company_id, date_from, date_to): {bucket: amount}}, with
+            every requested period and bucket present (0.0 when no lines)
+        """
+        periods = {
+            (company.id, date_from, date_to): company
+            for company, date_from, date_to in periods
+            if company and date_from and date_to
+        }
+        totals = {key: dict.fromkeys(buckets, 0.0) for key in periods}
+        if not periods:
+            return totals
+
+        companies = self.env['res.company'].browse({company_id for company_id, _start, _end in periods})
+        account_buckets = self._account_buckets(companies, buckets)
+        if not account_buckets:
+            return totals
+
+        monthly = self._monthly_balances(
+            companies,
+            {account_id for account_id, _company_id in account_buckets},
+            min(date_from for _company_id, date_from, _date_to in periods),
+            max(date_to for _company_id, _date_from, date_to in periods),
+        )
+
+        # Roll month/account balances into the periods that contain them
+        by_company = defaultdict(list)
+        for key in periods:
+            by_company[key[0]].append(key)
+
+        for (company_id, account_id, month), balance in monthly.items():
+            bucket = account_buckets.get((account_id, company_id))
+            if not bucket:
+                continue
+            amount = -balance if buckets[bucket][1] == CREDIT else balance
+            for key in by_company[company_id]:
+                if key[1] <= month <= key[2]:
+                    totals[key][bucket] += amount
+
+        return totals
+
+    def _account_buckets(self, companies, buckets):
+        """Map (account_id, company_id) to its bucket by code prefix
+
+        Account codes are company dependent, so prefixes are resolved per
+        company. The chart of accounts is small; this is a few queries per
+        batch regardless of how many periods are requested.
+        """
+        Account = self.env['account.account']
+        prefixes = [
+            (prefix, bucket)
+            for bucket, (codes, _side) in buckets.items()
+            for prefix in codes
+        ]
+        # Longest prefix wins when buckets overlap (e.g. '4' and '42')
+        prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        code_domain = expression.OR([[('code', '=like', f'{prefix}%')] for prefix, _bucket in prefixes])
+
+        account_buckets = {}
+        for company in companies:
+            accounts = Account.with_company(company).search(
+                expression.AND([Account._check_company_domain(company), code_domain])
+            )
+            for account in accounts:
+                for prefix, bucket in prefixes:
+                    if account.code and account.code.startswith(prefix):
+                        account_buckets[(account.id, company.id)] = bucket
+                        break
+        return account_buckets
+
+    def _monthly_balances(self, companies, account_ids, date_from, date_to):
+        """{(company_id, account_id, month start): debit - credit} for posted lines"""
+        groups = self.env['bir.tax.ledger'].sudo()._read_group(
+            domain=[
+                ('company_id', 'in', companies.ids),
+                ('account_id', 'in', list(account_ids)),
+                ('period', '>=', date_from),
+                ('period', '<=', date_to),
+            ],
+            groupby=['company_id', 'account_id', 'period:month'],
+            aggregates=['debit:sum', 'credit:sum'],
+        )
+
+        balances = {}
+        for company, account, month, debit, credit in groups:
+            month = date(month.year, month.month, 1)
+            balances[(company.id, account.id, month)] = (debit or 0.0) - (credit or 0.0)
+
+        _logger.debug(
+            "BIR GL aggregation: %s month/account groups for %s companies (%s to %s)",
+            len(balances), len(companies), date_from, date_to,
+        )
+        return balances
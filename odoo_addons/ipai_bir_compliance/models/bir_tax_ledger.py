@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Form fields fed from the ledger; draft forms touching a changed period are
+# recomputed when moves are posted or reset to draft
+LEDGER_FORM_FIELDS = {
+    'bir.form.1601c': ['tax_withheld_compensation', 'tax_withheld_expanded', 'tax_withheld_total'],
+    'bir.form.2550q': ['output_vat', 'input_vat', 'vat_payable'],
+    'bir.form.1702rt': ['gross_income', 'deductions', 'taxable_income'],
+}
+
+
+class BIRTaxLedger(models.Model):
+    """Materialized monthly tax ledger
+
+    One row per company x month x account x ATC with the debit/credit totals
+    of posted move lines. Maintained incrementally when moves are posted or
+    reset to draft (see account.move), so BIR forms read O(periods) rows
+    instead of scanning the General Ledger. Use rebuild() to backfill.
+    """
+
+    _name = 'bir.tax.ledger'
+    _description = 'BIR Tax Ledger'
+    _order = 'period desc, company_id, account_id'
+
+    company_id = fields.Many2one('res.company', string='Company', required=True, readonly=True, index=True)
+    period = fields.Date(string='Period', required=True, readonly=True, help='First day of the month')
+    account_id = fields.Many2one('account.account', string='Account', required=True, readonly=True)
+    atc = fields.Char(string='ATC', readonly=True, default='', help='BIR Alphanumeric Tax Code of the tax line')
+    currency_id = fields.Many2one(related='company_id.currency_id')
+    debit = fields.Monetary(string='Debit', readonly=True, currency_field='currency_id')
+    credit = fields.Monetary(string='Credit', readonly=True, currency_field='currency_id')
+    balance = fields.Monetary(string='Balance', compute='_compute_balance', currency_field='currency_id')
+    line_count = fields.Integer(string='Move Lines', readonly=True)
+
+    _sql_constraints = [
+        ('bucket_unique', 'unique(company_id, period, account_id, atc)',
+         'Only one tax ledger row per company, period, account and ATC.'),
+    ]
+
+    @api.depends('debit', 'credit')
+    def _compute_balance(self):
+        for row in self:
+            row.balance = row.debit - row.credit
+
+    # Maintenance
+    def _grouped_lines_query(self, where):
+        """SELECT of posted line totals per ledger bucket, filtered by `where`"""
+        if 'l10n_ph_atc' in self.env['account.tax']._fields:
+            atc_join = 'LEFT JOIN account_tax tax ON tax.id = aml.tax_line_id'
+            atc = "COALESCE(tax.l10n_ph_atc, '')"
+        else:
+            atc_join = ''
+            atc = "''"
+
+        return f"""
+            SELECT aml.company_id,
+                   date_trunc('month', aml.date)::date AS period,
+                   aml.account_id,
+                   {atc} AS atc,
+                   SUM(aml.debit) AS debit,
+                   SUM(aml.credit) AS credit,
+                   COUNT(*) AS line_count
+              FROM account_move_line aml
+              {atc_join}
+             WHERE aml.parent_state = 'posted'
+               AND {where}
+          GROUP BY 1, 2, 3, 4
+        """
+
+    def _apply_moves(self, moves, sign):
+        """Add (sign=1) or remove (sign=-1) the lines of moves from the ledger"""
+        if not moves:
+            return
+
+        self.env.flush_all()
+        query = self._grouped_lines_query('aml.move_id IN %(move_ids)s')
+        # parent_state is only 'posted' for moves that are posted right now,
+        # so removals must run before the state changes
+        self.env.cr.execute(f"""
+            INSERT INTO bir_tax_ledger
+                   (company_id, period, account_id, atc, debit, credit, line_count,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT company_id, period, account_id, atc,
+                   %(sign)s * debit, %(sign)s * credit, %(sign)s * line_count,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM ({query}) AS delta
+            ON CONFLICT (company_id, period, account_id, atc) DO UPDATE
+               SET debit = bir_tax_ledger.debit + EXCLUDED.debit,
+                   credit = bir_tax_ledger.credit + EXCLUDED.credit,
+                   line_count = bir_tax_ledger.line_count + EXCLUDED.line_count,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+            RETURNING id, company_id, period, line_count
+        """, {'move_ids': tuple(moves.ids), 'sign': sign, 'uid': self.env.uid})
+        rows = self.env.cr.fetchall()
+        touched = [(company_id, period) for _id, company_id, period, _count in rows]
+
+        # Only the buckets just updated can have dropped to zero lines
+        emptied = tuple(row_id for row_id, _company, _period, count in rows if count == 0)
+        if emptied:
+            self.env.cr.execute("DELETE FROM bir_tax_ledger WHERE id IN %s", (emptied,))
+        self.invalidate_model()
+        self._recompute_draft_forms(touched)
+
+    def _recompute_draft_forms(self, touched):
+        """Queue recomputation of draft forms covering the touched periods"""
+        if not touched:
+            return
+
+        company_ids = list({company_id for company_id, _period in touched})
+        date_from = min(period for _company_id, period in touched)
+        date_to = max(period for _company_id, period in touched)
+
+        for model_name, field_names in LEDGER_FORM_FIELDS.items():
+            Form = self.env[model_name]
+            forms = Form.search([
+                ('state', '=', 'draft'),
+                ('company_id', 'in', company_ids),
+                ('period_end', '>=', date_from),
+                ('period_start', '<=', fields.Date.end_of(date_to, 'month')),
+            ])
+            for field_name in field_names:
+                self.env.add_to_compute(Form._fields[field_name], forms)
+
+    @api.model
+    def rebuild(self, companies=None, date_from=None, date_to=None):
+        """Recreate ledger rows from posted move lines
+
+        Backfill after install/upgrade or after editing data outside the
+        ORM, e.g. from an Odoo shell::
+
+            env['bir.tax.ledger'].rebuild()
+            env['bir.tax.ledger'].rebuild(date_from=date(2024, 1, 1))
+            env.cr.commit()
+
+        :param companies: res.company records (default: all)
+        :param date_from: first date to rebuild (rounded down to the month)
+        :param date_to: last date to rebuild (rounded up to the month)
+        :return: number of ledger rows written
+        """
+        self.env.flush_all()
+
+        ledger_conditions, line_conditions, params = ['TRUE'], ['TRUE'], {}
+        if companies:
+            ledger_conditions.append('company_id IN %(company_ids)s')
+            line_conditions.append('aml.company_id IN %(company_ids)s')
+            params['company_ids'] = tuple(companies.ids)
+        if date_from:
+            ledger_conditions.append('period >= %(date_from)s')
+            line_conditions.append('aml.date >= %(date_from)s')
+            params['date_from'] = fields.Date.start_of(fields.Date.to_date(date_from), 'month')
+        if date_to:
+            ledger_conditions.append('period <= %(date_to)s')
+            line_conditions.append('aml.date <= %(date_to)s')
+            params['date_to'] = fields.Date.end_of(fields.Date.to_date(date_to), 'month')
+        ledger_where = ' AND '.join(ledger_conditions)
+        line_where = ' AND '.join(line_conditions)
+
+        self.env.cr.execute(f"DELETE FROM bir_tax_ledger WHERE {ledger_where}", params)
+        self.env.cr.execute(f"""
+            INSERT INTO bir_tax_ledger
+                   (company_id, period, account_id, atc, debit, credit, line_count,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT company_id, period, account_id, atc, debit, credit, line_count,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM ({self._grouped_lines_query(line_where)}) AS totals
+            RETURNING company_id, period
+        """, dict(params, uid=self.env.uid))
+        touched = self.env.cr.fetchall()
+        rows = len(touched)
+        self.invalidate_model()
+        self._recompute_draft_forms(touched)
+
+        _logger.info("Rebuilt BIR tax ledger: %s rows (%s)", rows, ledger_where)
+        return rows
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    def _post(self, soft=True):
+        posted = super()._post(soft=soft)
+        self.env['bir.tax.ledger'].sudo()._apply_moves(posted, 1)
+        return posted
+
+    def button_draft(self):
+        # Also reached from button_cancel(), which resets posted moves to draft first
+        self.env['bir.tax.ledger'].sudo()._apply_moves(self.filtered(lambda m: m.state == 'posted'), -1)
+        return super().button_draft()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('bir_compliance', 'post_install', '-at_install')
+class TestBIRForm1601C(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Account = cls.env['account.account']
+        cls.wht_compensation = Account.create({
+            'code': '215101', 'name': 'WHT Payable - Compensation', 'account_type': 'liability_current',
+        })
+        cls.wht_expanded = Account.create({
+            'code': '215201', 'name': 'WHT Payable - Expanded', 'account_type': 'liability_current',
+        })
+        cls.output_vat = Account.create({
+            'code': '215301', 'name': 'VAT Payable', 'account_type': 'liability_current',
+        })
+        cls.input_vat = Account.create({
+            'code': '114101', 'name': 'Input VAT', 'account_type': 'asset_current',
+        })
+        cls.expense = cls.company_data['default_account_expense']
+
+    def _post_entry(self, date, account, credit, post=True):
+        move = self.env['account.move'].create({
+            'move_type': 'entry',
+            'date': date,
+            'journal_id': self.company_data['default_journal_misc'].id,
+            'line_ids': [
+                (0, 0, {'account_id': account.id, 'credit': credit, 'debit': 0.0}),
+                (0, 0, {'account_id': self.expense.id, 'debit': credit, 'credit': 0.0}),
+            ],
+        })
+        if post:
+            move.action_post()
+        return move
+
+    def _create_1601c(self, month, year=2024):
+        return self.env['bir.form.1601c'].create({
+            'company_id': self.env.company.id,
+            'period_month': month,
+            'period_year': year,
+        })
+
+    def test_tax_amounts_from_posted_lines(self):
+        self._post_entry('2024-03-05', self.wht_compensation, 1000.0)
+        self._post_entry('2024-03-20', self.wht_expanded, 250.0)
+        self._post_entry('2024-03-21', self.wht_expanded, 999.0, post=False)  # draft, ignored
+        self._post_entry('2024-04-01', self.wht_expanded, 75.0)  # next period
+
+        form = self._create_1601c(3)
+
+        self.assertEqual(form.tax_withheld_compensation, 1000.0)
+        self.assertEqual(form.tax_withheld_expanded, 250.0)
+        self.assertEqual(form.tax_withheld_total, 1250.0)
+
+    def test_many_periods_share_one_aggregation(self):
+        for month, amount in ((1, 100.0), (2, 200.0), (3, 300.0)):
+            self._post_entry(f'2024-{month:02d}-15', self.wht_expanded, amount)
+
+        forms = self._create_1601c(1) | self._create_1601c(2) | self._create_1601c(3)
+        forms.invalidate_recordset(['tax_withheld_expanded'])
+        forms._compute_tax_amounts()
+
+        self.assertEqual(forms.mapped('tax_withheld_expanded'), [100.0, 200.0, 300.0])
+
+    def test_period_totals_for_quarterly_vat(self):
+        self._post_entry('2024-01-10', self.output_vat, 1200.0)
+        self._post_entry('2024-03-31', self.output_vat, 800.0)
+        self._post_entry('2024-04-01', self.output_vat, 500.0)  # Q2
+
+        form = self.env['bir.form.2550q'].create({
+            'company_id': self.env.company.id,
+            'period_quarter': '1',
+            'period_year': 2024,
+        })
+
+        self.assertEqual(form.output_vat, 2000.0)
+        self.assertEqual(form.input_vat, 0.0)
+        self.assertEqual(form.vat_payable, 2000.0)
+
+    def test_tax_ledger_follows_post_and_reset(self):
+        Ledger = self.env['bir.tax.ledger']
+        move = self._post_entry('2024-05-10', self.wht_expanded, 400.0)
+        form = self._create_1601c(5)
+        self.assertEqual(form.tax_withheld_expanded, 400.0)
+
+        row = Ledger.search([('account_id', '=', self.wht_expanded.id), ('period', '=', '2024-05-01')])
+        self.assertEqual((row.credit, row.line_count), (400.0, 1))
+
+        move.button_draft()
+        self.assertFalse(Ledger.search([('account_id', '=', self.wht_expanded.id), ('period', '=', '2024-05-01')]))
+        self.assertEqual(form.tax_withheld_expanded, 0.0)  # draft forms follow the ledger
+
+        move.action_post()
+        Ledger.rebuild(date_from='2024-05-01', date_to='2024-05-31')
+        self.assertEqual(form.tax_withheld_expanded, 400.0)
+
+    def test_tax_ledger_cancel_removes_lines_once(self):
+        Ledger = self.env['bir.tax.ledger']
+        domain = [('account_id', '=', self.wht_expanded.id), ('period', '=', '2024-06-01')]
+        kept = self._post_entry('2024-06-10', self.wht_expanded, 300.0)
+        cancelled = self._post_entry('2024-06-12', self.wht_expanded, 200.0)
+
+        cancelled.button_cancel()  # resets to draft first; lines leave the ledger once
+        row = Ledger.search(domain)
+        self.assertEqual((row.credit, row.line_count), (300.0, 1))
+
+        kept.button_cancel()
+        self.assertFalse(Ledger.search(domain))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Outbox Benchmark - Synthetic load for the Supabase → Odoo outbox worker
+
+Seeds N synthetic rows into ops.odoo_outbox on a LOCAL Postgres, drains
+them with OutboxWorker against a stub Odoo client with configurable
+latency, and reports throughput plus p50/p99 latencies for every
+combination of batch size and worker count.
+
+The target database must already have the outbox migrations applied
+(supabase/migrations/20260205152220_odoo_sync.sql,
+20260205152221_odoo_sync_checkpointing.sql,
+20260205152222_odoo_outbox_notify.sql and
+20260205152223_odoo_outbox_retry_backoff.sql), or pass --setup.
+The table is TRUNCATEd before every run.
+
+Usage:
+    python outbox-benchmark.py --db-url postgresql://postgres@localhost/outbox_bench --setup
+    python outbox-benchmark.py --rows 50000 --batch-sizes 100,500 --workers 1,4,8
+    python outbox-benchmark.py --odoo-call-ms 40 --odoo-record-ms 2 --json
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+MIGRATIONS = [
+    "20260205152220_odoo_sync.sql",
+    "20260205152221_odoo_sync_checkpointing.sql",
+    "20260205152222_odoo_outbox_notify.sql",
+    "20260205152223_odoo_outbox_retry_backoff.sql",
+]
+LOCAL_HOSTS = {"", "localhost", "127.0.0.1", "::1"}
+
+# outbox-worker.py is not an importable module name; load it from its path
+_spec = importlib.util.spec_from_file_location(
+    "outbox_worker", Path(__file__).resolve().parent / "outbox-worker.py"
+)
+outbox_worker = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(outbox_worker)
+
+psycopg2 = outbox_worker.psycopg2
+logger = logging.getLogger("outbox-benchmark")
+
+
+class StubOdooClient(outbox_worker.OdooClient):
+    """Odoo stand-in that only sleeps: fixed cost per call plus per record"""
+
+    def __init__(self, call_ms: float, record_ms: float):
+        super().__init__("stub://odoo", "bench", "bench", "bench")
+        self.call_seconds = call_ms / 1000
+        self.record_seconds = record_ms / 1000
+
+    def _cost(self, records: int):
+        time.sleep(self.call_seconds + self.record_seconds * records)
+
+    def authenticate(self) -> bool:
+        return True
+
+    def upsert(self, model: str, values: Dict[str, Any]) -> int:
+        self._cost(1)
+        return 1
+
+    def delete(self, model: str, record_id: int) -> bool:
+        self._cost(1)
+        return True
+
+    def upsert_many(self, model: str, values_list: List[Dict[str, Any]]) -> List[int]:
+        self._cost(len(values_list))
+        return [1] * len(values_list)
+
+    def delete_many(self, model: str, record_ids: List[int]) -> bool:
+        self._cost(len(record_ids))
+        return True
+
+
+def setup_schema(db_url: str):
+    """Apply the outbox migrations"""
+    with psycopg2.connect(db_url) as conn, conn.cursor() as cur:
+        for migration in MIGRATIONS:
+            cur.execute((ROOT / "supabase" / "migrations" / migration).read_text())
+
+
+def seed(db_url: str, rows: int, run_id: str):
+    """Replace the outbox contents with N queued synthetic upserts"""
+    with psycopg2.connect(db_url) as conn, conn.cursor() as cur:
+        cur.execute("TRUNCATE ops.odoo_outbox;")
+        cur.execute(
+            """
+            INSERT INTO ops.odoo_outbox(model, operation, payload, idempotency_key)
+            SELECT
+                'res.partner',
+                'upsert',
+                jsonb_build_object('odoo_id', g, 'name', 'Partner ' || g),
+                %s || ':' || g
+            FROM generate_series(1, %s) AS g;
+            """,
+            (f"bench:{run_id}", rows),
+        )
+
+
+def run_case(args, batch_size: int, workers: int) -> Dict[str, Any]:
+    """Seed, drain and measure one (batch size, workers) combination"""
+    seed(args.db_url, args.rows, f"{batch_size}:{workers}:{time.time()}")
+
+    worker = outbox_worker.OutboxWorker(
+        args.db_url,
+        StubOdooClient(args.odoo_call_ms, args.odoo_record_ms),
+        batch_size=batch_size,
+        workers=workers,
+        group_size=args.group_size,
+    )
+    try:
+        start = time.perf_counter()
+        processed = worker.drain()
+        elapsed = time.perf_counter() - start
+    finally:
+        worker.close()
+
+    metrics = worker.metrics
+    result = {
+        "batch_size": batch_size,
+        "workers": workers,
+        "records": processed,
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+        "sync_lag_p50_s": round(metrics.sync_lag_seconds.percentile(50), 3),
+        "sync_lag_p99_s": round(metrics.sync_lag_seconds.percentile(99), 3),
+    }
+    for stage, histogram in metrics.stage_seconds.items():
+        result[f"{stage}_p50_ms"] = round(histogram.percentile(50) * 1000, 2)
+        result[f"{stage}_p99_ms"] = round(histogram.percentile(99) * 1000, 2)
+    return result
+
+
+def print_table(results: List[Dict[str, Any]]):
+    """Print results as an aligned text table"""
+    columns = list(results[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    print("  ".join(c.rjust(widths[c]) for c in columns))
+    for result in results:
+        print("  ".join(str(result[c]).rjust(widths[c]) for c in columns))
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Outbox worker synthetic-load benchmark")
+    parser.add_argument(
+        "--db-url",
+        default=os.environ.get("OUTBOX_BENCH_DB_URL"),
+        help="Local Postgres URL (default: $OUTBOX_BENCH_DB_URL)",
+    )
+    parser.add_argument("--rows", type=int, default=10000, help="Rows seeded per run")
+    parser.add_argument(
+        "--batch-sizes", type=parse_ints, default=[100, 500], help="Comma-separated"
+    )
+    parser.add_argument(
+        "--workers", type=parse_ints, default=[1, 4, 8], help="Comma-separated"
+    )
+    parser.add_argument(
+        "--group-size", type=int, default=outbox_worker.GROUP_SIZE,
+        help="Max records per grouped Odoo call",
+    )
+    parser.add_argument(
+        "--odoo-call-ms", type=float, default=20.0, help="Stub latency per Odoo call"
+    )
+    parser.add_argument(
+        "--odoo-record-ms", type=float, default=0.5, help="Stub latency per record"
+    )
+    parser.add_argument("--setup", action="store_true", help="Apply outbox migrations first")
+    parser.add_argument(
+        "--allow-remote", action="store_true",
+        help="Permit a non-local database (the outbox table is truncated!)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if not args.db_url:
+        parser.error("--db-url or OUTBOX_BENCH_DB_URL is required")
+
+    host = urlparse(args.db_url).hostname or ""
+    if host not in LOCAL_HOSTS and not args.allow_remote:
+        parser.error(f"Refusing to truncate ops.odoo_outbox on non-local host '{host}'")
+
+    # Per-record worker logging would dominate the measurement
+    logging.getLogger("outbox_worker").setLevel(logging.WARNING)
+    outbox_worker.logger.setLevel(logging.WARNING)
+
+    if args.setup:
+        setup_schema(args.db_url)
+
+    results = []
+    for batch_size in args.batch_sizes:
+        for workers in args.workers:
+            print(f"Running batch_size={batch_size} workers={workers}...", file=sys.stderr)
+            results.append(run_case(args, batch_size, workers))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
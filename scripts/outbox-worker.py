@@ -10,22 +10,36 @@
 - Retry logic with exponential backoff
 - Error tracking and alerting
 - Graceful shutdown handling
+- Concurrent mode: pooled DB connections, parallel workers, grouped
+  multi-record Odoo calls and one batched status UPDATE per batch
+- Prometheus metrics: throughput, per-stage latency, queue depth,
+  retries and lock-expiry reclaims (--metrics-port)
 
 Usage:
     python outbox-worker.py --once          # Process queue once and exit
     python outbox-worker.py --daemon        # Run continuously (production)
     python outbox-worker.py --dry-run       # Preview without writing
+    python outbox-worker.py --daemon --workers 8 --batch-size 500
+    python outbox-worker.py --daemon --listen  # Wake on NOTIFY instead of polling
+    python outbox-worker.py --daemon --metrics-port 9105
 """
 
 import argparse
+import heapq
 import logging
 import os
+import select
 import signal
 import sys
+import threading
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -33,7 +47,8 @@
 # Third-party imports (to be installed via requirements)
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extras import RealDictCursor, execute_values
+    from psycopg2.pool import ThreadedConnectionPool
 except ImportError:
     print("ERROR: psycopg2 not installed. Run: pip install psycopg2-binary")
     sys.exit(1)
@@ -49,9 +64,18 @@
 # Configuration
 MAX_RETRIES = 5
 INITIAL_BACKOFF_SECONDS = 10
+MAX_BACKOFF_SECONDS = 300
+RETRY_WAKE_SLACK_SECONDS = 1  # Wake a bit after next_attempt_at (DB vs local clock)
 BATCH_SIZE = 100
 POLL_INTERVAL_SECONDS = 30
+NOTIFY_CHANNEL = "odoo_outbox"  # See migration 20260205152222_odoo_outbox_notify.sql
+LISTEN_FALLBACK_POLL_SECONDS = 300  # Safety-net poll in --listen mode (retries, lock expiry)
+LISTEN_WAIT_SLICE_SECONDS = 5  # Max time blocked in select() before checking shutdown
 LOCK_TIMEOUT_MINUTES = 10
+WORKERS = 1  # >1 enables concurrent processing
+GROUP_SIZE = 50  # Max records per multi-record Odoo call
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LAG_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 3600)
 
 
 @dataclass
@@ -69,6 +93,140 @@ class OutboxRecord:
     locked_by: Optional[str]
     last_error: Optional[str]
     created_at: datetime
+    next_attempt_at: Optional[datetime] = None
+
+
+class Histogram:
+    """
+    Prometheus-style cumulative histogram
+
+    Also keeps the most recent raw samples so exact percentiles can be
+    reported (e.g. by the benchmark harness).
+    """
+
+    def __init__(self, buckets: Tuple[float, ...], max_samples: int = 10000):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples: deque = deque(maxlen=max_samples)
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile (0-100) over the retained samples"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class WorkerMetrics:
+    """Thread-safe counters, gauges and histograms for the outbox worker"""
+
+    STAGES = ("claim", "odoo", "status_update")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            "records_processed_total": 0,
+            "records_failed_total": 0,
+            "retries_total": 0,
+            "permanent_failures_total": 0,
+            "lock_expiry_reclaims_total": 0,
+            "batches_total": 0,
+        }
+        self.gauges = {"queue_depth": 0, "records_per_second": 0.0}
+        self.stage_seconds = {stage: Histogram(LATENCY_BUCKETS) for stage in self.STAGES}
+        self.sync_lag_seconds = Histogram(LAG_BUCKETS)
+
+    def inc(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def set(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe_lag(self, created_at: datetime):
+        """Record enqueue-to-done latency for a synced record"""
+        now = datetime.now(timezone.utc) if created_at.tzinfo else datetime.now()
+        with self._lock:
+            self.sync_lag_seconds.observe(max(0.0, (now - created_at).total_seconds()))
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Time a block into the stage latency histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stage_seconds[stage].observe(elapsed)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, value in self.counters.items():
+                lines += [f"# TYPE outbox_{name} counter", f"outbox_{name} {value}"]
+            for name, value in self.gauges.items():
+                lines += [f"# TYPE outbox_{name} gauge", f"outbox_{name} {value}"]
+
+            lines.append("# TYPE outbox_stage_duration_seconds histogram")
+            for stage, histogram in self.stage_seconds.items():
+                lines += self._render_histogram(
+                    "outbox_stage_duration_seconds", histogram, f'stage="{stage}",'
+                )
+
+            lines.append("# TYPE outbox_sync_lag_seconds histogram")
+            lines += self._render_histogram("outbox_sync_lag_seconds", self.sync_lag_seconds)
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(name: str, histogram: Histogram, labels: str = "") -> List[str]:
+        lines = [
+            f'{name}_bucket{{{labels}le="{bound}"}} {count}'
+            for bound, count in zip(histogram.buckets, histogram.counts)
+        ]
+        lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {histogram.count}')
+        suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {histogram.sum}")
+        lines.append(f"{name}_count{suffix} {histogram.count}")
+        return lines
+
+    def serve(self, port: int) -> ThreadingHTTPServer:
+        """Expose /metrics on a background thread"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"Serving metrics on :{port}/metrics")
+        return server
 
 
 class OdooClient:
@@ -78,8 +236,13 @@ class OdooClient:
     TODO: Implement actual Odoo API calls
     This is a skeleton that needs to be completed with:
     - XML-RPC authentication
-    - Model operations (create, write, unlink)
+    - Model operations (create, write, unlink), including the multi-record
+      upsert_many/delete_many variants used by concurrent mode: one
+      execute_kw 'create' for new records, 'write' per existing record and
+      one 'unlink' per group
     - Error handling
+
+    Until then every operation only logs and returns placeholder values.
     """
 
     def __init__(self, url: str, db: str, username: str, password: str):
@@ -111,6 +274,16 @@ def delete(self, model: str, record_id: int) -> bool:
         logger.info(f"Deleting {model} id={record_id}")
         return True  # Placeholder
 
+    def upsert_many(self, model: str, values_list: List[Dict[str, Any]]) -> List[int]:
+        """Upsert several records of one model in a single round trip"""
+        logger.info(f"Upserting {len(values_list)} {model} records")
+        return [1] * len(values_list)  # Placeholder record IDs
+
+    def delete_many(self, model: str, record_ids: List[int]) -> bool:
+        """Delete several records of one model in a single round trip"""
+        logger.info(f"Deleting {len(record_ids)} {model} records")
+        return True  # Placeholder
+
 
 class OutboxWorker:
     """Main worker class that processes the outbox queue"""
@@ -121,14 +294,27 @@ def __init__(
         odoo_client: OdooClient,
         batch_size: int = BATCH_SIZE,
         dry_run: bool = False,
+        workers: int = WORKERS,
+        group_size: int = GROUP_SIZE,
+        listen: bool = False,
     ):
         self.db_url = db_url
         self.odoo_client = odoo_client
         self.batch_size = batch_size
         self.dry_run = dry_run
+        self.workers = max(1, workers)
+        self.group_size = max(1, group_size)
+        self.listen = listen
         self.running = True
         self.worker_id = f"worker-{os.getpid()}"
 
+        # Created lazily and reused for the lifetime of the worker
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._listen_conn = None
+        self._retry_due: List[float] = []  # Heap of time.monotonic() retry due times
+        self.metrics = WorkerMetrics()
+
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -138,43 +324,89 @@ def _signal_handler(self, signum, frame):
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
 
+    @contextmanager
     def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.db_url, cursor_factory=RealDictCursor)
+        """
+        Borrow a connection from the persistent pool
+
+        Commits on success, rolls back on error, and always returns the
+        connection to the pool.
+        """
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(
+                1, self.workers + 1, self.db_url, cursor_factory=RealDictCursor
+            )
+
+        conn = self._pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.putconn(conn)
+
+    def close(self):
+        """Release pooled connections and worker threads"""
+        if self._listen_conn is not None:
+            self._listen_conn.close()
+            self._listen_conn = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
 
     def fetch_batch(self) -> List[OutboxRecord]:
         """
         Fetch a batch of records from the outbox queue
 
-        Uses SELECT FOR UPDATE SKIP LOCKED to handle concurrent workers
+        Uses SELECT FOR UPDATE SKIP LOCKED to handle concurrent workers.
+        Records waiting out a retry backoff (next_attempt_at in the future)
+        are left alone.
         """
-        with self._get_connection() as conn:
+        with self.metrics.time_stage("claim"), self._get_connection() as conn:
             with conn.cursor() as cur:
                 # Lock records for processing
                 query = """
-                    UPDATE ops.odoo_outbox
+                    UPDATE ops.odoo_outbox AS o
                     SET 
                         status = 'processing',
                         locked_at = NOW(),
                         locked_by = %s
-                    WHERE id IN (
-                        SELECT id 
+                    FROM (
+                        SELECT id, status AS previous_status
                         FROM ops.odoo_outbox
-                        WHERE status = 'queued'
+                        WHERE (status = 'queued'
+                               AND (next_attempt_at IS NULL OR next_attempt_at <= NOW()))
                            OR (status = 'processing' 
                                AND locked_at < NOW() - INTERVAL '%s minutes')
                         ORDER BY created_at ASC
                         LIMIT %s
                         FOR UPDATE SKIP LOCKED
-                    )
-                    RETURNING *;
+                    ) AS claimed
+                    WHERE o.id = claimed.id
+                    RETURNING o.*, claimed.previous_status;
                 """
                 cur.execute(
                     query, (self.worker_id, LOCK_TIMEOUT_MINUTES, self.batch_size)
                 )
                 rows = cur.fetchall()
+
+                # Only count the backlog while there is one (no idle queries)
+                queue_depth = 0
+                if len(rows) == self.batch_size:
+                    cur.execute(
+                        "SELECT COUNT(*) AS depth FROM ops.odoo_outbox WHERE status = 'queued';"
+                    )
+                    queue_depth = cur.fetchone()["depth"]
                 conn.commit()
 
+                reclaimed = sum(1 for row in rows if row["previous_status"] == "processing")
+                if reclaimed:
+                    logger.warning(f"Reclaimed {reclaimed} records with expired locks")
+                    self.metrics.inc("lock_expiry_reclaims_total", reclaimed)
+                self.metrics.set("queue_depth", queue_depth)
+
                 records = [
                     OutboxRecord(
                         id=row["id"],
@@ -188,6 +420,7 @@ def fetch_batch(self) -> List[OutboxRecord]:
                         locked_by=row["locked_by"],
                         last_error=row["last_error"],
                         created_at=row["created_at"],
+                        next_attempt_at=row.get("next_attempt_at"),
                     )
                     for row in rows
                 ]
@@ -212,17 +445,18 @@ def process_record(self, record: OutboxRecord) -> bool:
                 return True
 
             # Perform operation in Odoo
-            if record.operation == "upsert":
-                self.odoo_client.upsert(record.model, record.payload)
-            elif record.operation == "delete":
-                record_id = record.payload.get("odoo_id") or record.payload.get("id")
-                if not record_id:
-                    raise ValueError(
-                        "Delete operation requires 'odoo_id' or 'id' in payload"
-                    )
-                self.odoo_client.delete(record.model, record_id)
-            else:
-                raise ValueError(f"Unknown operation: {record.operation}")
+            with self.metrics.time_stage("odoo"):
+                if record.operation == "upsert":
+                    self.odoo_client.upsert(record.model, record.payload)
+                elif record.operation == "delete":
+                    record_id = record.payload.get("odoo_id") or record.payload.get("id")
+                    if not record_id:
+                        raise ValueError(
+                            "Delete operation requires 'odoo_id' or 'id' in payload"
+                        )
+                    self.odoo_client.delete(record.model, record_id)
+                else:
+                    raise ValueError(f"Unknown operation: {record.operation}")
 
             # Mark as done
             self._mark_done(record.id)
@@ -237,7 +471,7 @@ def process_record(self, record: OutboxRecord) -> bool:
 
     def _mark_done(self, record_id: int):
         """Mark a record as successfully processed"""
-        with self._get_connection() as conn:
+        with self.metrics.time_stage("status_update"), self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -253,25 +487,61 @@ def _mark_done(self, record_id: int):
                 conn.commit()
                 logger.info(f"Record {record_id} marked as done")
 
-    def _mark_failed(self, record_id: int, error: str, attempts: int):
-        """Mark a record as failed (or retry if under max attempts)"""
+    def _retry_status(
+        self, record_id: int, attempts: int
+    ) -> Tuple[str, int, Optional[float]]:
+        """
+        Next (status, attempts, backoff seconds) for a failed record
+
+        backoff is None once the record has permanently failed. Otherwise the
+        record is queued again with next_attempt_at = NOW() + backoff, and the
+        worker remembers when the earliest retry becomes due.
+        """
         attempts += 1
 
         # Exponential backoff: 10s, 20s, 40s, 80s, 160s
-        backoff = min(INITIAL_BACKOFF_SECONDS * (2**attempts), 300)
+        backoff = min(INITIAL_BACKOFF_SECONDS * (2**attempts), MAX_BACKOFF_SECONDS)
 
         if attempts >= MAX_RETRIES:
             status = "failed"
+            backoff = None
+            self.metrics.inc("permanent_failures_total")
             logger.warning(
                 f"Record {record_id} permanently failed after {attempts} attempts"
             )
         else:
             status = "queued"  # Retry
+            self.metrics.inc("retries_total")
+            self._schedule_retry(backoff)
             logger.info(
                 f"Record {record_id} will retry after {backoff}s (attempt {attempts})"
             )
 
-        with self._get_connection() as conn:
+        return status, attempts, backoff
+
+    def _schedule_retry(self, backoff: float):
+        """Remember a pending retry so idle waits end in time for it"""
+        heapq.heappush(
+            self._retry_due, time.monotonic() + backoff + RETRY_WAKE_SLACK_SECONDS
+        )
+
+    def seconds_until_retry(self) -> Optional[float]:
+        """Seconds until the earliest retry scheduled by this worker, if any"""
+        if not self._retry_due:
+            return None
+        return max(0.0, self._retry_due[0] - time.monotonic())
+
+    def _pop_due_retries(self):
+        """Forget retries that are due; the next drain claims them"""
+        now = time.monotonic()
+        while self._retry_due and self._retry_due[0] <= now:
+            heapq.heappop(self._retry_due)
+
+    def _mark_failed(self, record_id: int, error: str, attempts: int):
+        """Mark a record as failed (or retry if under max attempts)"""
+        status, attempts, backoff = self._retry_status(record_id, attempts)
+
+        with self.metrics.time_stage("status_update"), self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -280,14 +550,192 @@ def _mark_failed(self, record_id: int, error: str, attempts: int):
                         status = %s,
                         attempts = %s,
                         last_error = %s,
+                        next_attempt_at = NOW() + %s * INTERVAL '1 second',
                         locked_at = NULL,
                         locked_by = NULL
                     WHERE id = %s;
                     """,
-                    (status, attempts, error, record_id),
+                    (status, attempts, error, backoff, record_id),
                 )
                 conn.commit()
 
+    def process_batch_concurrent(self, batch: List[OutboxRecord]) -> int:
+        """
+        Process a batch with grouped Odoo calls on a bounded thread pool
+
+        The batch is split into waves (see _waves) so each Odoo record's
+        operations still reach Odoo in queue order. Within a wave, records
+        are grouped by (model, operation) into chunks of at most group_size,
+        each sent as one multi-record Odoo call. All outcomes are then
+        written back with a single batched status UPDATE.
+
+        Returns the number of successful records
+        """
+        waves = self._waves(batch)
+        chunks_per_wave = []
+        for wave in waves:
+            groups: Dict[Tuple[str, str], List[OutboxRecord]] = defaultdict(list)
+            for record in wave:
+                groups[(record.model, record.operation)].append(record)
+            chunks_per_wave.append([
+                records[i : i + self.group_size]
+                for records in groups.values()
+                for i in range(0, len(records), self.group_size)
+            ])
+        logger.info(
+            f"Processing {len(batch)} records as "
+            f"{sum(len(chunks) for chunks in chunks_per_wave)} grouped calls "
+            f"in {len(waves)} waves on {self.workers} workers"
+        )
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="outbox"
+            )
+
+        outcomes: List[Tuple[OutboxRecord, Optional[str]]] = []
+        for chunks in chunks_per_wave:
+            for chunk_outcomes in self._executor.map(self._process_group, chunks):
+                outcomes.extend(chunk_outcomes)
+
+        if not self.dry_run:
+            self._apply_outcomes(outcomes)
+
+        succeeded = [record for record, error in outcomes if error is None]
+        for record in succeeded:
+            self.metrics.observe_lag(record.created_at)
+        return len(succeeded)
+
+    @staticmethod
+    def _entity_key(record: OutboxRecord) -> Tuple[str, Any]:
+        """Odoo record targeted by an outbox row (rows without an id only conflict with themselves)"""
+        record_id = record.payload.get("odoo_id") or record.payload.get("id")
+        return (record.model, record_id or f"outbox:{record.id}")
+
+    def _waves(self, batch: List[OutboxRecord]) -> List[List[OutboxRecord]]:
+        """
+        Split a batch (in created_at order) into waves run one after another
+
+        A new wave starts whenever an Odoo record shows up a second time, so
+        an upsert followed by a delete of the same record (or two upserts of
+        it) never run concurrently or out of order.
+        """
+        waves: List[List[OutboxRecord]] = []
+        seen: set = set()
+        for record in batch:
+            key = self._entity_key(record)
+            if not waves or key in seen:
+                waves.append([])
+                seen = set()
+            seen.add(key)
+            waves[-1].append(record)
+        return waves
+
+    def _process_group(
+        self, records: List[OutboxRecord]
+    ) -> List[Tuple[OutboxRecord, Optional[str]]]:
+        """
+        Send one (model, operation) group to Odoo in a single call
+
+        If the grouped call fails, records are retried one by one so a
+        single bad payload does not fail the whole group.
+
+        Returns (record, error) pairs; error is None on success
+        """
+        model, operation = records[0].model, records[0].operation
+
+        if self.dry_run:
+            for record in records:
+                logger.info(f"[DRY RUN] Would {operation} {model}: {record.payload}")
+            return [(record, None) for record in records]
+
+        try:
+            self._send_group(model, operation, records)
+            return [(record, None) for record in records]
+        except Exception as e:
+            if len(records) == 1:
+                logger.error(f"Error processing record {records[0].id}: {str(e)}")
+                return [(records[0], str(e))]
+            logger.warning(
+                f"Grouped {operation} of {len(records)} {model} records failed "
+                f"({str(e)}), retrying individually"
+            )
+
+        outcomes = []
+        for record in records:
+            try:
+                self._send_group(model, operation, [record])
+                outcomes.append((record, None))
+            except Exception as e:
+                logger.error(f"Error processing record {record.id}: {str(e)}")
+                outcomes.append((record, str(e)))
+        return outcomes
+
+    def _send_group(self, model: str, operation: str, records: List[OutboxRecord]):
+        """Perform one multi-record Odoo operation"""
+        with self.metrics.time_stage("odoo"):
+            self._send_group_call(model, operation, records)
+
+    def _send_group_call(self, model: str, operation: str, records: List[OutboxRecord]):
+        """Dispatch a group to the matching multi-record OdooClient method"""
+        if operation == "upsert":
+            self.odoo_client.upsert_many(model, [record.payload for record in records])
+        elif operation == "delete":
+            record_ids = []
+            for record in records:
+                record_id = record.payload.get("odoo_id") or record.payload.get("id")
+                if not record_id:
+                    raise ValueError(
+                        "Delete operation requires 'odoo_id' or 'id' in payload"
+                    )
+                record_ids.append(record_id)
+            self.odoo_client.delete_many(model, record_ids)
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+
+    def _outcome_rows(
+        self, outcomes: List[Tuple[OutboxRecord, Optional[str]]]
+    ) -> List[Tuple[int, str, int, Optional[str], Optional[float]]]:
+        """(id, status, attempts, last_error, backoff) status rows for outcomes"""
+        rows = []
+        for record, error in outcomes:
+            if error is None:
+                rows.append((record.id, "done", record.attempts, record.last_error, None))
+            else:
+                status, attempts, backoff = self._retry_status(record.id, record.attempts)
+                rows.append((record.id, status, attempts, error, backoff))
+        return rows
+
+    def _apply_outcomes(self, outcomes: List[Tuple[OutboxRecord, Optional[str]]]):
+        """Write all record statuses back in one UPDATE ... FROM (VALUES ...)"""
+        rows = self._outcome_rows(outcomes)
+        if not rows:
+            return
+
+        with self.metrics.time_stage("status_update"), self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    """
+                    UPDATE ops.odoo_outbox AS o
+                    SET
+                        status = v.status,
+                        attempts = v.attempts,
+                        last_error = v.last_error,
+                        next_attempt_at = NOW() + v.backoff * INTERVAL '1 second',
+                        locked_at = NULL,
+                        locked_by = NULL
+                    FROM (VALUES %s) AS v(id, status, attempts, last_error, backoff)
+                    WHERE o.id = v.id;
+                    """,
+                    rows,
+                    template="(%s::bigint, %s::text, %s::int, %s::text, %s::float8)",
+                    page_size=len(rows),
+                )
+
+        done = sum(1 for row in rows if row[1] == "done")
+        logger.info(f"Updated {len(rows)} records ({done} done)")
+
     def run_once(self):
         """Process one batch and exit"""
         logger.info("Processing one batch...")
@@ -297,16 +745,121 @@ def run_once(self):
             logger.info("No records to process")
             return 0
 
+        return self.process_batch(batch)
+
+    def process_batch(self, batch: List[OutboxRecord]) -> int:
+        """Process a fetched batch, returning the number of successes"""
         logger.info(f"Processing batch of {len(batch)} records")
-        success_count = 0
+        start = time.perf_counter()
 
-        for record in batch:
-            if self.process_record(record):
-                success_count += 1
+        if self.workers > 1:
+            success_count = self.process_batch_concurrent(batch)
+        else:
+            success_count = 0
+            for record in batch:
+                if self.process_record(record):
+                    success_count += 1
+                    self.metrics.observe_lag(record.created_at)
+
+        elapsed = time.perf_counter() - start
+        self.metrics.inc("batches_total")
+        self.metrics.inc("records_processed_total", success_count)
+        self.metrics.inc("records_failed_total", len(batch) - success_count)
+        self.metrics.set("records_per_second", round(len(batch) / elapsed, 2) if elapsed else 0.0)
 
         logger.info(f"Batch complete: {success_count}/{len(batch)} successful")
         return success_count
 
+    def drain(self) -> int:
+        """
+        Process batches back to back until a short batch empties the queue
+
+        Failed records are not due again until their backoff has elapsed, so
+        they are not reclaimed here; the caller waits for seconds_until_retry().
+        """
+        total = 0
+        while self.running:
+            batch = self.fetch_batch()
+            if batch:
+                total += self.process_batch(batch)
+            if len(batch) < self.batch_size:
+                break
+        return total
+
+    def _listen(self):
+        """Open the dedicated autocommit connection and LISTEN for new work"""
+        self._listen_conn = psycopg2.connect(self.db_url)
+        self._listen_conn.set_session(autocommit=True)
+        with self._listen_conn.cursor() as cur:
+            cur.execute(f"LISTEN {NOTIFY_CHANNEL};")
+        logger.info(f"Listening on channel '{NOTIFY_CHANNEL}'")
+
+    def wait_for_notify(self, timeout: float) -> bool:
+        """
+        Block until a NOTIFY arrives or timeout elapses
+
+        Waits on the socket without querying the database, in slices so
+        shutdown signals are honoured promptly.
+
+        Returns True if notified, False on timeout or shutdown
+        """
+        if self._listen_conn is None:
+            self._listen()
+
+        deadline = time.monotonic() + timeout
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            readable, _, _ = select.select(
+                [self._listen_conn], [], [], min(remaining, LISTEN_WAIT_SLICE_SECONDS)
+            )
+            if not readable:
+                continue
+
+            self._listen_conn.poll()
+            if self._listen_conn.notifies:
+                # Coalesce bursts: one drain covers every pending notification
+                self._listen_conn.notifies.clear()
+                return True
+
+        return False
+
+    def run_listen(self):
+        """Daemon loop driven by LISTEN/NOTIFY with a slow fallback poll"""
+        logger.info(
+            f"Starting outbox worker (listen mode) - PID: {os.getpid()}, "
+            f"fallback poll every {LISTEN_FALLBACK_POLL_SECONDS}s"
+        )
+
+        while self.running:
+            try:
+                # LISTEN before draining so inserts made meanwhile still wake us
+                if self._listen_conn is None:
+                    self._listen()
+                self.drain()
+
+                # Sleep until new work, the earliest retry or the fallback poll
+                timeout = LISTEN_FALLBACK_POLL_SECONDS
+                retry_in = self.seconds_until_retry()
+                if retry_in is not None:
+                    timeout = min(timeout, retry_in)
+                if self.wait_for_notify(timeout):
+                    logger.debug("Woken by NOTIFY")
+                self._pop_due_retries()
+            except psycopg2.OperationalError as e:
+                logger.error(f"Database connection lost: {str(e)}, reconnecting...")
+                if self._listen_conn is not None:
+                    self._listen_conn.close()
+                    self._listen_conn = None
+                time.sleep(INITIAL_BACKOFF_SECONDS)
+            except Exception as e:
+                logger.error(
+                    f"Unexpected error in listen loop: {str(e)}", exc_info=True
+                )
+                time.sleep(INITIAL_BACKOFF_SECONDS)
+
     def run_daemon(self):
         """Run continuously in daemon mode"""
         logger.info(f"Starting outbox worker (daemon mode) - PID: {os.getpid()}")
@@ -316,6 +869,12 @@ def run_daemon(self):
             logger.error("Failed to authenticate with Odoo")
             return
 
+        if self.listen:
+            self.run_listen()
+            self.close()
+            logger.info("Worker stopped")
+            return
+
         while self.running:
             try:
                 self.run_once()
@@ -328,6 +887,7 @@ def run_daemon(self):
                 )
                 time.sleep(POLL_INTERVAL_SECONDS)
 
+        self.close()
         logger.info("Worker stopped")
 
 
@@ -349,6 +909,29 @@ def main():
         default=BATCH_SIZE,
         help=f"Records to process per batch (default: {BATCH_SIZE})",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Parallel workers; >1 enables grouped concurrent processing (default: {WORKERS})",
+    )
+    parser.add_argument(
+        "--group-size",
+        type=int,
+        default=GROUP_SIZE,
+        help=f"Max records per multi-record Odoo call (default: {GROUP_SIZE})",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Expose Prometheus metrics on this port at /metrics",
+    )
+    parser.add_argument(
+        "--listen",
+        action="store_true",
+        help="In daemon mode, wake on Postgres NOTIFY instead of polling every "
+        f"{POLL_INTERVAL_SECONDS}s",
+    )
     args = parser.parse_args()
 
     # Validate arguments
@@ -372,12 +955,23 @@ def main():
 
     # Initialize clients
     odoo_client = OdooClient(odoo_url, odoo_db, odoo_user, odoo_password)
-    worker = OutboxWorker(db_url, odoo_client, args.batch_size, args.dry_run)
+    worker = OutboxWorker(
+        db_url,
+        odoo_client,
+        args.batch_size,
+        args.dry_run,
+        workers=args.workers,
+        group_size=args.group_size,
+        listen=args.listen,
+    )
+    if args.metrics_port:
+        worker.metrics.serve(args.metrics_port)
 
     # Run worker
     try:
         if args.once:
             success_count = worker.run_once()
+            worker.close()
             sys.exit(0 if success_count > 0 else 1)
         else:
             worker.run_daemon()
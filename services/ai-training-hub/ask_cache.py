@@ -0,0 +1,255 @@
+"""
+Ask Cache for the Text-to-SQL pipeline
+Two-level cache so repeated analytics questions skip the LLM and the database
+
+Levels:
+1. Question → SQL: keyed by the normalized question and the MDL version, so
+   an edited semantic layer never serves SQL generated against the old schema
+2. SQL + params → rows: short-lived, with per-table TTLs so fast-moving tables
+   (e.g. journal entries) expire sooner than monthly BIR data
+
+Each level is an in-process TTL/LRU cache, optionally backed by Redis so all
+API workers share hits.
+
+Environment:
+- ASK_CACHE: Enable caching (default: true)
+- ASK_CACHE_MAX_ENTRIES: In-process entries per level (default: 1024)
+- ASK_CACHE_SQL_TTL: Seconds to keep generated SQL (default: 86400)
+- ASK_CACHE_RESULT_TTL: Seconds to keep result rows (default: 300)
+- ASK_CACHE_RESULT_TTLS: Per-table row TTLs, e.g. "account_move=60,bir_form_2307=3600"
+- ASK_CACHE_REDIS_URL: Optional Redis URL for the shared tier
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings share a cache key
+
+    Case, Unicode forms, curly quotes, repeated whitespace and trailing
+    punctuation are folded; wording and numbers are left untouched.
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = text.replace("’", "'").replace("“", '"').replace("”", '"')
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip("?.! ")
+
+
+def json_default(value: Any) -> Any:
+    """Encode DB values the way the API's JSON responses would"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AskCache:
+    """
+    Question → SQL and SQL → rows cache for TextToSQLAgent.ask
+
+    Lookups return None on a miss. Redis failures are logged and treated as
+    misses so a cache outage never fails a request.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        sql_ttl: float = 86400,
+        result_ttl: float = 300,
+        table_ttls: Optional[Dict[str, float]] = None,
+        redis_client: Optional[Any] = None,
+        namespace: str = "ask"
+    ):
+        self.sql_ttl = sql_ttl
+        self.result_ttl = result_ttl
+        self.table_ttls = table_ttls or {}
+        self.redis = redis_client
+        self.namespace = namespace
+
+        self._sql = TTLCache(max_entries)
+        self._rows = TTLCache(max_entries)
+        self.stats = {
+            "sql_hits": 0,
+            "sql_misses": 0,
+            "result_hits": 0,
+            "result_misses": 0,
+            "redis_errors": 0
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional["AskCache"]:
+        """Build the cache from ASK_CACHE_* variables (None when disabled)"""
+        if os.getenv("ASK_CACHE", "true").lower() != "true":
+            return None
+
+        table_ttls = {}
+        for item in os.getenv("ASK_CACHE_RESULT_TTLS", "").split(","):
+            if "=" in item:
+                table, ttl = item.split("=", 1)
+                table_ttls[table.strip().lower()] = float(ttl)
+
+        redis_client = None
+        redis_url = os.getenv("ASK_CACHE_REDIS_URL")
+        if redis_url:
+            try:
+                import redis
+                redis_client = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except ImportError:
+                logger.warning("redis package not installed, ask cache is in-process only")
+
+        return cls(
+            max_entries=int(os.getenv("ASK_CACHE_MAX_ENTRIES", "1024")),
+            sql_ttl=float(os.getenv("ASK_CACHE_SQL_TTL", "86400")),
+            result_ttl=float(os.getenv("ASK_CACHE_RESULT_TTL", "300")),
+            table_ttls=table_ttls,
+            redis_client=redis_client
+        )
+
+    # ------------------------------------------------------------------
+    # Level 1: question → SQL
+    # ------------------------------------------------------------------
+
+    def sql_key(self, question: str, mdl_version: str) -> str:
+        digest = hashlib.sha256(normalize_question(question).encode()).hexdigest()
+        return f"{self.namespace}:sql:{mdl_version}:{digest}"
+
+    def get_sql(self, question: str, mdl_version: str) -> Optional[Dict[str, Any]]:
+        """Cached {"sql", "confidence"} for a question under this MDL version"""
+        value = self._get(self._sql, self.sql_key(question, mdl_version))
+        self.stats["sql_hits" if value is not None else "sql_misses"] += 1
+        return value
+
+    def set_sql(self, question: str, mdl_version: str, sql: str, confidence: float):
+        value = {"sql": sql, "confidence": confidence}
+        self._set(self._sql, self.sql_key(question, mdl_version), value, self.sql_ttl)
+
+    # ------------------------------------------------------------------
+    # Level 2: SQL + params → rows
+    # ------------------------------------------------------------------
+
+    def result_key(self, sql: str, params: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps([sql.strip().rstrip(";"), params or {}], sort_keys=True, default=json_default)
+        return f"{self.namespace}:rows:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def result_ttl_for(self, sql: str) -> float:
+        """Shortest TTL among the configured tables the SQL reads (default otherwise)"""
+        sql_lower = sql.lower()
+        ttls = [
+            ttl for table, ttl in self.table_ttls.items()
+            if re.search(rf"(?<!\w){re.escape(table)}(?!\w)", sql_lower)
+        ]
+        return min(ttls) if ttls else self.result_ttl
+
+    def get_result(self, sql: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Cached execute_sql result for this SQL and params"""
+        value = self._get(self._rows, self.result_key(sql, params))
+        self.stats["result_hits" if value is not None else "result_misses"] += 1
+        return value
+
+    def set_result(self, sql: str, params: Optional[Dict[str, Any]], result: Dict[str, Any]):
+        ttl = self.result_ttl_for(sql)
+        if ttl > 0:
+            self._set(self._rows, self.result_key(sql, params), result, ttl)
+
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Drop in-process entries (the Redis tier expires on its own)"""
+        self._sql.clear()
+        self._rows.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        sql_lookups = self.stats["sql_hits"] + self.stats["sql_misses"]
+        result_lookups = self.stats["result_hits"] + self.stats["result_misses"]
+        return {
+            **self.stats,
+            "sql_hit_rate": round(self.stats["sql_hits"] / sql_lookups, 4) if sql_lookups else 0.0,
+            "result_hit_rate": round(self.stats["result_hits"] / result_lookups, 4) if result_lookups else 0.0,
+            "sql_entries": len(self._sql),
+            "result_entries": len(self._rows),
+            "redis": self.redis is not None
+        }
+
+    def _get(self, local: TTLCache, key: str) -> Optional[Any]:
+        value = local.get(key)
+        if value is not None or self.redis is None:
+            return value
+
+        try:
+            pipe = self.redis.pipeline()
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, pttl = pipe.execute()
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            logger.warning(f"Ask cache Redis read failed: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        if pttl and pttl > 0:
+            local.set(key, value, pttl / 1000.0)
+        return value
+
+    def _set(self, local: TTLCache, key: str, value: Any, ttl: float):
+        local.set(key, value, ttl)
+        if self.redis is None:
+            return
+
+        try:
+            self.redis.set(key, json.dumps(value, default=json_default), px=int(ttl * 1000))
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            logger.warning(f"Ask cache Redis write failed: {e}")
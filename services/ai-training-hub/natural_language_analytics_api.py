@@ -36,21 +36,32 @@
       -d '{"name": "Finance Dashboard", "questions": ["Total revenue", "Top customers"]}'
 """
 
+import asyncio
+import decimal
+import io
+import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 import logging
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.background import BackgroundTask
 import uvicorn
 
+from ask_cache import json_default
 from text_to_sql_agent import TextToSQLAgent
-from superset_langchain_agent import SupersetLangChainAgent, SupersetConfig
+from superset_langchain_agent import SupersetClient, SupersetLangChainAgent, SupersetConfig
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -84,6 +95,7 @@ class AskRequest(BaseModel):
     execute: bool = Field(True, description="Execute the query")
     create_chart: bool = Field(False, description="Create Superset chart")
     viz_type: str = Field("table", description="Chart type: table, bar, line, pie")
+    use_cache: bool = Field(True, description="Serve repeated questions from the ask cache")
 
 
 class AskResponse(BaseModel):
@@ -94,6 +106,8 @@ class AskResponse(BaseModel):
     results: Optional[Dict] = None
     chart_id: Optional[int] = None
     chart_url: Optional[str] = None
+    sql_cache: Optional[str] = Field(None, description="Generated SQL cache: hit, miss or off")
+    results_cache: Optional[str] = Field(None, description="Result rows cache: hit, miss or off")
 
 
 class DashboardRequest(BaseModel):
@@ -123,26 +137,141 @@ class AlertRequest(BaseModel):
 
 
 # ============================================================================
-# Dependencies
+# Model Residency
 # ============================================================================
 
-def get_text_to_sql_agent():
-    """Dependency: Text-to-SQL agent"""
-    return TextToSQLAgent(
+class ModelResidency:
+    """
+    Process-wide holder for the Text-to-SQL agent
+
+    Loading SmolLM2 (tokenizer, weights, semantic layer YAML) takes tens of
+    seconds on CPU, so the agent is built exactly once per process and kept
+    warm. Loading and inference both run on a dedicated executor so the
+    event loop keeps serving /health and other requests meanwhile.
+
+    Environment:
+    - TEXT_TO_SQL_PRELOAD: Load the model at startup instead of on first use (default: true)
+    - TEXT_TO_SQL_WORKERS: Executor threads (default: TEXT_TO_SQL_MAX_BATCH, so
+      concurrent requests can meet in one micro-batch inside the agent)
+    """
+
+    def __init__(self, factory: Callable[[], TextToSQLAgent], workers: int = 1):
+        self._factory = factory
+        self._agent: Optional[TextToSQLAgent] = None
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="text-to-sql")
+        self.loading = False
+        self.load_seconds: Optional[float] = None
+        self.loaded_at: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def warm(self) -> bool:
+        return self._agent is not None
+
+    def load(self) -> TextToSQLAgent:
+        """Return the resident agent, loading it on first call (thread-safe)"""
+        if self._agent is not None:
+            return self._agent
+
+        with self._lock:
+            if self._agent is None:
+                self.loading = True
+                started = time.perf_counter()
+                try:
+                    self._agent = self._factory()
+                    self.error = None
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                finally:
+                    self.loading = False
+
+                self.load_seconds = round(time.perf_counter() - started, 3)
+                self.loaded_at = datetime.utcnow().isoformat()
+                logger.info(f"Text-to-SQL model resident after {self.load_seconds}s")
+
+        return self._agent
+
+    async def acquire(self) -> TextToSQLAgent:
+        """Return the resident agent without blocking the event loop"""
+        if self._agent is not None:
+            return self._agent
+        return await self.run(self.load)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run a blocking model call on the inference executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "warm": self.warm,
+            "loading": self.loading,
+            "load_seconds": self.load_seconds,
+            "loaded_at": self.loaded_at,
+            "error": self.error,
+            "batching": self._agent.batch_stats() if self._agent is not None else None,
+            "prefix_cache": self._agent.prefix_cache_stats() if self._agent is not None else None,
+            "ask_cache": self._agent.cache.metrics() if self._agent is not None and self._agent.cache else None
+        }
+
+
+text_to_sql_residency = ModelResidency(
+    factory=lambda: TextToSQLAgent(
         database_url=os.getenv("POSTGRES_URL"),
         device="cpu"
-    )
+    ),
+    workers=int(os.getenv("TEXT_TO_SQL_WORKERS", os.getenv("TEXT_TO_SQL_MAX_BATCH", "8")))
+)
+
+
+@app.on_event("startup")
+async def preload_text_to_sql_model():
+    """Warm the model in the background so startup and /health stay responsive"""
+    if os.getenv("TEXT_TO_SQL_PRELOAD", "true").lower() == "true":
+        text_to_sql_residency.executor.submit(_preload_text_to_sql_model)
+
+
+def _preload_text_to_sql_model():
+    try:
+        text_to_sql_residency.load()
+    except Exception as e:
+        logger.error(f"Text-to-SQL model preload failed: {e}")
+
+
+@app.on_event("shutdown")
+def shutdown_inference_executor():
+    text_to_sql_residency.executor.shutdown(wait=False)
+
+
+# ============================================================================
+# Dependencies
+# ============================================================================
+
+async def get_text_to_sql_agent() -> TextToSQLAgent:
+    """Dependency: resident Text-to-SQL agent"""
+    return await text_to_sql_residency.acquire()
 
 
-def get_superset_agent():
-    """Dependency: Superset LangChain agent"""
-    config = SupersetConfig(
+def get_superset_config() -> SupersetConfig:
+    """Superset connection settings from the environment"""
+    return SupersetConfig(
         base_url=os.getenv("SUPERSET_URL", "http://localhost:8088"),
         username=os.getenv("SUPERSET_USERNAME", "admin"),
         password=os.getenv("SUPERSET_PASSWORD", "admin"),
         database_id=int(os.getenv("SUPERSET_DATABASE_ID", "1"))
     )
-    return SupersetLangChainAgent(config)
+
+
+def get_superset_client() -> SupersetClient:
+    """Dependency: plain Superset REST client (doesn't wait for the Text-to-SQL model)"""
+    return SupersetClient(get_superset_config())
+
+
+def get_superset_agent(text_to_sql: TextToSQLAgent = Depends(get_text_to_sql_agent)):
+    """Dependency: Superset LangChain agent (shares the resident Text-to-SQL agent)"""
+    return SupersetLangChainAgent(get_superset_config(), text_to_sql_agent=text_to_sql)
 
 
 # ============================================================================
@@ -160,7 +289,8 @@ def root():
             "ask": "POST /api/v1/analytics/ask",
             "dashboard": "POST /api/v1/analytics/dashboard",
             "alert": "POST /api/v1/analytics/alert",
-            "embed": "GET /api/v1/analytics/embed/{chart_id}"
+            "embed": "GET /api/v1/analytics/embed/{chart_id}",
+            "sql_stream": "POST /api/v1/analytics/sql/stream?format=ndjson|arrow"
         },
         "docs": "/docs"
     }
@@ -169,7 +299,11 @@ def root():
 @app.get("/health")
 def health():
     """Health check"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "text_to_sql_model": text_to_sql_residency.status()
+    }
 
 
 @app.post("/api/v1/analytics/ask", response_model=AskResponse)
@@ -194,16 +328,19 @@ async def ask_analytics_question(
     try:
         if request.create_chart:
             # Use Superset agent for chart creation
-            result = superset.ask(
+            result = await text_to_sql_residency.run(
+                superset.ask,
                 question=request.question,
                 create_chart=True,
                 viz_type=request.viz_type
             )
         else:
             # Use text-to-SQL agent only
-            result = text_to_sql.ask(
+            result = await text_to_sql_residency.run(
+                text_to_sql.ask,
                 question=request.question,
-                execute=request.execute
+                execute=request.execute,
+                use_cache=request.use_cache
             )
 
         return AskResponse(**result)
@@ -236,7 +373,8 @@ async def create_analytics_dashboard(
     logger.info(f"Creating dashboard: {request.name}")
 
     try:
-        result = superset.create_dashboard_from_questions(
+        result = await text_to_sql_residency.run(
+            superset.create_dashboard_from_questions,
             dashboard_name=request.name,
             questions=request.questions,
             viz_types=request.viz_types
@@ -317,7 +455,7 @@ async def embed_chart(chart_id: int):
 
 
 @app.get("/api/v1/analytics/datasets")
-async def list_datasets(superset: SupersetLangChainAgent = Depends(get_superset_agent)):
+async def list_datasets(superset: SupersetClient = Depends(get_superset_client)):
     """
     List available datasets (semantic layer)
 
@@ -325,7 +463,7 @@ async def list_datasets(superset: SupersetLangChainAgent = Depends(get_superset_
         List of published Superset datasets
     """
     try:
-        datasets = superset.superset.list_datasets()
+        datasets = await asyncio.to_thread(superset.list_datasets)
 
         return {
             "count": len(datasets),
@@ -357,7 +495,7 @@ async def execute_raw_sql(
     logger.info(f"Executing raw SQL: {sql[:100]}...")
 
     try:
-        result = text_to_sql.execute_sql(sql, validate=True)
+        result = await asyncio.to_thread(text_to_sql.execute_sql, sql, validate=True)
 
         return {
             "success": result["success"],
@@ -370,6 +508,148 @@ async def execute_raw_sql(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Rows fetched per server-side cursor batch when streaming
+SQL_STREAM_BATCH_SIZE = int(os.getenv("SQL_STREAM_BATCH_SIZE", "5000"))
+
+# Arrow type for NUMERIC columns. Postgres NUMERIC results (e.g. debit/credit
+# sums) carry no fixed scale, so the scale of the first batch cannot be reused
+# for the rest of the stream; every Decimal is written at this precision/scale
+SQL_STREAM_DECIMAL_PRECISION = 38
+SQL_STREAM_DECIMAL_SCALE = int(os.getenv("SQL_STREAM_DECIMAL_SCALE", "10"))
+
+SQL_STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream"
+}
+
+
+@app.post("/api/v1/analytics/sql/stream")
+async def stream_raw_sql(
+    sql: str,
+    format: str = "ndjson",
+    limit: Optional[int] = None,
+    text_to_sql: TextToSQLAgent = Depends(get_text_to_sql_agent)
+):
+    """
+    Execute raw SQL and stream the rows (for large extracts)
+
+    Rows are read through a server-side cursor and written out batch by
+    batch, so memory stays flat regardless of the result size.
+
+    Formats:
+    - ndjson: one JSON object per row (application/x-ndjson)
+    - arrow: Arrow IPC stream, one record batch per cursor batch (needs pyarrow)
+
+    Example:
+        curl -X POST -G http://localhost:8000/api/v1/analytics/sql/stream \
+          --data-urlencode "format=ndjson" \
+          --data-urlencode "sql=SELECT * FROM account_move_line" > gl.ndjson
+    """
+    if format not in SQL_STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format} (use ndjson or arrow)")
+
+    if format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Arrow streaming requires pyarrow")
+
+    logger.info(f"Streaming raw SQL as {format}: {sql[:100]}...")
+
+    batches = text_to_sql.iter_sql_batches(sql, limit=limit, validate=True, batch_size=SQL_STREAM_BATCH_SIZE)
+
+    # Run up to the first batch before responding so validation and SQL
+    # errors still surface as HTTP errors rather than a truncated stream
+    try:
+        columns, first_rows = await asyncio.to_thread(next, batches)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        logger.error(f"Error streaming SQL: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def all_batches() -> Iterator[Tuple[List[str], List[tuple]]]:
+        yield columns, first_rows
+        yield from batches
+
+    encode = _ndjson_stream if format == "ndjson" else _arrow_stream
+
+    return StreamingResponse(
+        encode(columns, all_batches()),
+        media_type=SQL_STREAM_MEDIA_TYPES[format],
+        background=BackgroundTask(batches.close)
+    )
+
+
+def _ndjson_stream(columns: List[str], batches: Iterator[Tuple[List[str], List[tuple]]]) -> Iterator[bytes]:
+    """Encode row batches as newline-delimited JSON, one chunk per batch"""
+    for _, rows in batches:
+        if rows:
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=json_default) + "\n"
+                for row in rows
+            ).encode()
+
+
+def _arrow_stream(columns: List[str], batches: Iterator[Tuple[List[str], List[tuple]]]) -> Iterator[bytes]:
+    """
+    Encode row batches as an Arrow IPC stream, one record batch per chunk
+
+    The schema is inferred from the first batch; columns that are entirely
+    NULL there are typed as strings. Decimals are normalized to
+    SQL_STREAM_DECIMAL_PRECISION/SQL_STREAM_DECIMAL_SCALE so later batches
+    with a different scale still match the schema.
+    """
+    import pyarrow as pa
+
+    decimal_type = pa.decimal128(SQL_STREAM_DECIMAL_PRECISION, SQL_STREAM_DECIMAL_SCALE)
+    quantum = decimal.Decimal(1).scaleb(-SQL_STREAM_DECIMAL_SCALE)
+    context = decimal.Context(prec=SQL_STREAM_DECIMAL_PRECISION)
+
+    sink = io.BytesIO()
+    writer = None
+    schema = None
+
+    def drain() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    for _, rows in batches:
+        values = list(zip(*rows)) if rows else [() for _ in columns]
+
+        if schema is None:
+            fields = []
+            for name, column in zip(columns, values):
+                inferred = pa.array(column).type
+                if pa.types.is_null(inferred):
+                    inferred = pa.string()
+                elif pa.types.is_decimal(inferred):
+                    inferred = decimal_type
+                fields.append(pa.field(name, inferred))
+            schema = pa.schema(fields)
+            writer = pa.ipc.new_stream(sink, schema)
+
+        arrays = []
+        for field, column in zip(schema, values):
+            if pa.types.is_string(field.type):
+                column = [None if value is None else str(value) for value in column]
+            elif pa.types.is_decimal(field.type):
+                column = [
+                    None if value is None else context.quantize(decimal.Decimal(value), quantum)
+                    for value in column
+                ]
+            arrays.append(pa.array(column, type=field.type))
+
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        yield drain()
+
+    if writer is not None:
+        writer.close()
+        yield drain()
+
+
 # ============================================================================
 # Background Tasks (Alerts)
 # ============================================================================
@@ -381,8 +661,8 @@ async def check_alert(alert_id: int, question: str, condition: str, threshold: f
     Runs on schedule (hourly, daily, weekly)
     """
     # Generate SQL from question
-    agent = TextToSQLAgent()
-    result = agent.ask(question, execute=True)
+    agent = await text_to_sql_residency.acquire()
+    result = await text_to_sql_residency.run(agent.ask, question, execute=True)
 
     if not result["results"]["success"]:
         logger.error(f"Alert {alert_id} failed: {result['results']['error']}")
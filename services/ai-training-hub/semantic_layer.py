@@ -25,10 +25,12 @@
 - Cube.js semantic layer: https://cube.dev/docs/schema/fundamentals
 """
 
+import hashlib
 import json
 import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import yaml
@@ -127,15 +129,61 @@ class SemanticLayer:
     def __init__(self, models_dir: Path):
         self.models_dir = models_dir
         self.models: Dict[str, Model] = {}
+
+        # LLM context memoized per model set; dropped whenever the MDL
+        # files change (see refresh)
+        self._context_cache: Dict[Optional[Tuple[str, ...]], str] = {}
+        self._fingerprint: Tuple = ()
+        self._lock = threading.Lock()
+
         self._load_models()
 
+    @property
+    def version(self) -> str:
+        """Short hash identifying the currently loaded MDL files"""
+        return hashlib.sha1(repr(self._fingerprint).encode()).hexdigest()[:12]
+
+    def _scan_fingerprint(self) -> Tuple:
+        """(name, mtime, size) of every MDL YAML file, in a stable order"""
+        fingerprint = []
+        for yaml_file in sorted(self.models_dir.glob("*.yaml")):
+            try:
+                stat = yaml_file.stat()
+            except FileNotFoundError:
+                continue
+            fingerprint.append((yaml_file.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
     def _load_models(self):
         """Load all MDL YAML files from models directory"""
-        for yaml_file in self.models_dir.glob("*.yaml"):
+        fingerprint = self._scan_fingerprint()
+        models: Dict[str, Model] = {}
+
+        for yaml_file in sorted(self.models_dir.glob("*.yaml")):
             with open(yaml_file, 'r') as f:
                 data = yaml.safe_load(f)
                 model = self._parse_model(data)
-                self.models[model.name] = model
+                models[model.name] = model
+
+        self.models = models
+        self._context_cache = {}
+        self._fingerprint = fingerprint
+
+    def refresh(self) -> bool:
+        """
+        Reload the MDL files if any were added, removed or modified
+
+        Returns:
+            True if the models were reloaded
+        """
+        if self._scan_fingerprint() == self._fingerprint:
+            return False
+
+        with self._lock:
+            if self._scan_fingerprint() == self._fingerprint:
+                return False
+            self._load_models()
+            return True
 
     def _parse_model(self, data: Dict) -> Model:
         """Parse MDL YAML into Model object"""
@@ -201,7 +249,21 @@ def get_llm_context(self, model_names: Optional[List[str]] = None) -> str:
         """
         Generate LLM context for text-to-SQL
         Returns formatted schema description for prompt engineering
+
+        The rendered context is memoized per model set and rebuilt only
+        after the MDL YAML files change.
         """
+        self.refresh()
+
+        key = None if model_names is None else tuple(model_names)
+        context = self._context_cache.get(key)
+        if context is None:
+            context = self._render_llm_context(model_names)
+            self._context_cache[key] = context
+        return context
+
+    def _render_llm_context(self, model_names: Optional[List[str]] = None) -> str:
+        """Render the schema description for the given models (all if None)"""
         if model_names is None:
             models_to_include = self.models.values()
         else:
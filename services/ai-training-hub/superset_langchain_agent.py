@@ -37,6 +37,7 @@
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 import requests
@@ -414,12 +415,22 @@ def create_dashboard_from_questions(
         chart_ids = []
         charts_info = []
 
-        for i, question in enumerate(questions):
-            viz_type = viz_types[i] if i < len(viz_types) else "bar"
-
-            # Generate chart from question
-            result = self.ask(question, create_chart=True, viz_type=viz_type)
-
+        # Ask questions concurrently so the text-to-SQL batcher can generate
+        # their SQL in shared batches; more threads than one batch only
+        # queue behind it. Results keep question order
+        batcher = self.text_to_sql.batcher
+        max_workers = min(len(questions), batcher.max_batch_size if batcher else 1)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(
+                lambda item: self.ask(
+                    item[1],
+                    create_chart=True,
+                    viz_type=viz_types[item[0]] if item[0] < len(viz_types) else "bar"
+                ),
+                enumerate(questions)
+            ))
+
+        for question, result in zip(questions, results):
             if "chart_id" in result:
                 chart_ids.append(result["chart_id"])
                 charts_info.append({
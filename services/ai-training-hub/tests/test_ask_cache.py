@@ -0,0 +1,135 @@
+import os
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ask_cache import AskCache, TTLCache, normalize_question  # noqa: E402
+from semantic_layer import SemanticLayer, create_example_mdl_files  # noqa: E402
+
+pytestmark = pytest.mark.text_to_sql
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis-py calls the cache makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    def set(self, key, value, px=None):
+        self.store[key] = (value, px)
+
+    def pipeline(self):
+        redis, calls = self, []
+
+        class Pipeline:
+            def get(self, key):
+                calls.append(lambda: redis.store.get(key, (None, None))[0])
+
+            def pttl(self, key):
+                calls.append(lambda: redis.store.get(key, (None, -2))[1])
+
+            def execute(self):
+                return [call() for call in calls]
+
+        return Pipeline()
+
+
+def test_question_normalization_folds_trivial_differences():
+    assert normalize_question("  Total  withholding tax this month by AGENCY?? ") == \
+        normalize_question("total withholding tax this month by agency")
+    assert normalize_question("Q4 2024 expenses") != normalize_question("Q3 2024 expenses")
+
+
+def test_sql_cache_is_keyed_by_mdl_version():
+    cache = AskCache()
+    cache.set_sql("Total revenue?", "v1", "SELECT SUM(amount) FROM invoices", 0.9)
+
+    assert cache.get_sql("total revenue", "v1") == {"sql": "SELECT SUM(amount) FROM invoices", "confidence": 0.9}
+    assert cache.get_sql("total revenue", "v2") is None
+    assert cache.metrics()["sql_hits"] == 1
+    assert cache.metrics()["sql_misses"] == 1
+
+
+def test_result_ttl_uses_shortest_matching_table():
+    cache = AskCache(result_ttl=300, table_ttls={"account_move": 60, "bir_form_2307": 3600})
+
+    assert cache.result_ttl_for("SELECT * FROM bir.bir_form_2307") == 3600
+    assert cache.result_ttl_for("SELECT * FROM account_move m JOIN bir_form_2307 b ON true") == 60
+    assert cache.result_ttl_for("SELECT * FROM account_move_line") == 300
+
+
+def test_result_cache_keys_include_params():
+    cache = AskCache()
+    cache.set_result("SELECT 1", {"limit": 100}, {"success": True, "rows": [{"x": 1}]})
+
+    assert cache.get_result("SELECT 1;", {"limit": 100})["rows"] == [{"x": 1}]
+    assert cache.get_result("SELECT 1", {"limit": 10}) is None
+
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ask_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=2)
+
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+    cache.get("a")
+    cache.set("c", 3, ttl=10)
+    assert cache.get("b") is None  # least recently used
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+def test_redis_tier_shared_between_processes():
+    redis = FakeRedis()
+    writer = AskCache(redis_client=redis)
+    reader = AskCache(redis_client=redis)
+
+    writer.set_result("SELECT SUM(x) FROM t", None, {"success": True, "rows": [{"sum": Decimal("1.50")}]})
+
+    assert reader.get_result("SELECT SUM(x) FROM t")["rows"] == [{"sum": 1.5}]
+    assert reader.metrics()["result_hits"] == 1
+
+
+def test_redis_errors_degrade_to_misses():
+    class BrokenRedis:
+        def set(self, *args, **kwargs):
+            raise ConnectionError("redis down")
+
+        def pipeline(self):
+            raise ConnectionError("redis down")
+
+    cache = AskCache(redis_client=BrokenRedis())
+    cache.set_sql("q", "v1", "SELECT 1", 0.5)
+
+    assert cache.get_sql("q", "v1")["sql"] == "SELECT 1"  # served in-process
+    assert cache.get_sql("other", "v1") is None
+    assert cache.metrics()["redis_errors"] == 2
+
+
+def test_ask_misses_sql_cache_after_mdl_edit(tmp_path, monkeypatch):
+    text_to_sql_agent = pytest.importorskip("text_to_sql_agent")
+
+    create_example_mdl_files(tmp_path)
+    agent = object.__new__(text_to_sql_agent.TextToSQLAgent)  # skip model loading
+    agent.semantic_layer = SemanticLayer(tmp_path)
+    agent.cache = AskCache()
+    generated = []
+    monkeypatch.setattr(agent, "generate_sql", lambda q: generated.append(q) or ("SELECT 1", 0.9))
+    monkeypatch.setattr(agent, "validate_sql", lambda sql: {"valid": True})
+
+    assert agent.ask("Total withholding?", execute=False)["sql_cache"] == "miss"
+    assert agent.ask("Total withholding?", execute=False)["sql_cache"] == "hit"
+
+    mdl_file = tmp_path / "bir_2307.yaml"
+    mdl_file.write_text(mdl_file.read_text().replace("bir_form_2307", "bir_form_2307_v2"))
+    stat = mdl_file.stat()
+    os.utime(mdl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert agent.ask("Total withholding?", execute=False)["sql_cache"] == "miss"
+    assert len(generated) == 2
@@ -1,5 +1,13 @@
+import os
+import sys
+from pathlib import Path
+
 import pytest
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from semantic_layer import SemanticLayer, create_example_mdl_files  # noqa: E402
+
 pytestmark = pytest.mark.ai_semantic
 
 def test_metric_definition_parsing():
@@ -13,3 +21,36 @@ def test_dimension_resolution():
 def test_semantic_query_generation():
     """Natural language to semantic query mapping."""
     pass
+
+
+def test_llm_context_memoized_per_model_set(tmp_path, monkeypatch):
+    create_example_mdl_files(tmp_path)
+    layer = SemanticLayer(tmp_path)
+
+    renders = []
+    render = layer._render_llm_context
+    monkeypatch.setattr(layer, "_render_llm_context", lambda names=None: renders.append(names) or render(names))
+
+    full = layer.get_llm_context()
+    assert layer.get_llm_context() is full
+    assert "bir_form_2307" in layer.get_llm_context(["bir_2307"])
+    assert layer.get_llm_context(["bir_2307"]) is layer.get_llm_context(["bir_2307"])
+    assert renders == [None, ["bir_2307"]]
+
+
+def test_llm_context_invalidated_when_mdl_changes(tmp_path):
+    create_example_mdl_files(tmp_path)
+    layer = SemanticLayer(tmp_path)
+    version = layer.version
+    before = layer.get_llm_context()
+
+    mdl_file = tmp_path / "bir_2307.yaml"
+    mdl_file.write_text(mdl_file.read_text().replace("bir_form_2307", "bir_form_2307_v2"))
+    stat = mdl_file.stat()
+    os.utime(mdl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    after = layer.get_llm_context()
+    assert after != before
+    assert "bir_form_2307_v2" in after
+    assert layer.version != version
+    assert layer.refresh() is False
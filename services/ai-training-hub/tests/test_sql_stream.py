@@ -0,0 +1,35 @@
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+pa = pytest.importorskip("pyarrow")
+api = pytest.importorskip("natural_language_analytics_api")
+
+pytestmark = pytest.mark.text_to_sql
+
+
+def _read(chunks):
+    return pa.ipc.open_stream(pa.py_buffer(b"".join(chunks))).read_all()
+
+
+def test_arrow_stream_normalizes_decimal_scale():
+    """Batches with differently scaled NUMERIC values share one schema."""
+    columns = ["account", "debit", "note"]
+    batches = [
+        (columns, [("1000", Decimal("12.50"), None), ("1001", None, None)]),
+        (columns, [("1002", Decimal("0.0001"), "late"), ("1003", Decimal("123456789.123456"), None)]),
+    ]
+
+    table = _read(api._arrow_stream(columns, iter(batches)))
+
+    assert table.schema.field("debit").type == pa.decimal128(
+        api.SQL_STREAM_DECIMAL_PRECISION, api.SQL_STREAM_DECIMAL_SCALE
+    )
+    assert table.column("debit").to_pylist() == [
+        Decimal("12.5"), None, Decimal("0.0001"), Decimal("123456789.123456"),
+    ]
+    assert table.column("note").to_pylist() == [None, None, "late", None]
@@ -1,5 +1,11 @@
+import sys
+import threading
+from pathlib import Path
+
 import pytest
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
 pytestmark = pytest.mark.text_to_sql
 
 def test_natural_language_parsing():
@@ -17,3 +23,60 @@ def test_query_safety_validation():
 def test_parameter_injection_prevention():
     """User params are always bound, never interpolated."""
     pass
+
+
+class FakeTokenizer:
+    """Records tokenizer calls; "token ids" are the prompt strings themselves."""
+
+    pad_token_id = 0
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, **kwargs):
+        self.calls.append((list(texts), kwargs))
+        return {"input_ids": FakeTensor(texts)}
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return [f"{text} SELECT 1" for text in outputs]
+
+
+class FakeTensor(list):
+    def to(self, device):
+        return self
+
+
+class FakeModel:
+    def generate(self, input_ids, **kwargs):
+        return list(input_ids)
+
+
+def test_batcher_pads_concurrent_prompts_into_one_generate():
+    """Concurrent submissions share one padded generate; each caller gets its own text."""
+    text_to_sql_agent = pytest.importorskip("text_to_sql_agent")
+
+    agent = object.__new__(text_to_sql_agent.TextToSQLAgent)  # skip model loading
+    agent.tokenizer, agent.model, agent.device = FakeTokenizer(), FakeModel(), "cpu"
+    agent.prefix_cache_size = 0
+    batcher = text_to_sql_agent.InferenceBatcher(agent._generate_batch, max_batch_size=3, max_wait_ms=1000)
+
+    questions = ["revenue?", "top vendors?", "withholding tax?"]
+    results = {}
+    barrier = threading.Barrier(len(questions))
+
+    def ask(question):
+        barrier.wait()
+        results[question] = batcher.generate(("schema:", question), 64)
+
+    threads = [threading.Thread(target=ask, args=(q,)) for q in questions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == {q: f"schema:{q} SELECT 1" for q in questions}
+    [(texts, kwargs)] = agent.tokenizer.calls
+    assert sorted(texts) == sorted(f"schema:{q}" for q in questions)
+    assert kwargs["padding"] is True
+    assert batcher.stats()["batches"] == 1
+    assert batcher.stats()["largest_batch"] == 3
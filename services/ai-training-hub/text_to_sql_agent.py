@@ -39,11 +39,16 @@
 """
 
 import argparse
+import copy
 import json
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 import logging
 
 import torch
@@ -52,12 +57,115 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
 
+from ask_cache import AskCache
 from semantic_layer import SemanticLayer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class InferenceBatcher:
+    """
+    Micro-batching queue in front of model.generate
+
+    Callers on any thread submit a (prefix, suffix) prompt and block on its
+    future. A single worker thread takes the oldest prompt, waits up to ``max_wait_ms`` for
+    more to arrive, and runs up to ``max_batch_size`` prompts that share the
+    same ``max_tokens`` through one batched generate call.
+    """
+    def __init__(
+        self,
+        generate_fn: Callable[[List[Tuple[str, str]], int], List[str]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0
+    ):
+        self._generate_fn = generate_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._pending: deque = deque()
+        self._cond = threading.Condition()
+
+        # Throughput counters
+        self.batches = 0
+        self.prompts = 0
+        self.largest_batch = 0
+        self.busy_seconds = 0.0
+
+        self._worker = threading.Thread(target=self._run, name="text-to-sql-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: Tuple[str, str], max_tokens: int) -> Future:
+        """Queue a prompt; the future resolves to the decoded generation"""
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((prompt, max_tokens, future))
+            self._cond.notify()
+        return future
+
+    def generate(self, prompt: Tuple[str, str], max_tokens: int) -> str:
+        """Queue a prompt and wait for its generation"""
+        return self.submit(prompt, max_tokens).result()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "prompts": self.prompts,
+            "avg_batch_size": round(self.prompts / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "prompts_per_second": round(self.prompts / self.busy_seconds, 3) if self.busy_seconds else 0.0,
+            "queued": len(self._pending)
+        }
+
+    def _next_batch(self) -> List[Tuple[Tuple[str, str], int, Future]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # Only prompts with the head's max_tokens share a generate call;
+            # the rest keep their queue order for the next batch
+            max_tokens = self._pending[0][1]
+            batch, deferred = [], []
+            while self._pending and len(batch) < self.max_batch_size:
+                item = self._pending.popleft()
+                (batch if item[1] == max_tokens else deferred).append(item)
+            self._pending.extendleft(reversed(deferred))
+
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            live = [(prompt, future) for prompt, _, future in batch if future.set_running_or_notify_cancel()]
+            if not live:
+                continue
+
+            prompts = [prompt for prompt, _ in live]
+            futures = [future for _, future in live]
+            started = time.perf_counter()
+            try:
+                texts = self._generate_fn(prompts, batch[0][1])
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, text in zip(futures, texts):
+                    future.set_result(text)
+            finally:
+                self.busy_seconds += time.perf_counter() - started
+                self.batches += 1
+                self.prompts += len(futures)
+                self.largest_batch = max(self.largest_batch, len(futures))
+
+
 class TextToSQLAgent:
     """
     Natural language to SQL converter using SmolLM2 + Semantic Layer
@@ -68,7 +176,10 @@ def __init__(
         model_path: str = "HuggingFaceTB/SmolLM2-1.7B-Instruct",
         semantic_layer_dir: Path = Path("./mdl/models"),
         database_url: Optional[str] = None,
-        device: str = "cpu"
+        device: str = "cpu",
+        max_batch_size: Optional[int] = None,
+        max_batch_wait_ms: Optional[float] = None,
+        cache: Optional[AskCache] = None
     ):
         self.model_path = model_path
         self.semantic_layer = SemanticLayer(semantic_layer_dir)
@@ -84,6 +195,39 @@ def __init__(
             device_map=device
         )
 
+        # Batched generation with a decoder-only model needs left padding
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        # Past-key-values for recently used prompt prefixes (instructions +
+        # schema context). Each entry holds the full prefix KV tensors, which
+        # for a ~2k-token schema is hundreds of MB on the 1.7B model, so only
+        # a few are kept (TEXT_TO_SQL_PREFIX_CACHE=0 disables reuse).
+        self.prefix_cache_size = int(os.getenv("TEXT_TO_SQL_PREFIX_CACHE", "2"))
+        self._prefix_cache: "OrderedDict[str, Tuple[Any, Any]]" = OrderedDict()
+        self._prefix_lock = threading.Lock()
+        self.prefix_hits = 0
+        self.prefix_misses = 0
+
+        # Micro-batching (TEXT_TO_SQL_MAX_BATCH=1 disables it)
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("TEXT_TO_SQL_MAX_BATCH", "8"))
+        if max_batch_wait_ms is None:
+            max_batch_wait_ms = float(os.getenv("TEXT_TO_SQL_BATCH_WAIT_MS", "10"))
+
+        if max_batch_size > 1:
+            self.batcher = InferenceBatcher(
+                self._generate_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_batch_wait_ms
+            )
+        else:
+            self.batcher = None
+
+        # Question → SQL and SQL → rows cache for ask() (ASK_CACHE=false disables)
+        self.cache = cache if cache is not None else AskCache.from_env()
+
         # Database connection
         if database_url:
             self.engine = create_engine(database_url)
@@ -107,10 +251,12 @@ def generate_sql(
         Returns:
             (sql_query, confidence_score)
         """
-        # Build prompt with semantic layer context
+        # Build prompt with semantic layer context. The prefix (instructions
+        # + schema) is identical for every question on the same model set,
+        # so its past-key-values can be reused across calls.
         mdl_context = self.semantic_layer.get_llm_context(models)
 
-        prompt = f"""You are a SQL expert. Generate a SQL query to answer the user's question.
+        prefix = f"""You are a SQL expert. Generate a SQL query to answer the user's question.
 
 {mdl_context}
 
@@ -123,17 +269,52 @@ def generate_sql(
 6. Return ONLY the SQL query, no explanations
 
 **User Question:**
-{question}
+"""
+        suffix = f"""{question}
 
 **SQL Query:**
 ```sql
 """
+        prompt = prefix + suffix
 
-        # Tokenize
-        inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True, max_length=2048)
+        # Generate (batched with concurrent callers when the batcher is on)
+        if self.batcher:
+            generated_text = self.batcher.generate((prefix, suffix), max_tokens)
+        else:
+            generated_text = self._generate_batch([(prefix, suffix)], max_tokens)[0]
+
+        # Extract SQL from generated text
+        sql_query = self._extract_sql(generated_text, prompt)
+
+        # Calculate confidence score (based on SQL validity)
+        confidence = self._calculate_confidence(sql_query)
+
+        return sql_query, confidence
+
+    def _generate_batch(self, prompts: List[Tuple[str, str]], max_tokens: int) -> List[str]:
+        """
+        Run one generate call for (prefix, suffix) prompts and decode each output
+
+        A single prompt reuses the cached past-key-values of its prefix so
+        only the question tokens are prefilled. Larger batches are
+        left-padded and prefilled in full, since padding would have to sit
+        between the shared prefix and each question.
+        """
+        if len(prompts) == 1 and self.prefix_cache_size > 0:
+            prefix, suffix = prompts[0]
+            text = self._generate_with_prefix_cache(prefix, suffix, max_tokens)
+            if text is not None:
+                return [text]
+
+        inputs = self.tokenizer(
+            [prefix + suffix for prefix, suffix in prompts],
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=2048
+        )
         inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
-        # Generate
         with torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
@@ -141,19 +322,80 @@ def generate_sql(
                 temperature=0.1,  # Low temperature for more deterministic SQL
                 do_sample=True,
                 top_p=0.9,
-                pad_token_id=self.tokenizer.eos_token_id
+                pad_token_id=self.tokenizer.pad_token_id
             )
 
-        # Decode
-        generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
 
-        # Extract SQL from generated text
-        sql_query = self._extract_sql(generated_text, prompt)
+    def _generate_with_prefix_cache(self, prefix: str, suffix: str, max_tokens: int) -> Optional[str]:
+        """
+        Generate with the prefix's cached past-key-values
 
-        # Calculate confidence score (based on SQL validity)
-        confidence = self._calculate_confidence(sql_query)
+        Returns None when the prompt would exceed the 2048-token window, so
+        the caller falls back to the truncating full-prefill path.
+        """
+        prefix_ids, prefix_kv = self._get_prefix_cache(prefix)
+        suffix_ids = self.tokenizer(
+            suffix, return_tensors="pt", add_special_tokens=False
+        ).input_ids.to(self.device)
 
-        return sql_query, confidence
+        input_ids = torch.cat([prefix_ids, suffix_ids], dim=-1)
+        if input_ids.shape[-1] > 2048:
+            return None
+
+        with torch.no_grad():
+            outputs = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                # generate() extends the cache in place; keep the original intact
+                past_key_values=copy.deepcopy(prefix_kv),
+                max_new_tokens=max_tokens,
+                temperature=0.1,  # Low temperature for more deterministic SQL
+                do_sample=True,
+                top_p=0.9,
+                pad_token_id=self.tokenizer.pad_token_id
+            )
+
+        return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+
+    def _get_prefix_cache(self, prefix: str) -> Tuple[Any, Any]:
+        """Return (prefix token ids, past-key-values), prefilling the prefix on a miss"""
+        with self._prefix_lock:
+            cached = self._prefix_cache.get(prefix)
+            if cached is not None:
+                self._prefix_cache.move_to_end(prefix)
+                self.prefix_hits += 1
+                return cached
+
+        prefix_ids = self.tokenizer(prefix, return_tensors="pt").input_ids.to(self.device)
+        with torch.no_grad():
+            prefix_kv = self.model(input_ids=prefix_ids, use_cache=True).past_key_values
+
+        with self._prefix_lock:
+            self.prefix_misses += 1
+            self._prefix_cache[prefix] = (prefix_ids, prefix_kv)
+            self._prefix_cache.move_to_end(prefix)
+            while len(self._prefix_cache) > self.prefix_cache_size:
+                self._prefix_cache.popitem(last=False)
+
+        return prefix_ids, prefix_kv
+
+    def batch_stats(self) -> Dict[str, Any]:
+        """Micro-batching throughput counters"""
+        if not self.batcher:
+            return {"enabled": False}
+        return {"enabled": True, "max_batch_size": self.batcher.max_batch_size, **self.batcher.stats()}
+
+    def prefix_cache_stats(self) -> Dict[str, Any]:
+        """Prompt-prefix KV cache counters"""
+        return {
+            "enabled": self.prefix_cache_size > 0,
+            "entries": len(self._prefix_cache),
+            "max_entries": self.prefix_cache_size,
+            "hits": self.prefix_hits,
+            "misses": self.prefix_misses,
+            "mdl_version": self.semantic_layer.version
+        }
 
     def _extract_sql(self, generated_text: str, prompt: str) -> str:
         """Extract SQL query from generated text"""
@@ -280,15 +522,14 @@ def execute_sql(
                     "error": f"Validation failed: {', '.join(validation['errors'])}"
                 }
 
-        # Add LIMIT clause if not present
-        if "LIMIT" not in sql_query.upper():
-            sql_query = f"{sql_query.rstrip(';')} LIMIT {limit}"
+        # Add LIMIT clause if the statement has none
+        sql_query = self._apply_limit(sql_query, limit)
 
         # Execute
         try:
             with self.engine.connect() as conn:
                 result = conn.execute(text(sql_query))
-                rows = [dict(row._mapping) for row in result]
+                rows = [dict(row) for row in result.mappings()]
 
                 return {
                     "success": True,
@@ -304,11 +545,83 @@ def execute_sql(
                 "row_count": 0
             }
 
+    def iter_sql_batches(
+        self,
+        sql_query: str,
+        limit: Optional[int] = None,
+        validate: bool = True,
+        batch_size: int = 1000
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Execute SQL with a server-side cursor and yield rows in batches
+
+        Rows are fetched ``batch_size`` at a time (``yield_per``), so memory
+        stays bounded by the batch rather than the result size. The
+        connection is held until the generator is exhausted or closed.
+
+        Args:
+            sql_query: SQL query to execute
+            limit: Maximum rows to return (None = no LIMIT injected)
+            validate: Whether to validate before executing
+            batch_size: Rows fetched from the cursor per batch
+
+        Yields:
+            (column_names, rows) with rows as plain tuples. The first batch
+            is always yielded, even when empty, so callers get the columns.
+
+        Raises:
+            ValueError: No database configured or validation failed
+            SQLAlchemyError: Execution failed
+        """
+        if not self.engine:
+            raise ValueError("No database connection configured")
+
+        if validate:
+            validation = self.validate_sql(sql_query)
+            if not validation["valid"]:
+                raise ValueError(f"Validation failed: {', '.join(validation['errors'])}")
+
+        sql_query = self._apply_limit(sql_query, limit)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(text(sql_query))
+            columns = list(result.keys())
+
+            emitted = False
+            for partition in result.partitions(batch_size):
+                emitted = True
+                yield columns, [tuple(row) for row in partition]
+
+            if not emitted:
+                yield columns, []
+
+    @staticmethod
+    def _apply_limit(sql_query: str, limit: Optional[int]) -> str:
+        """
+        Append ``LIMIT limit`` unless the top-level statement already limits rows
+
+        The statement is parsed, so LIMITs inside subqueries or CTEs, string
+        literals and identifiers such as ``credit_limit`` don't count, and a
+        trailing line comment can't swallow the injected clause.
+        """
+        sql_query = sql_query.strip().rstrip(";").rstrip()
+        if limit is None:
+            return sql_query
+
+        statements = sqlparse.parse(sql_query)
+        if statements:
+            for token in statements[0].tokens:
+                if token.is_keyword and token.normalized in ("LIMIT", "FETCH"):
+                    return sql_query
+
+        return f"{sql_query}\nLIMIT {int(limit)}"
+
     def ask(
         self,
         question: str,
         execute: bool = True,
-        format_results: bool = True
+        format_results: bool = True,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Complete text-to-SQL pipeline: question → SQL → results
@@ -317,6 +630,7 @@ def ask(
             question: Natural language question
             execute: Whether to execute the query
             format_results: Whether to format results for display
+            use_cache: Serve/store SQL and rows via the ask cache
 
         Returns:
             {
@@ -324,28 +638,55 @@ def ask(
                 "sql": str,
                 "confidence": float,
                 "validation": Dict,
-                "results": Dict (if execute=True)
+                "results": Dict (if execute=True),
+                "sql_cache": "hit" | "miss" | "off",
+                "results_cache": "hit" | "miss" | "off" | None (not executed)
             }
         """
         logger.info(f"Processing question: {question}")
 
-        # Generate SQL
-        sql_query, confidence = self.generate_sql(question)
-        logger.info(f"Generated SQL (confidence: {confidence:.2f}):\n{sql_query}")
+        cache = self.cache if use_cache else None
+        mdl_version = None
+        if cache:
+            # Pick up MDL edits before keying the SQL cache on the version
+            self.semantic_layer.refresh()
+            mdl_version = self.semantic_layer.version
+
+        # Generate SQL (or reuse SQL generated for the same normalized question)
+        cached_sql = cache.get_sql(question, mdl_version) if cache else None
+        if cached_sql:
+            sql_query, confidence = cached_sql["sql"], cached_sql["confidence"]
+            logger.info(f"Reusing cached SQL (confidence: {confidence:.2f})")
+        else:
+            sql_query, confidence = self.generate_sql(question)
+            logger.info(f"Generated SQL (confidence: {confidence:.2f}):\n{sql_query}")
 
         # Validate
         validation = self.validate_sql(sql_query)
 
+        if cache and not cached_sql and validation["valid"]:
+            cache.set_sql(question, mdl_version, sql_query, confidence)
+
         response = {
             "question": question,
             "sql": sql_query,
             "confidence": confidence,
-            "validation": validation
+            "validation": validation,
+            "sql_cache": ("hit" if cached_sql else "miss") if cache else "off",
+            "results_cache": None
         }
 
         # Execute if requested
         if execute and validation["valid"]:
-            results = self.execute_sql(sql_query)
+            params = {"limit": 100}
+            results = cache.get_result(sql_query, params) if cache else None
+            if results is not None:
+                response["results_cache"] = "hit"
+            else:
+                results = self.execute_sql(sql_query, **params)
+                if cache and results["success"]:
+                    cache.set_result(sql_query, params, results)
+                response["results_cache"] = "miss" if cache else "off"
             response["results"] = results
 
             if format_results and results["success"]:
@@ -2,11 +2,12 @@
 BIR Multi-Form Batch Generator Agent
 Orchestrates month-end BIR form generation workflows
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
 from datetime import datetime
 
-from tools.bir_batch_generator import BIRBatchGenerator, BIRFormType
+from tools.bir_batch_generator import BIRBatchGenerator, BIRFormType, TransactionAggregates
 from tools.odoo_client import OdooClient
 from memory.kv_store import MemoryKVStore
 
@@ -32,6 +33,23 @@ class BIRBatchGeneratorAgent:
     6. Send Slack notification with batch summary
     """
 
+    # Keyset page size (matches the PostgREST default max-rows)
+    FETCH_PAGE_SIZE = 1000
+
+    # Pages buffered between the Supabase fetchers and the aggregator
+    FETCH_QUEUE_PAGES = 4
+
+    # Column projections: the period, type and amount columns the forms are
+    # built from plus the keyset column, instead of select("*")
+    WHT_COLUMNS = (
+        "id,transaction_type,transaction_date,atc_code,"
+        "income_payment,amount_withheld,payee_tin,payee_name"
+    )
+    VAT_COLUMNS = (
+        "id,transaction_type,month,year,total_sales,taxable_sales,"
+        "vat_exempt_sales,vat_zero_rated,vat_amount"
+    )
+
     def __init__(
         self,
         odoo_client: OdooClient,
@@ -80,8 +98,8 @@ async def execute(
             # 1. Fetch company info from Odoo
             company_info = self._get_company_info(company_id)
 
-            # 2. Fetch transaction data from Supabase
-            transaction_data = await self._fetch_transaction_data(
+            # 2. Fetch and aggregate transaction data from Supabase
+            aggregates = await self._fetch_transaction_data(
                 month=month,
                 year=year,
                 company_id=company_id
@@ -91,7 +109,7 @@ async def execute(
             validation_result = self.generator.validate_batch_data(
                 month=month,
                 year=year,
-                transaction_data=transaction_data,
+                transaction_data=aggregates.sample,
                 forms=forms
             )
 
@@ -105,11 +123,11 @@ async def execute(
                 return validation_result
 
             # 4. Generate forms
-            batch_result = self.generator.generate_batch(
+            batch_result = self.generator.generate_batch_from_aggregates(
                 month=month,
                 year=year,
                 company_id=company_id,
-                transaction_data=transaction_data,
+                aggregates=aggregates,
                 forms=forms,
                 company_info=company_info
             )
@@ -203,49 +221,134 @@ async def _fetch_transaction_data(
         month: int,
         year: int,
         company_id: int
-    ) -> List[Dict[str, Any]]:
+    ) -> TransactionAggregates:
         """
-        Fetch transaction data from Supabase
+        Fetch transaction data from Supabase and aggregate it page by page
 
         Queries:
         - scout.transactions (for withholding tax) filtered by company_id
         - scout.vat_transactions (for VAT) filtered by company_id
+
+        Both queries run concurrently and each page is folded into the
+        aggregates as soon as it arrives, so memory is bounded by the page
+        size rather than the number of transactions in the month.
         """
+        aggregates = TransactionAggregates(month)
+
         try:
             if not self.supabase:
                 logger.warning("⚠️ Supabase client not configured - returning empty data")
-                return []
+                return aggregates
+
+            async for page in self._stream_transaction_pages(month, year, company_id):
+                aggregates.add_all(page)
+
+            logger.info(
+                f"✅ Fetched {aggregates.type_counts.get('withholding_tax', 0)} WHT + "
+                f"{aggregates.row_count - aggregates.type_counts.get('withholding_tax', 0)} VAT "
+                f"transactions for company {company_id}"
+            )
+
+            return aggregates
+
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch transaction data: {str(e)}")
+            # Never generate forms from a partially fetched month
+            return TransactionAggregates(month)
+
+    async def _stream_transaction_pages(
+        self,
+        month: int,
+        year: int,
+        company_id: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of WHT and VAT transactions as they are fetched
 
-            # Fetch withholding tax transactions (multi-tenant isolation via company_id)
-            wht_query = self.supabase.table("transactions").select("*").filter(
+        The two tables are paged concurrently; pages are handed over through
+        a bounded queue so a slow consumer pauses fetching instead of
+        buffering the whole month.
+        """
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        # Fresh builders per page: postgrest query builders are mutable
+        def wht_query():
+            return self.supabase.table("transactions").select(self.WHT_COLUMNS).filter(
                 "company_id", "eq", company_id
             ).filter(
                 "transaction_date", "gte", f"{year}-{month:02d}-01"
             ).filter(
-                "transaction_date", "lt", f"{year}-{month + 1 if month < 12 else 1:02d}-01"
+                "transaction_date", "lt", f"{next_year}-{next_month:02d}-01"
             ).filter(
                 "transaction_type", "eq", "withholding_tax"
-            ).execute()
+            )
 
-            # Fetch VAT transactions (multi-tenant isolation via company_id)
-            vat_query = self.supabase.table("vat_transactions").select("*").filter(
+        def vat_query():
+            return self.supabase.table("vat_transactions").select(self.VAT_COLUMNS).filter(
                 "company_id", "eq", company_id
             ).filter(
                 "month", "eq", month
             ).filter(
                 "year", "eq", year
-            ).execute()
+            )
 
-            wht_data = wht_query.data if wht_query.data else []
-            vat_data = vat_query.data if vat_query.data else []
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.FETCH_QUEUE_PAGES)
 
-            logger.info(f"✅ Fetched {len(wht_data)} WHT + {len(vat_data)} VAT transactions for company {company_id}")
+        async def pump(pages: AsyncIterator[List[Dict[str, Any]]]):
+            try:
+                async for page in pages:
+                    await queue.put(page)
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(None)
 
-            return wht_data + vat_data
+        producers = [
+            asyncio.create_task(pump(self._paginate(wht_query))),
+            asyncio.create_task(pump(self._paginate(vat_query)))
+        ]
+        remaining = len(producers)
 
-        except Exception as e:
-            logger.error(f"❌ Failed to fetch transaction data: {str(e)}")
-            return []
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+
+    async def _paginate(
+        self,
+        build_query: Callable[[], Any]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Page through a query with keyset pagination on ``id``
+
+        Each blocking ``execute()`` runs in a worker thread so the event loop
+        keeps serving other requests while Supabase responds.
+        """
+        last_id = 0
+        while True:
+            query = build_query().filter(
+                "id", "gt", last_id
+            ).order("id").limit(self.FETCH_PAGE_SIZE)
+
+            response = await asyncio.to_thread(query.execute)
+            rows = response.data or []
+
+            if rows:
+                yield rows
+
+            if len(rows) < self.FETCH_PAGE_SIZE:
+                return
+
+            last_id = rows[-1]["id"]
 
     def _store_batch_result(
         self,
@@ -355,7 +458,7 @@ async def validate_batch_only(
             self.odoo.update_agent_run(run_id, {"status": "running"})
 
             # Fetch transaction data
-            transaction_data = await self._fetch_transaction_data(
+            aggregates = await self._fetch_transaction_data(
                 month=month,
                 year=year,
                 company_id=company_id
@@ -365,20 +468,17 @@ async def validate_batch_only(
             validation_result = self.generator.validate_batch_data(
                 month=month,
                 year=year,
-                transaction_data=transaction_data,
+                transaction_data=aggregates.sample,
                 forms=forms
             )
 
             # Add transaction counts
-            validation_result["transaction_count"] = len(transaction_data)
-            validation_result["wht_count"] = len([
-                t for t in transaction_data
-                if t.get("transaction_type") == "withholding_tax"
-            ])
-            validation_result["vat_count"] = len([
-                t for t in transaction_data
-                if t.get("transaction_type") in ["vat_output", "vat_input"]
-            ])
+            type_counts = aggregates.type_counts
+            validation_result["transaction_count"] = aggregates.row_count
+            validation_result["wht_count"] = type_counts.get("withholding_tax", 0)
+            validation_result["vat_count"] = (
+                type_counts.get("vat_output", 0) + type_counts.get("vat_input", 0)
+            )
 
             # Update run status
             self.odoo.update_agent_run(run_id, {
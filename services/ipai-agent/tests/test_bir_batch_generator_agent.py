@@ -1,5 +1,16 @@
+import asyncio
+import sys
+import threading
+from decimal import Decimal
+from pathlib import Path
+
 import pytest
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agents.bir_batch_generator_agent import BIRBatchGeneratorAgent  # noqa: E402
+from tools.bir_batch_generator import BIRBatchGenerator, BIRFormType, TransactionAggregates  # noqa: E402
+
 pytestmark = pytest.mark.bir_agent
 
 def test_batch_generation_logic():
@@ -13,3 +24,200 @@ def test_form_population_accuracy():
 def test_validation_rule_compliance():
     """Run BIR validation rules and capture all failures."""
     pass
+
+
+COMPANY_INFO = {"tin": "123-456-789-000", "name": "Agency One"}
+ALL_FORMS = [BIRFormType.FORM_1601C, BIRFormType.FORM_2550Q, BIRFormType.FORM_2550M, BIRFormType.FORM_2307]
+
+
+def _transactions(company_id=1):
+    return [
+        {"company_id": company_id, "transaction_type": "withholding_tax", "month": 5, "atc_code": "WC010",
+         "amount_withheld": "100.10", "income_payment": "10010.00", "vendor_tin": "111", "vendor_name": "Vendor A"},
+        {"company_id": company_id, "transaction_type": "withholding_tax", "month": 5, "atc_code": "WC010",
+         "amount_withheld": 0.2, "income_payment": 20, "vendor_tin": "222", "vendor_name": "Vendor B"},
+        {"company_id": company_id, "transaction_type": "withholding_tax", "month": 4, "atc_code": "WI050",
+         "amount_withheld": 15, "income_payment": 100},
+        {"company_id": company_id, "transaction_type": "vat_output", "month": 5, "amount": "1000.00"},
+        {"company_id": company_id, "transaction_type": "vat_output", "month": 5, "amount": 0.1, "vat_exempt": True,
+         "vat_applicable": False},
+        {"company_id": company_id, "transaction_type": "vat_output", "month": 5, "amount": 0.2, "vat_zero_rated": True},
+        {"company_id": company_id, "transaction_type": "vat_output", "month": 4, "amount": 500},
+        {"company_id": company_id, "transaction_type": "vat_output", "month": 1, "amount": 9999},
+        {"company_id": company_id, "transaction_type": "vat_input", "month": 6, "amount": "30.00"},
+    ]
+
+
+def _forms_by_type(batch):
+    return {form["form_type"]: form for form in batch["forms_generated"]}
+
+
+def test_single_pass_aggregates_feed_every_form():
+    forms = _forms_by_type(
+        BIRBatchGenerator().generate_batch(5, 2025, 1, iter(_transactions()), ALL_FORMS, COMPANY_INFO)
+    )
+
+    form_1601c = forms[BIRFormType.FORM_1601C]
+    assert form_1601c["total_amount_withheld"] == 115.3
+    assert form_1601c["atc_breakdown"]["WC010"]["amount_withheld"] == 100.3
+    assert form_1601c["atc_breakdown"]["WC010"]["income_payment"] == 10030.0
+
+    form_2550q = forms[BIRFormType.FORM_2550Q]
+    assert form_2550q["total_sales"] == 1500.3
+    assert form_2550q["taxable_sales"] == 1500.2
+    assert form_2550q["vat_output"] == 180.024
+    assert form_2550q["net_vat_payable"] == 150.024
+
+    form_2550m = forms[BIRFormType.FORM_2550M]
+    assert form_2550m["total_sales"] == 1000.3
+    assert form_2550m["vat_exempt_sales"] == 0.1
+    assert form_2550m["vat_zero_rated"] == 0.2
+    assert form_2550m["vat_output"] == 120.0
+
+    form_2307 = forms[BIRFormType.FORM_2307]
+    assert [c["payee_name"] for c in form_2307["certificates"]] == ["Vendor A", "Vendor B"]
+    assert form_2307["certificates"][1]["certificate_number"] == "202505-00002"
+    assert form_2307["total_amount_withheld"] == 100.3
+
+
+def test_aggregates_are_exact_decimals_across_pages():
+    aggregates = TransactionAggregates(5)
+    rows = [{"transaction_type": "vat_output", "month": 5, "amount": 0.1}] * 10
+    aggregates.add_all(rows[:3])
+    aggregates.add_all(rows[3:])
+
+    assert aggregates.row_count == 10
+    assert aggregates.vat_output[(5, True, "standard")] == Decimal("1.0")
+
+
+def test_multi_company_batch_partitions_by_company():
+    generator = BIRBatchGenerator()
+    transactions = _transactions(1) + _transactions(2)[:2] + [{"company_id": 99, "transaction_type": "vat_output",
+                                                               "month": 5, "amount": 1}]
+    companies = {1: COMPANY_INFO, 2: {"tin": "999", "name": "Agency Two"}}
+
+    result = generator.generate_multi_company_batch(5, 2025, transactions, ALL_FORMS, companies)
+
+    assert set(result["batches"]) == {1, 2}
+    assert result["summary"] == {"total_companies": 2, "total_forms": 8, "skipped_transactions": 1}
+
+    single = _forms_by_type(generator.generate_batch(5, 2025, 1, _transactions(1), ALL_FORMS, COMPANY_INFO))
+    multi = _forms_by_type(result["batches"][1])
+    assert multi[BIRFormType.FORM_2550Q]["net_vat_payable"] == single[BIRFormType.FORM_2550Q]["net_vat_payable"]
+
+    agency_two = _forms_by_type(result["batches"][2])
+    assert agency_two[BIRFormType.FORM_2307]["payor_name"] == "Agency Two"
+    assert agency_two[BIRFormType.FORM_2307]["total_certificates"] == 2
+    assert agency_two[BIRFormType.FORM_2550M]["total_sales"] == 0.0
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeQuery:
+    """Minimal PostgREST builder: select/filter/order/limit/execute over in-memory rows."""
+
+    def __init__(self, supabase, table):
+        self.supabase = supabase
+        self.table = table
+        self.columns = None
+        self.filters = []
+        self.page_size = None
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, size):
+        self.page_size = size
+        return self
+
+    def execute(self):
+        self.supabase.calls.append((self.table, self.columns, list(self.filters)))
+        if self.supabase.barrier:
+            self.supabase.barrier.wait(timeout=5)
+
+        ops = {"eq": lambda a, b: a == b, "gt": lambda a, b: a > b,
+               "gte": lambda a, b: a >= b, "lt": lambda a, b: a < b}
+        rows = [
+            row for row in self.supabase.rows[self.table]
+            if all(ops[op](row[column], value) for column, op, value in self.filters)
+        ]
+        return _FakeResponse(sorted(rows, key=lambda row: row["id"])[:self.page_size])
+
+
+class _FakeSupabase:
+    def __init__(self, rows, barrier=None):
+        self.rows = rows
+        self.barrier = barrier
+        self.calls = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+def _agent(supabase, page_size=2):
+    agent = BIRBatchGeneratorAgent(odoo_client=None, memory_store=None, supabase_client=supabase)
+    agent.FETCH_PAGE_SIZE = page_size
+    return agent
+
+
+def _supabase_rows():
+    wht = [
+        {"id": i, "company_id": 1, "transaction_type": "withholding_tax", "transaction_date": date,
+         "atc_code": "WC010", "amount_withheld": "1.10", "income_payment": "110.00"}
+        for i, date in enumerate(["2025-12-01", "2025-12-15", "2025-12-31", "2026-01-01", "2025-11-30"], start=1)
+    ]
+    vat = [
+        {"id": i, "company_id": 1, "transaction_type": "vat_input", "month": 12, "year": 2025, "amount": 1}
+        for i in range(1, 4)
+    ]
+    return {"transactions": wht, "vat_transactions": vat}
+
+
+def test_fetch_pages_with_keyset_and_projection():
+    supabase = _FakeSupabase(_supabase_rows())
+
+    aggregates = asyncio.run(_agent(supabase)._fetch_transaction_data(month=12, year=2025, company_id=1))
+
+    # December rolls over into next year's January bound
+    assert aggregates.type_counts == {"withholding_tax": 3, "vat_input": 3}
+    assert aggregates.wht_by_atc == {"WC010": Decimal("3.30")}
+
+    wht_calls = [call for call in supabase.calls if call[0] == "transactions"]
+    assert [f[2] for _, _, filters in wht_calls for f in filters if f[0] == "id"] == [0, 2]
+    assert all(columns == BIRBatchGeneratorAgent.WHT_COLUMNS for _, columns, _ in wht_calls)
+    assert ("transaction_date", "lt", "2026-01-01") in wht_calls[0][2]
+
+
+def test_fetch_runs_wht_and_vat_queries_concurrently():
+    # Both first-page queries must be in flight at once to pass the barrier
+    supabase = _FakeSupabase(_supabase_rows(), barrier=threading.Barrier(2))
+
+    aggregates = asyncio.run(_agent(supabase, page_size=10)._fetch_transaction_data(month=12, year=2025, company_id=1))
+
+    assert aggregates.row_count == 6
+
+
+def test_fetch_failure_returns_empty_aggregates():
+    class BrokenSupabase(_FakeSupabase):
+        def table(self, name):
+            if name == "vat_transactions":
+                raise RuntimeError("connection reset")
+            return super().table(name)
+
+    aggregates = asyncio.run(
+        _agent(BrokenSupabase(_supabase_rows()))._fetch_transaction_data(month=12, year=2025, company_id=1)
+    )
+
+    assert aggregates.row_count == 0
+    assert aggregates.wht_by_atc == {}
@@ -3,13 +3,15 @@
 Generates multiple BIR forms for month-end closing workflows
 """
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 import json
 
 logger = logging.getLogger(__name__)
 
+ZERO = Decimal("0.00")
+
 
 class BIRFormType:
     """BIR Form Type Enumeration"""
@@ -19,6 +21,117 @@ class BIRFormType:
     FORM_2307 = "2307"     # Certificate of Creditable Tax Withheld at Source
 
 
+def _to_decimal(value: Any) -> Decimal:
+    """Convert a Supabase numeric (str/int/float/Decimal) to an exact Decimal"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if value is None:
+        return ZERO
+    return Decimal(str(value))
+
+
+class TransactionAggregates:
+    """
+    Running totals for one company's transactions
+
+    Filled in a single pass over the transactions (``add``/``add_all``) and
+    shared by every form generator, so each row is classified and converted
+    to Decimal exactly once regardless of how many forms are requested.
+
+    Buckets:
+    - wht_by_atc: withholding tax withheld per ATC code (all months, 1601-C)
+    - certificates: withholding rows for the batch month (2307), in input order
+    - vat_output: sales per (month, vat_applicable, category) within the batch
+      quarter, where category is "exempt", "zero_rated" or "standard" (2550Q/2550M)
+    - vat_input: input VAT per month within the batch quarter (2550Q)
+
+    ``type_counts`` counts every row by transaction_type and ``sample`` keeps
+    the first SAMPLE_SIZE rows for validate_batch_data, so callers streaming
+    pages never need to hold the full transaction list.
+    """
+
+    SAMPLE_SIZE = 10
+
+    __slots__ = (
+        "month", "quarter_months", "wht_by_atc", "certificates",
+        "vat_output", "vat_input", "row_count", "type_counts", "sample"
+    )
+
+    def __init__(self, month: int):
+        quarter = (month - 1) // 3 + 1
+        self.month = month
+        self.quarter_months = frozenset(range((quarter - 1) * 3 + 1, quarter * 3 + 1))
+        self.wht_by_atc: Dict[str, Decimal] = {}
+        self.certificates: List[Tuple[Dict[str, Any], Decimal, Decimal]] = []
+        self.vat_output: Dict[Tuple[Any, bool, str], Decimal] = {}
+        self.vat_input: Dict[Any, Decimal] = {}
+        self.row_count = 0
+        self.type_counts: Dict[Any, int] = {}
+        self.sample: List[Dict[str, Any]] = []
+
+    def add(self, txn: Dict[str, Any]) -> None:
+        """Fold one transaction into the aggregates"""
+        self.add_all((txn,))
+
+    def add_all(self, transactions: Iterable[Dict[str, Any]]) -> None:
+        """
+        Fold an iterable of transactions (e.g. one fetched page) into the aggregates
+
+        VAT rows outside the batch quarter are counted but not converted,
+        since no form reads them.
+        """
+        month = self.month
+        quarter_months = self.quarter_months
+        wht_by_atc = self.wht_by_atc
+        certificates = self.certificates
+        vat_output = self.vat_output
+        vat_input = self.vat_input
+        type_counts = self.type_counts
+        sample = self.sample
+        count = 0
+
+        for txn in transactions:
+            count += 1
+            if len(sample) < self.SAMPLE_SIZE:
+                sample.append(txn)
+
+            transaction_type = txn.get("transaction_type")
+            type_counts[transaction_type] = type_counts.get(transaction_type, 0) + 1
+
+            if transaction_type == "withholding_tax":
+                amount_withheld = _to_decimal(txn.get("amount_withheld", 0))
+                atc_code = txn.get("atc_code", "WC010")
+                wht_by_atc[atc_code] = wht_by_atc.get(atc_code, ZERO) + amount_withheld
+
+                if txn.get("month") == month:
+                    income_payment = _to_decimal(txn.get("income_payment", 0))
+                    certificates.append((txn, income_payment, amount_withheld))
+
+            elif transaction_type == "vat_output":
+                txn_month = txn.get("month")
+                if txn_month not in quarter_months:
+                    continue
+
+                if txn.get("vat_exempt", False):
+                    category = "exempt"
+                elif txn.get("vat_zero_rated", False):
+                    category = "zero_rated"
+                else:
+                    category = "standard"
+
+                key = (txn_month, bool(txn.get("vat_applicable", True)), category)
+                vat_output[key] = vat_output.get(key, ZERO) + _to_decimal(txn.get("amount", 0))
+
+            elif transaction_type == "vat_input":
+                txn_month = txn.get("month")
+                if txn_month in quarter_months:
+                    vat_input[txn_month] = vat_input.get(txn_month, ZERO) + _to_decimal(txn.get("amount", 0))
+
+        self.row_count += count
+
+
 class BIRBatchGenerator:
     """
     BIR Multi-Form Batch Generator
@@ -80,6 +193,10 @@ class BIRBatchGenerator:
         "WI050": 0.15,   # Interest income
     }
 
+    # Exact-decimal view of WHT_RATES used for income payment back-computation
+    WHT_RATES_DECIMAL = {atc: Decimal(str(rate)) for atc, rate in WHT_RATES.items()}
+    DEFAULT_WHT_RATE = Decimal("0.01")
+
     VAT_RATE = Decimal("0.12")  # 12% VAT
 
     def __init__(self):
@@ -90,18 +207,22 @@ def generate_batch(
         month: int,
         year: int,
         company_id: int,
-        transaction_data: List[Dict[str, Any]],
+        transaction_data: Iterable[Dict[str, Any]],
         forms: List[str],
         company_info: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Generate batch of BIR forms for month-end closing
 
+        Transactions are aggregated once and every requested form is
+        emitted from the same aggregates, so adding forms to a batch does
+        not add passes over the data.
+
         Args:
             month: Month (1-12)
             year: Year (e.g., 2025)
             company_id: Company ID (legal entity for multi-tenant isolation)
-            transaction_data: List of transactions from Supabase
+            transaction_data: Transactions from Supabase (list or any iterable of rows)
             forms: List of form types to generate (e.g., ["1601-C", "2550Q"])
             company_info: Company TIN, name, address
 
@@ -111,84 +232,171 @@ def generate_batch(
         try:
             logger.info(f"Generating batch for company {company_id} - {year}-{month:02d}")
 
-            results = {
-                "batch_id": f"company{company_id}_{year}{month:02d}_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                "month": month,
-                "year": year,
-                "company_id": company_id,
-                "forms_generated": [],
-                "summary": {}
-            }
+            aggregates = TransactionAggregates(month)
+            aggregates.add_all(transaction_data)
 
-            # Generate each requested form
-            for form_type in forms:
-                if form_type == BIRFormType.FORM_1601C:
-                    form_data = self._generate_1601c(
-                        month, year, transaction_data, company_info
-                    )
-                    results["forms_generated"].append(form_data)
-
-                elif form_type == BIRFormType.FORM_2550Q:
-                    quarter = (month - 1) // 3 + 1
-                    form_data = self._generate_2550q(
-                        quarter, year, transaction_data, company_info
-                    )
-                    results["forms_generated"].append(form_data)
-
-                elif form_type == BIRFormType.FORM_2550M:
-                    form_data = self._generate_2550m(
-                        month, year, transaction_data, company_info
-                    )
-                    results["forms_generated"].append(form_data)
-
-                elif form_type == BIRFormType.FORM_2307:
-                    form_data = self._generate_2307_batch(
-                        month, year, transaction_data, company_info
-                    )
-                    results["forms_generated"].append(form_data)
-
-            # Generate summary
-            results["summary"] = self._generate_summary(results["forms_generated"])
-
-            logger.info(f"✅ Batch generated: {len(results['forms_generated'])} forms")
-            return results
+            return self._build_batch(month, year, company_id, aggregates, forms, company_info)
 
         except Exception as e:
             logger.error(f"❌ Batch generation failed: {str(e)}", exc_info=True)
             raise
 
-    def _generate_1601c(
+    def generate_batch_from_aggregates(
         self,
         month: int,
         year: int,
-        transactions: List[Dict[str, Any]],
+        company_id: int,
+        aggregates: "TransactionAggregates",
+        forms: List[str],
         company_info: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Generate Form 1601-C: Monthly Withholding Tax Return"""
+        """
+        Generate batch of BIR forms from pre-built aggregates
+
+        Used when transactions are streamed page by page into a
+        TransactionAggregates instead of being materialized as a list.
+        """
+        try:
+            logger.info(
+                f"Generating batch for company {company_id} - {year}-{month:02d} "
+                f"from {aggregates.row_count} aggregated transactions"
+            )
+            return self._build_batch(month, year, company_id, aggregates, forms, company_info)
 
-        # Filter withholding tax transactions
-        wht_transactions = [
-            t for t in transactions
-            if t.get("transaction_type") == "withholding_tax"
-        ]
+        except Exception as e:
+            logger.error(f"❌ Batch generation failed: {str(e)}", exc_info=True)
+            raise
 
-        # Group by ATC code
-        atc_breakdown = {}
-        total_withheld = Decimal("0.00")
+    def generate_multi_company_batch(
+        self,
+        month: int,
+        year: int,
+        transaction_data: Iterable[Dict[str, Any]],
+        forms: List[str],
+        companies: Dict[int, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Generate month-end batches for several companies in one call
 
-        for txn in wht_transactions:
-            atc_code = txn.get("atc_code", "WC010")
-            amount = Decimal(str(txn.get("amount_withheld", 0)))
+        Transactions for all companies are partitioned by their
+        ``company_id`` in a single pass, then each company's batch is
+        emitted from its own aggregates. Rows for companies that are not
+        listed in ``companies`` are skipped.
+
+        Args:
+            month: Month (1-12)
+            year: Year (e.g., 2025)
+            transaction_data: Transactions for all companies (each row carries company_id)
+            forms: List of form types to generate for every company
+            companies: Company info (TIN, name, address) keyed by company ID
 
-            if atc_code not in atc_breakdown:
-                atc_breakdown[atc_code] = {
-                    "income_payment": Decimal("0.00"),
-                    "amount_withheld": Decimal("0.00"),
-                    "tax_rate": self.WHT_RATES.get(atc_code, 0.01)
+        Returns:
+            Per-company batch results plus a combined summary
+        """
+        try:
+            logger.info(f"Generating batches for {len(companies)} companies - {year}-{month:02d}")
+
+            partitions = {
+                company_id: TransactionAggregates(month) for company_id in companies
+            }
+            skipped = 0
+
+            for txn in transaction_data:
+                aggregates = partitions.get(txn.get("company_id"))
+                if aggregates is None:
+                    skipped += 1
+                    continue
+                aggregates.add(txn)
+
+            if skipped:
+                logger.warning(f"⚠️ Skipped {skipped} transactions for unlisted companies")
+
+            batches = {
+                company_id: self._build_batch(
+                    month, year, company_id, partitions[company_id], forms, company_info
+                )
+                for company_id, company_info in companies.items()
+            }
+
+            logger.info(f"✅ Batches generated for {len(batches)} companies")
+
+            return {
+                "month": month,
+                "year": year,
+                "batches": batches,
+                "summary": {
+                    "total_companies": len(batches),
+                    "total_forms": sum(b["summary"]["total_forms"] for b in batches.values()),
+                    "skipped_transactions": skipped
                 }
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Multi-company batch generation failed: {str(e)}", exc_info=True)
+            raise
+
+    def _build_batch(
+        self,
+        month: int,
+        year: int,
+        company_id: int,
+        aggregates: "TransactionAggregates",
+        forms: List[str],
+        company_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Emit the requested forms for one company from its aggregates"""
+
+        results = {
+            "batch_id": f"company{company_id}_{year}{month:02d}_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "month": month,
+            "year": year,
+            "company_id": company_id,
+            "forms_generated": [],
+            "summary": {}
+        }
+
+        for form_type in forms:
+            if form_type == BIRFormType.FORM_1601C:
+                form_data = self._generate_1601c(month, year, aggregates, company_info)
+                results["forms_generated"].append(form_data)
 
-            atc_breakdown[atc_code]["amount_withheld"] += amount
-            atc_breakdown[atc_code]["income_payment"] += amount / Decimal(str(atc_breakdown[atc_code]["tax_rate"]))
+            elif form_type == BIRFormType.FORM_2550Q:
+                quarter = (month - 1) // 3 + 1
+                form_data = self._generate_2550q(quarter, year, aggregates, company_info)
+                results["forms_generated"].append(form_data)
+
+            elif form_type == BIRFormType.FORM_2550M:
+                form_data = self._generate_2550m(month, year, aggregates, company_info)
+                results["forms_generated"].append(form_data)
+
+            elif form_type == BIRFormType.FORM_2307:
+                form_data = self._generate_2307_batch(month, year, aggregates, company_info)
+                results["forms_generated"].append(form_data)
+
+        results["summary"] = self._generate_summary(results["forms_generated"])
+
+        logger.info(f"✅ Batch generated: {len(results['forms_generated'])} forms")
+        return results
+
+    def _generate_1601c(
+        self,
+        month: int,
+        year: int,
+        aggregates: "TransactionAggregates",
+        company_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate Form 1601-C: Monthly Withholding Tax Return"""
+
+        atc_breakdown = {}
+        total_withheld = ZERO
+
+        for atc_code, amount in aggregates.wht_by_atc.items():
+            tax_rate = self.WHT_RATES.get(atc_code, 0.01)
+            atc_breakdown[atc_code] = {
+                "income_payment": float(amount / self.WHT_RATES_DECIMAL.get(atc_code, self.DEFAULT_WHT_RATE)),
+                "amount_withheld": float(amount),
+                "tax_rate": tax_rate
+            }
             total_withheld += amount
 
         return {
@@ -199,14 +407,7 @@ def _generate_1601c(
             "registered_name": company_info.get("name"),
             "total_amount_withheld": float(total_withheld),
             "total_remittance": float(total_withheld),
-            "atc_breakdown": {
-                atc: {
-                    "income_payment": float(data["income_payment"]),
-                    "amount_withheld": float(data["amount_withheld"]),
-                    "tax_rate": data["tax_rate"]
-                }
-                for atc, data in atc_breakdown.items()
-            },
+            "atc_breakdown": atc_breakdown,
             "generated_at": datetime.now().isoformat()
         }
 
@@ -214,37 +415,29 @@ def _generate_2550q(
         self,
         quarter: int,
         year: int,
-        transactions: List[Dict[str, Any]],
+        aggregates: "TransactionAggregates",
         company_info: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate Form 2550Q: Quarterly VAT Return"""
 
-        # Filter VAT transactions for the quarter
         quarter_months = range((quarter - 1) * 3 + 1, quarter * 3 + 1)
-        vat_transactions = [
-            t for t in transactions
-            if t.get("transaction_type") in ["vat_output", "vat_input"]
-            and t.get("month") in quarter_months
-        ]
 
-        total_sales = Decimal("0.00")
-        taxable_sales = Decimal("0.00")
-        vat_output = Decimal("0.00")
-        vat_input = Decimal("0.00")
+        total_sales = ZERO
+        taxable_sales = ZERO
+        vat_input = ZERO
 
-        for txn in vat_transactions:
-            if txn.get("transaction_type") == "vat_output":
-                sales_amount = Decimal(str(txn.get("amount", 0)))
-                total_sales += sales_amount
+        for (txn_month, vat_applicable, _category), amount in aggregates.vat_output.items():
+            if txn_month in quarter_months:
+                total_sales += amount
+                if vat_applicable:
+                    taxable_sales += amount
 
-                if txn.get("vat_applicable", True):
-                    taxable_sales += sales_amount
-                    vat_output += sales_amount * self.VAT_RATE
+        for txn_month, amount in aggregates.vat_input.items():
+            if txn_month in quarter_months:
+                vat_input += amount
 
-            elif txn.get("transaction_type") == "vat_input":
-                vat_input += Decimal(str(txn.get("amount", 0)))
-
-        net_vat_payable = max(vat_output - vat_input, Decimal("0.00"))
+        vat_output = taxable_sales * self.VAT_RATE
+        net_vat_payable = max(vat_output - vat_input, ZERO)
 
         return {
             "form_type": BIRFormType.FORM_2550Q,
@@ -265,34 +458,19 @@ def _generate_2550m(
         self,
         month: int,
         year: int,
-        transactions: List[Dict[str, Any]],
+        aggregates: "TransactionAggregates",
         company_info: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate Form 2550M: Monthly VAT Return"""
 
-        # Filter VAT transactions for the month
-        monthly_vat = [
-            t for t in transactions
-            if t.get("transaction_type") == "vat_output"
-            and t.get("month") == month
-        ]
-
-        total_sales = Decimal("0.00")
-        vat_exempt_sales = Decimal("0.00")
-        vat_zero_rated = Decimal("0.00")
-        vat_output = Decimal("0.00")
-
-        for txn in monthly_vat:
-            sales_amount = Decimal(str(txn.get("amount", 0)))
-            total_sales += sales_amount
-
-            if txn.get("vat_exempt", False):
-                vat_exempt_sales += sales_amount
-            elif txn.get("vat_zero_rated", False):
-                vat_zero_rated += sales_amount
-            else:
-                vat_output += sales_amount * self.VAT_RATE
+        totals = {"exempt": ZERO, "zero_rated": ZERO, "standard": ZERO}
+
+        for (txn_month, _vat_applicable, category), amount in aggregates.vat_output.items():
+            if txn_month == month:
+                totals[category] += amount
 
+        total_sales = totals["exempt"] + totals["zero_rated"] + totals["standard"]
+        vat_output = totals["standard"] * self.VAT_RATE
         net_vat_payable = vat_output
 
         return {
@@ -302,8 +480,8 @@ def _generate_2550m(
             "tin": company_info.get("tin"),
             "registered_name": company_info.get("name"),
             "total_sales": float(total_sales),
-            "vat_exempt_sales": float(vat_exempt_sales),
-            "vat_zero_rated": float(vat_zero_rated),
+            "vat_exempt_sales": float(totals["exempt"]),
+            "vat_zero_rated": float(totals["zero_rated"]),
             "vat_output": float(vat_output),
             "net_vat_payable": float(net_vat_payable),
             "generated_at": datetime.now().isoformat()
@@ -313,49 +491,42 @@ def _generate_2307_batch(
         self,
         month: int,
         year: int,
-        transactions: List[Dict[str, Any]],
+        aggregates: "TransactionAggregates",
         company_info: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate Form 2307 Batch: Withholding Tax Certificates"""
 
-        # Filter withholding tax transactions
-        wht_transactions = [
-            t for t in transactions
-            if t.get("transaction_type") == "withholding_tax"
-            and t.get("month") == month
-        ]
+        payor_tin = company_info.get("tin")
+        payor_name = company_info.get("name")
 
         certificates = []
-        total_certificates = 0
-        total_amount_withheld = Decimal("0.00")
+        total_amount_withheld = ZERO
 
-        for txn in wht_transactions:
-            certificate = {
-                "certificate_number": f"{year}{month:02d}-{total_certificates + 1:05d}",
+        for index, (txn, income_payment, amount_withheld) in enumerate(aggregates.certificates, start=1):
+            atc_code = txn.get("atc_code", "WC010")
+            certificates.append({
+                "certificate_number": f"{year}{month:02d}-{index:05d}",
                 "payee_tin": txn.get("vendor_tin"),
                 "payee_name": txn.get("vendor_name"),
-                "income_payment": float(Decimal(str(txn.get("income_payment", 0)))),
-                "atc_code": txn.get("atc_code", "WC010"),
-                "tax_rate": self.WHT_RATES.get(txn.get("atc_code", "WC010"), 0.01),
-                "amount_withheld": float(Decimal(str(txn.get("amount_withheld", 0)))),
-                "payor_tin": company_info.get("tin"),
-                "payor_name": company_info.get("name"),
+                "income_payment": float(income_payment),
+                "atc_code": atc_code,
+                "tax_rate": self.WHT_RATES.get(atc_code, 0.01),
+                "amount_withheld": float(amount_withheld),
+                "payor_tin": payor_tin,
+                "payor_name": payor_name,
                 "date_withheld": txn.get("transaction_date")
-            }
-
-            certificates.append(certificate)
-            total_certificates += 1
-            total_amount_withheld += Decimal(str(certificate["amount_withheld"]))
+            })
+            total_amount_withheld += amount_withheld
 
         return {
             "form_type": BIRFormType.FORM_2307,
             "month": month,
             "year": year,
             "certificates": certificates,
-            "total_certificates": total_certificates,
+            "total_certificates": len(certificates),
             "total_amount_withheld": float(total_amount_withheld),
-            "payor_tin": company_info.get("tin"),
-            "payor_name": company_info.get("name"),
+            "payor_tin": payor_tin,
+            "payor_name": payor_name,
             "generated_at": datetime.now().isoformat()
         }
 
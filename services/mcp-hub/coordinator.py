@@ -16,14 +16,25 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any, AsyncIterator
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Tuple
 import httpx
 import os
 import logging
 import json
 import asyncio
+import base64
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import re
+import time
 from datetime import datetime
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -48,24 +59,324 @@
 MATTERMOST_URL = os.getenv("MATTERMOST_URL", "https://chat.insightpulseai.net")
 MATTERMOST_TOKEN = os.getenv("MATTERMOST_TOKEN", "")
 
+# Connection pool defaults (overridable per backend in the server config)
+POOL_MAX_CONNECTIONS = int(os.getenv("MCP_POOL_MAX_CONNECTIONS", "20"))
+POOL_MAX_KEEPALIVE = int(os.getenv("MCP_POOL_MAX_KEEPALIVE", "10"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("MCP_POOL_KEEPALIVE_EXPIRY", "30"))
+POOL_TIMEOUT = float(os.getenv("MCP_POOL_TIMEOUT", "30"))
+POOL_CONNECT_TIMEOUT = float(os.getenv("MCP_POOL_CONNECT_TIMEOUT", "5"))
+HTTP2_ENABLED = os.getenv("MCP_HTTP2", "true").lower() == "true"
+
+# Max concurrent in-flight calls per backend (defaults to its pool size)
+BACKEND_MAX_CONCURRENCY = int(os.getenv("MCP_BACKEND_MAX_CONCURRENCY", str(POOL_MAX_CONNECTIONS)))
+
+# Precedence when an operation or domain keyword is declared by several backends
+ROUTING_ORDER = ['github', 'digitalocean', 'supabase', 'superset', 'notion', 'n8n', 'mattermost', 'tableau']
+DEFAULT_SERVER = 'github'
+
+# Operations/keywords claimed by several backends that keep the owner they had
+# under the original substring routing (ROUTING_ORDER decides the rest)
+ROUTING_OWNERS = {'trigger_workflow': 'n8n', 'workflow': 'n8n'}
+
+# Backends _dispatch can call; others are never routing targets
+DISPATCH_SERVERS = {'github', 'digitalocean', 'supabase', 'superset', 'n8n', 'mattermost'}
+
+# Domain keywords up to this length (pr, git, app, sql, ...) only match whole
+# `_`-separated tokens; longer ones also match as a prefix (deploy -> deployment)
+ROUTING_SHORT_KEYWORD = 3
+
+# Backends whose responses can be relayed as they arrive
+STREAMING_SERVERS = {'github', 'digitalocean', 'supabase', 'superset', 'n8n'}
+
+# Opt-in response cache for idempotent read operations
+RESULT_CACHE_ENABLED = os.getenv("MCP_RESULT_CACHE", "false").lower() == "true"
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("MCP_RESULT_CACHE_MAX_ENTRIES", "1024"))
+
+# TTL (seconds) per cacheable read operation; Supabase table reads use 'GET'
+RESULT_CACHE_TTLS = {
+    'digitalocean': {'list_apps': 30, 'get_app': 30},
+    'superset': {'list_datasets': 120},
+    'n8n': {'list_workflows': 60},
+    'supabase': {'GET': 15},
+}
+
+# Operations that never invalidate cached results on their backend
+READ_ONLY_OPERATIONS = {
+    'digitalocean': {'list_apps', 'get_app', 'get_logs'},
+    'superset': {'list_datasets', 'execute_sql'},
+    'n8n': {'list_workflows', 'get_execution'},
+    'mattermost': {'get_channel_messages'},
+}
+
+# Superset access tokens are refreshed this many seconds before they expire
+SUPERSET_TOKEN_REFRESH_MARGIN = float(os.getenv("SUPERSET_TOKEN_REFRESH_MARGIN", "60"))
+# Lifetime assumed when the token carries no `exp` claim (Superset default: 15 min)
+SUPERSET_TOKEN_DEFAULT_TTL = float(os.getenv("SUPERSET_TOKEN_DEFAULT_TTL", "900"))
+
 
 class MCPRequest(BaseModel):
     """MCP protocol request."""
     method: str
     params: Optional[Dict[str, Any]] = Field(default_factory=dict)
     server: Optional[str] = None  # Target server hint
+    id: Optional[Any] = None  # Echoed back so batch callers can match responses
 
 
 class MCPResponse(BaseModel):
     """MCP protocol response."""
     result: Optional[Any] = None
     error: Optional[Dict[str, str]] = None
+    id: Optional[Any] = None
+
+
+class RoutingIndex:
+    """
+    Precompiled tool-name -> server lookup.
+
+    Built once from the declared `operations` and `domains` of the backends
+    _dispatch supports: declared operation names resolve with a dict lookup,
+    anything else is matched against a single alternation of domain keywords
+    (short keywords as whole `_`-separated tokens with optional plural,
+    longer ones as token prefixes), taking the leftmost keyword so prefixed
+    tool names such as `superset_execute_sql` route by prefix.
+    """
+
+    def __init__(self, servers: Dict[str, Dict[str, Any]], default: str = DEFAULT_SERVER,
+                 supported: Optional[set] = None):
+        self.default = default
+        self.exact: Dict[str, str] = {}
+        supported = DISPATCH_SERVERS if supported is None else supported
+        ordered = [name for name in ROUTING_ORDER if name in servers and name in supported]
+        ordered += [name for name in servers if name not in ordered and name in supported]
+
+        groups = []
+        for name in ordered:
+            for operation in servers[name].get('operations', []):
+                operation = operation.lower()
+                owner = ROUTING_OWNERS.get(operation)
+                if owner in ordered:
+                    self.exact[operation] = owner
+                else:
+                    self.exact.setdefault(operation, name)
+
+            keywords = [
+                keyword.lower() for keyword in servers[name].get('domains', [])
+                if ROUTING_OWNERS.get(keyword.lower(), name) == name
+                or ROUTING_OWNERS[keyword.lower()] not in ordered
+            ]
+            if keywords:
+                alternation = '|'.join(
+                    re.escape(keyword) + (
+                        r's?(?![a-z0-9])' if len(keyword) <= ROUTING_SHORT_KEYWORD else '[a-z0-9]*'
+                    )
+                    for keyword in sorted(keywords, key=len, reverse=True)
+                )
+                groups.append(f"(?P<{name}>{alternation})")
+
+        self.pattern = re.compile(
+            rf"(?<![a-z0-9])(?:{'|'.join(groups)})"
+        ) if groups else None
+
+    def resolve(self, tool_name: str) -> str:
+        """Return the server for tool_name, falling back to the default."""
+        name = tool_name.lower()
+        server = self.exact.get(name)
+        if server:
+            return server
+
+        match = self.pattern.search(name) if self.pattern else None
+        if match:
+            return match.lastgroup
+        return self.default
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """Read the `exp` claim of a JWT (no signature verification)."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class SupersetTokenCache:
+    """
+    Access-token cache keyed by (Superset URL, username).
+
+    Tokens are reused until their JWT expiry. Inside the refresh margin the
+    cached token is still returned while a single background login renews
+    it; expired or missing tokens are fetched with one login per key no
+    matter how many callers are waiting.
+    """
+
+    def __init__(self, refresh_margin: float = SUPERSET_TOKEN_REFRESH_MARGIN,
+                 default_ttl: float = SUPERSET_TOKEN_DEFAULT_TTL):
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._refresh_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {'hits': 0, 'logins': 0, 'background_refreshes': 0, 'invalidations': 0}
+
+    async def get(self, key: Tuple[str, str], login: Callable[[], Awaitable[str]]) -> str:
+        """Return a valid token for key, logging in only when needed."""
+        entry = self._entries.get(key)
+        now = time.time()
+
+        if entry and now < entry['expires_at']:
+            if now >= entry['expires_at'] - self.refresh_margin:
+                self._schedule_refresh(key, login)
+            self.stats['hits'] += 1
+            return entry['token']
+
+        return await self._refresh(key, login)
+
+    def invalidate(self, key: Tuple[str, str], token: str):
+        """Drop a token the server rejected (unless it was already replaced)."""
+        entry = self._entries.get(key)
+        if entry and entry['token'] == token:
+            del self._entries[key]
+            self.stats['invalidations'] += 1
+
+    async def close(self):
+        """Cancel pending background refreshes."""
+        tasks = [task for task in self._refresh_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresh_tasks.clear()
+
+    async def _refresh(self, key: Tuple[str, str], login: Callable[[], Awaitable[str]]) -> str:
+        """Log in once per key; concurrent callers wait for the same result."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            # Another caller may have refreshed while we waited for the lock
+            entry = self._entries.get(key)
+            if entry and time.time() < entry['expires_at'] - self.refresh_margin:
+                return entry['token']
+
+            token = await login()
+            self.stats['logins'] += 1
+            expires_at = _jwt_expiry(token) or time.time() + self.default_ttl
+            self._entries[key] = {'token': token, 'expires_at': expires_at}
+            return token
+
+    def _schedule_refresh(self, key: Tuple[str, str], login: Callable[[], Awaitable[str]]):
+        """Start a background refresh for key unless one is already running."""
+        task = self._refresh_tasks.get(key)
+        if task and not task.done():
+            return
+
+        self.stats['background_refreshes'] += 1
+        task = asyncio.create_task(self._refresh(key, login))
+        task.add_done_callback(self._log_refresh_failure)
+        self._refresh_tasks[key] = task
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background Superset token refresh failed: {task.exception()}")
+
+
+class ResultCache:
+    """
+    TTL + LRU cache for backend read results.
+
+    Keys are (backend, operation, normalized arguments). Concurrent misses
+    for the same key share a single upstream call, and a per-backend
+    generation counter keeps a fetch that raced with an invalidation from
+    storing its (possibly stale) result.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def make_key(backend: str, operation: str, arguments: Dict[str, Any]) -> Tuple[str, str, str]:
+        return (backend, operation, json.dumps(arguments, sort_keys=True, default=str))
+
+    async def get_or_fetch(self, key: Tuple[str, str, str], ttl: float,
+                           fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key or fetch it once for all waiters."""
+        while True:
+            entry = self._entries.get(key)
+            if entry and entry['expires_at'] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry['value']
+
+            pending = self._in_flight.get(key)
+            if not pending:
+                break
+            self.stats['coalesced'] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client disconnected),
+                # not this request: look again and take over the fetch
+                if not pending.cancelled():
+                    raise
+
+        self.stats['misses'] += 1
+        backend = key[0]
+        generation = self._generations.get(backend, 0)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so failures nobody awaited are not logged
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        future.set_result(value)
+        if self._generations.get(backend, 0) == generation:
+            self._store(key, value, ttl)
+        return value
+
+    def invalidate(self, backend: str):
+        """Drop every cached result for backend."""
+        self._generations[backend] = self._generations.get(backend, 0) + 1
+        stale = [key for key in self._entries if key[0] == backend]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self.stats['invalidations'] += 1
+
+    def _store(self, key: Tuple[str, str, str], value: Any, ttl: float):
+        self._entries[key] = {'value': value, 'expires_at': time.monotonic() + ttl}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['coalesced']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'hit_rate': round((lookups - self.stats['misses']) / lookups, 4) if lookups else 0.0
+        }
 
 
 class MCPCoordinator:
     """Intelligent MCP server routing and coordination."""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 result_cache: bool = RESULT_CACHE_ENABLED):
         self.servers = {
             'github': self._get_github_client(),
             'digitalocean': self._get_do_client(),
@@ -77,6 +388,135 @@ def __init__(self):
             'mattermost': self._get_mattermost_client()
         }
 
+        # Long-lived per-backend HTTP clients (keep-alive connection pools)
+        self._transport = transport
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.pool_stats: Dict[str, Dict[str, Any]] = {}
+
+        self.superset_tokens = SupersetTokenCache()
+
+        self.routing = RoutingIndex(self.servers)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        self.result_cache = ResultCache() if result_cache else None
+
+    # ========================================================================
+    # Connection Pool Management
+    # ========================================================================
+
+    async def start(self):
+        """Open a pooled client for every backend with a configured URL."""
+        for name, config in self.servers.items():
+            if config.get('url') and name not in self.clients:
+                self.clients[name] = self._build_client(name, config)
+
+        logger.info(f"Opened HTTP pools for: {', '.join(sorted(self.clients))}")
+
+    async def close(self):
+        """Close all pooled clients."""
+        await self.superset_tokens.close()
+        clients, self.clients = self.clients, {}
+        await asyncio.gather(*(client.aclose() for client in clients.values()))
+        logger.info("Closed HTTP pools")
+
+    def _build_client(self, name: str, config: Dict[str, Any]) -> httpx.AsyncClient:
+        """Create a keep-alive client using the backend's pool settings."""
+        pool = config.get('pool', {})
+        timeout = httpx.Timeout(
+            pool.get('timeout', POOL_TIMEOUT),
+            connect=pool.get('connect_timeout', POOL_CONNECT_TIMEOUT)
+        )
+        limits = httpx.Limits(
+            max_connections=pool.get('max_connections', POOL_MAX_CONNECTIONS),
+            max_keepalive_connections=pool.get('max_keepalive', POOL_MAX_KEEPALIVE),
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY
+        )
+        # HTTP/2 is only negotiated over TLS (ALPN)
+        http2 = HTTP2_ENABLED and HTTP2_AVAILABLE and config['url'].startswith('https://')
+
+        self.pool_stats[name] = {
+            'requests': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'total_latency_ms': 0.0,
+            'http2': http2
+        }
+
+        if self._transport is not None:
+            return httpx.AsyncClient(transport=self._transport, timeout=timeout)
+        return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+
+    def _client(self, server: str) -> httpx.AsyncClient:
+        """Return the pooled client for a backend, creating it on first use."""
+        client = self.clients.get(server)
+        if client is None:
+            client = self._build_client(server, self.servers[server])
+            self.clients[server] = client
+        return client
+
+    async def _request(self, server: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the backend's pooled client, recording metrics."""
+        client = self._client(server)
+        stats = self.pool_stats[server]
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        start = time.perf_counter()
+
+        try:
+            return await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats['errors'] += 1
+            raise
+        finally:
+            stats['in_flight'] -= 1
+            stats['total_latency_ms'] += (time.perf_counter() - start) * 1000
+
+    @asynccontextmanager
+    async def _stream(self, server: str, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Open a streamed request on the backend's pooled client, recording metrics."""
+        client = self._client(server)
+        stats = self.pool_stats[server]
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        start = time.perf_counter()
+
+        try:
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+        except httpx.HTTPError:
+            stats['errors'] += 1
+            raise
+        finally:
+            stats['in_flight'] -= 1
+            stats['total_latency_ms'] += (time.perf_counter() - start) * 1000
+
+    def pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of per-backend pool usage for the health endpoint."""
+        metrics = {}
+        for name, stats in self.pool_stats.items():
+            requests = stats['requests']
+            metrics[name] = {
+                'requests': requests,
+                'errors': stats['errors'],
+                'in_flight': stats['in_flight'],
+                'avg_latency_ms': round(stats['total_latency_ms'] / requests, 2) if requests else 0.0,
+                'http2': stats['http2'],
+                **self._connection_counts(name)
+            }
+        return metrics
+
+    def _connection_counts(self, server: str) -> Dict[str, int]:
+        """Open/idle connection counts from the underlying httpcore pool."""
+        client = self.clients.get(server)
+        pool = getattr(getattr(client, '_transport', None), '_pool', None)
+        connections = getattr(pool, 'connections', None)
+        if connections is None:
+            return {}
+        return {
+            'connections': len(connections),
+            'idle_connections': sum(1 for conn in connections if conn.is_idle())
+        }
+
     def _get_github_client(self):
         """GitHub client via pulser-hub MCP."""
         return {
@@ -84,7 +524,8 @@ def _get_github_client(self):
             'endpoint': '/mcp/github',
             'domains': ['github', 'git', 'repo', 'pr', 'issue', 'branch', 'workflow'],
             'operations': ['create_branch', 'commit_files', 'create_pr', 'merge_pr',
-                          'create_issue', 'trigger_workflow', 'read_file', 'search_code']
+                          'create_issue', 'trigger_workflow', 'read_file', 'search_code'],
+            'pool': {'max_connections': 50, 'max_keepalive': 20}
         }
 
     def _get_do_client(self):
@@ -93,7 +534,8 @@ def _get_do_client(self):
             'url': 'https://api.digitalocean.com/v2',
             'headers': {'Authorization': f'Bearer {DO_API_TOKEN}'},
             'domains': ['digitalocean', 'deploy', 'app', 'droplet', 'spaces'],
-            'operations': ['list_apps', 'get_app', 'create_deployment', 'get_logs']
+            'operations': ['list_apps', 'get_app', 'create_deployment', 'get_logs'],
+            'pool': {'max_connections': 10, 'max_keepalive': 5}
         }
 
     def _get_supabase_client(self):
@@ -125,7 +567,8 @@ def _get_superset_client(self):
         return {
             'url': SUPERSET_URL,
             'domains': ['superset', 'dashboard', 'chart', 'dataset', 'sql'],
-            'operations': ['execute_sql', 'create_chart', 'create_dashboard', 'list_datasets']
+            'operations': ['execute_sql', 'create_chart', 'create_dashboard', 'list_datasets'],
+            'pool': {'max_connections': 10, 'max_keepalive': 5}
         }
 
     def _get_tableau_client(self):
@@ -183,7 +626,111 @@ async def route_request(self, method: str, params: Dict[str, Any], server_hint:
 
         logger.info(f"Routing {tool_name} to {target_server}")
 
-        # Route to appropriate handler
+        ttl = self._cache_ttl(target_server, tool_name, arguments)
+        if ttl:
+            key = ResultCache.make_key(target_server, tool_name, arguments)
+            return await self.result_cache.get_or_fetch(
+                key, ttl, lambda: self._call_backend(target_server, method, params, tool_name, arguments)
+            )
+
+        result = await self._call_backend(target_server, method, params, tool_name, arguments)
+        if self.result_cache and not self._is_read_only(target_server, tool_name, arguments):
+            self.result_cache.invalidate(target_server)
+        return result
+
+    async def stream_request(self, method: str, params: Dict[str, Any],
+                             server_hint: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Route a request and yield events while the upstream response arrives.
+
+        Events are dicts with 'event' (progress, chunk, result or done) and
+        'data'. Chunks are pulled from the upstream body only as fast as the
+        consumer reads them, so slow subscribers apply backpressure instead
+        of the hub buffering the payload. Backends without an HTTP API fall
+        back to a single 'result' event.
+
+        Args:
+            method: MCP method (e.g., "tools/call")
+            params: Method parameters
+            server_hint: Optional server preference
+        """
+        tool_name = params.get('name', '') if method == 'tools/call' else ''
+        arguments = params.get('arguments', {})
+        target_server = await self._select_server(tool_name, arguments, server_hint)
+        start = time.perf_counter()
+
+        logger.info(f"Streaming {tool_name} from {target_server}")
+        yield {'event': 'progress', 'data': {'stage': 'routed', 'server': target_server, 'tool': tool_name}}
+
+        if target_server not in STREAMING_SERVERS:
+            result = await self.route_request(method, params, target_server)
+            yield {'event': 'result', 'data': result}
+            return
+
+        async with self._backend_semaphore(target_server):
+            for attempt in range(2):
+                token = await self._get_superset_token() if target_server == 'superset' else None
+                http_method, url, kwargs = self._build_request(
+                    target_server, method, params, tool_name, arguments, token
+                )
+
+                async with self._stream(target_server, http_method, url, **kwargs) as response:
+                    # Same single retry on an expired Superset token as _call_superset
+                    if response.status_code == 401 and token and attempt == 0:
+                        self.superset_tokens.invalidate(self._superset_token_key(), token)
+                        continue
+                    response.raise_for_status()
+
+                    total_bytes = response.headers.get('content-length')
+                    yield {'event': 'progress', 'data': {
+                        'stage': 'streaming',
+                        'status': response.status_code,
+                        'content_type': response.headers.get('content-type'),
+                        'total_bytes': int(total_bytes) if total_bytes else None
+                    }}
+
+                    # Relay each network read as soon as it arrives (no re-chunking)
+                    async for chunk in response.aiter_text():
+                        yield {'event': 'chunk', 'data': {
+                            'text': chunk,
+                            'bytes_received': response.num_bytes_downloaded
+                        }}
+
+                    yield {'event': 'done', 'data': {
+                        'bytes_received': response.num_bytes_downloaded,
+                        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)
+                    }}
+                break
+
+        if self.result_cache and not self._is_read_only(target_server, tool_name, arguments):
+            self.result_cache.invalidate(target_server)
+
+    async def _call_backend(self, target_server: str, method: str, params: Dict[str, Any],
+                            tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch under the backend's concurrency limit."""
+        async with self._backend_semaphore(target_server):
+            return await self._dispatch(target_server, method, params, tool_name, arguments)
+
+    def _cache_ttl(self, server: str, operation: str, arguments: Dict[str, Any]) -> Optional[float]:
+        """TTL for a cacheable read, or None when the call must go upstream."""
+        if not self.result_cache:
+            return None
+        ttls = RESULT_CACHE_TTLS.get(server, {})
+        if server == 'supabase':
+            if operation in ('execute_sql', 'rpc') or arguments.get('method', 'GET') != 'GET':
+                return None
+            return ttls.get('GET')
+        return ttls.get(operation)
+
+    def _is_read_only(self, server: str, operation: str, arguments: Dict[str, Any]) -> bool:
+        """Whether a successful call leaves the backend's cached reads valid."""
+        if server == 'supabase':
+            return operation not in ('execute_sql', 'rpc') and arguments.get('method', 'GET') == 'GET'
+        return operation in READ_ONLY_OPERATIONS.get(server, set())
+
+    async def _dispatch(self, target_server: str, method: str, params: Dict[str, Any],
+                        tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the handler for target_server."""
         if target_server == 'github':
             return await self._call_pulser_hub(method, params)
         elif target_server == 'digitalocean':
@@ -204,39 +751,55 @@ async def _select_server(self, tool_name: str, arguments: Dict[str, Any], hint:
         if hint and hint in self.servers:
             return hint
 
-        # Pattern-based routing
-        if any(x in tool_name.lower() for x in ['github', 'branch', 'pr', 'issue', 'repo']):
-            return 'github'
-        elif any(x in tool_name.lower() for x in ['deploy', 'app', 'digitalocean']):
-            return 'digitalocean'
-        elif any(x in tool_name.lower() for x in ['sql', 'database', 'supabase', 'postgres']):
-            return 'supabase'
-        elif any(x in tool_name.lower() for x in ['superset', 'dashboard', 'chart']):
-            return 'superset'
-        elif any(x in tool_name.lower() for x in ['notion', 'page']):
-            return 'notion'
-        elif any(x in tool_name.lower() for x in ['n8n', 'workflow', 'automation']):
-            return 'n8n'
-        elif any(x in tool_name.lower() for x in ['mattermost', 'chat', 'message', 'channel', 'team', 'collaboration']):
-            return 'mattermost'
+        # Declared operations first, then domain keywords; GitHub otherwise
+        return self.routing.resolve(tool_name)
+
+    def _backend_semaphore(self, server: str) -> asyncio.Semaphore:
+        """Per-backend cap on concurrent calls (sized from its pool config)."""
+        semaphore = self._semaphores.get(server)
+        if semaphore is None:
+            pool = self.servers.get(server, {}).get('pool', {})
+            semaphore = asyncio.Semaphore(pool.get('max_concurrency', pool.get('max_connections', BACKEND_MAX_CONCURRENCY)))
+            self._semaphores[server] = semaphore
+        return semaphore
+
+    # ========================================================================
+    # Backend Requests
+    # ========================================================================
+
+    def _build_request(self, target_server: str, method: str, params: Dict[str, Any],
+                       tool_name: str, arguments: Dict[str, Any],
+                       token: Optional[str] = None) -> Tuple[str, str, Dict[str, Any]]:
+        """Build the (method, url, kwargs) upstream request for an HTTP backend."""
+        if target_server == 'github':
+            return self._build_pulser_hub_request(method, params)
+        elif target_server == 'digitalocean':
+            return self._build_digitalocean_request(tool_name, arguments)
+        elif target_server == 'supabase':
+            return self._build_supabase_request(tool_name, arguments)
+        elif target_server == 'superset':
+            return self._build_superset_request(tool_name, arguments, token)
+        elif target_server == 'n8n':
+            return self._build_n8n_request(tool_name, arguments)
         else:
-            # Default to GitHub for unknown operations
-            return 'github'
+            raise ValueError(f"Unsupported server: {target_server}")
 
-    async def _call_pulser_hub(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Call pulser-hub GitHub MCP server."""
+    def _build_pulser_hub_request(self, method: str, params: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """Build pulser-hub GitHub MCP request."""
         client_config = self.servers['github']
+        return 'POST', f"{client_config['url']}{client_config['endpoint']}", {
+            'json': {'method': method, 'params': params}
+        }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{client_config['url']}{client_config['endpoint']}",
-                json={'method': method, 'params': params}
-            )
-            response.raise_for_status()
-            return response.json()
+    async def _call_pulser_hub(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call pulser-hub GitHub MCP server."""
+        http_method, url, kwargs = self._build_pulser_hub_request(method, params)
+        response = await self._request('github', http_method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
 
-    async def _call_digitalocean(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call DigitalOcean API."""
+    def _build_digitalocean_request(self, operation: str, arguments: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """Build DigitalOcean API request."""
         client_config = self.servers['digitalocean']
 
         # Map operation to DO API endpoint
@@ -254,16 +817,17 @@ async def _call_digitalocean(self, operation: str, arguments: Dict[str, Any]) ->
         # Replace path parameters
         endpoint = endpoint.format(**arguments)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{client_config['url']}{endpoint}",
-                headers=client_config['headers']
-            )
-            response.raise_for_status()
-            return response.json()
+        return 'GET', f"{client_config['url']}{endpoint}", {'headers': client_config['headers']}
 
-    async def _call_supabase(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call Supabase REST API."""
+    async def _call_digitalocean(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call DigitalOcean API."""
+        http_method, url, kwargs = self._build_digitalocean_request(operation, arguments)
+        response = await self._request('digitalocean', http_method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def _build_supabase_request(self, operation: str, arguments: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """Build Supabase REST API request."""
         client_config = self.servers['supabase']
 
         if operation == 'execute_sql' or operation == 'rpc':
@@ -271,45 +835,38 @@ async def _call_supabase(self, operation: str, arguments: Dict[str, Any]) -> Dic
             function_name = arguments.get('function', 'rpc')
             params = arguments.get('params', {})
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{client_config['url']}/rest/v1/rpc/{function_name}",
-                    headers=client_config['headers'],
-                    json=params
-                )
-                response.raise_for_status()
-                return response.json()
-        else:
-            # REST API operation
-            table = arguments.get('table', '')
-            method = arguments.get('method', 'GET')
-            data = arguments.get('data', {})
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if method == 'GET':
-                    response = await client.get(
-                        f"{client_config['url']}/rest/v1/{table}",
-                        headers=client_config['headers']
-                    )
-                elif method == 'POST':
-                    response = await client.post(
-                        f"{client_config['url']}/rest/v1/{table}",
-                        headers=client_config['headers'],
-                        json=data
-                    )
-                response.raise_for_status()
-                return response.json()
-
-    async def _call_superset(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call Apache Superset API."""
-        # First, get access token
-        token = await self._get_superset_token()
+            return 'POST', f"{client_config['url']}/rest/v1/rpc/{function_name}", {
+                'headers': client_config['headers'],
+                'json': params
+            }
+
+        # REST API operation
+        table = arguments.get('table', '')
+        method = arguments.get('method', 'GET')
+        data = arguments.get('data', {})
+
+        if method == 'GET':
+            return 'GET', f"{client_config['url']}/rest/v1/{table}", {
+                'headers': client_config['headers']
+            }
+        elif method == 'POST':
+            return 'POST', f"{client_config['url']}/rest/v1/{table}", {
+                'headers': client_config['headers'],
+                'json': data
+            }
+        raise ValueError(f"Unsupported Supabase method: {method}")
 
+    async def _call_supabase(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call Supabase REST API."""
+        http_method, url, kwargs = self._build_supabase_request(operation, arguments)
+        response = await self._request('supabase', http_method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def _build_superset_request(self, operation: str, arguments: Dict[str, Any],
+                                token: Optional[str]) -> Tuple[str, str, Dict[str, Any]]:
+        """Build an authenticated Apache Superset API request."""
         client_config = self.servers['superset']
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
 
         # Map operation to Superset API endpoint
         endpoint_map = {
@@ -323,39 +880,57 @@ async def _call_superset(self, operation: str, arguments: Dict[str, Any]) -> Dic
         if not endpoint:
             raise ValueError(f"Unknown Superset operation: {operation}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if operation == 'execute_sql':
-                response = await client.post(
-                    f"{client_config['url']}{endpoint}",
-                    headers=headers,
-                    json=arguments
-                )
-            else:
-                response = await client.get(
-                    f"{client_config['url']}{endpoint}",
-                    headers=headers
-                )
-            response.raise_for_status()
-            return response.json()
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+
+        if operation == 'execute_sql':
+            return 'POST', f"{client_config['url']}{endpoint}", {'headers': headers, 'json': arguments}
+        return 'GET', f"{client_config['url']}{endpoint}", {'headers': headers}
+
+    async def _call_superset(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call Apache Superset API."""
+        # Cached token; on 401 drop it and retry once with a fresh login
+        token = await self._get_superset_token()
+        http_method, url, kwargs = self._build_superset_request(operation, arguments, token)
+        response = await self._request('superset', http_method, url, **kwargs)
+
+        if response.status_code == 401:
+            self.superset_tokens.invalidate(self._superset_token_key(), token)
+            token = await self._get_superset_token()
+            http_method, url, kwargs = self._build_superset_request(operation, arguments, token)
+            response = await self._request('superset', http_method, url, **kwargs)
+
+        response.raise_for_status()
+        return response.json()
+
+    def _superset_token_key(self) -> Tuple[str, str]:
+        return (self.servers['superset']['url'], SUPERSET_USERNAME)
 
     async def _get_superset_token(self) -> str:
-        """Get Superset access token."""
+        """Get Superset access token (cached until shortly before expiry)."""
+        return await self.superset_tokens.get(self._superset_token_key(), self._login_superset)
+
+    async def _login_superset(self) -> str:
+        """Log in to Superset and return a new access token."""
         client_config = self.servers['superset']
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{client_config['url']}/api/v1/security/login",
-                json={
-                    'username': SUPERSET_USERNAME,
-                    'password': SUPERSET_PASSWORD,
-                    'provider': 'db'
-                }
-            )
-            response.raise_for_status()
-            return response.json()['access_token']
+        response = await self._request(
+            'superset', 'POST',
+            f"{client_config['url']}/api/v1/security/login",
+            json={
+                'username': SUPERSET_USERNAME,
+                'password': SUPERSET_PASSWORD,
+                'provider': 'db'
+            },
+            timeout=10.0
+        )
+        response.raise_for_status()
+        return response.json()['access_token']
 
-    async def _call_n8n(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call n8n API."""
+    def _build_n8n_request(self, operation: str, arguments: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """Build n8n API request."""
         client_config = self.servers['n8n']
 
         # Map operations to n8n API endpoints
@@ -372,21 +947,19 @@ async def _call_n8n(self, operation: str, arguments: Dict[str, Any]) -> Dict[str
         # Replace path parameters
         endpoint = endpoint.format(**arguments)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if operation == 'trigger_workflow':
-                # Webhook trigger
-                response = await client.post(
-                    f"{client_config['url']}{endpoint}",
-                    json=arguments.get('data', {})
-                )
-            else:
-                # API call
-                response = await client.get(
-                    f"{client_config['url']}{endpoint}",
-                    headers=client_config['headers']
-                )
-            response.raise_for_status()
-            return response.json()
+        if operation == 'trigger_workflow':
+            # Webhook trigger
+            return 'POST', f"{client_config['url']}{endpoint}", {'json': arguments.get('data', {})}
+
+        # API call
+        return 'GET', f"{client_config['url']}{endpoint}", {'headers': client_config['headers']}
+
+    async def _call_n8n(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call n8n API."""
+        http_method, url, kwargs = self._build_n8n_request(operation, arguments)
+        response = await self._request('n8n', http_method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
 
     async def _call_mattermost(self, operation: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call Mattermost MCP server."""
@@ -419,15 +992,55 @@ async def _call_mattermost(self, operation: str, arguments: Dict[str, Any]) -> D
 coordinator = MCPCoordinator()
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Open pooled backend connections."""
+    await coordinator.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled backend connections."""
+    await coordinator.close()
+
+
 # ============================================================================
 # MCP Protocol Handlers
 # ============================================================================
 
 @app.post("/mcp")
 async def mcp_handler(request: Request):
-    """Main MCP protocol handler with intelligent routing."""
+    """
+    Main MCP protocol handler with intelligent routing.
+
+    Accepts a single request object or a JSON-RPC style batch array; batch
+    entries are executed concurrently and answered in request order.
+    """
     try:
         body = await request.json()
+    except Exception as e:
+        logger.error(f"MCP handler error: {str(e)}")
+        return MCPResponse(
+            error={"code": "parse_error", "message": str(e)}
+        ).dict()
+
+    if isinstance(body, list):
+        if not body:
+            return MCPResponse(
+                error={"code": "invalid_request", "message": "Empty batch"}
+            ).dict()
+
+        logger.info(f"MCP batch request: {len(body)} calls")
+        return list(await asyncio.gather(*(handle_mcp_request(item) for item in body)))
+
+    return await handle_mcp_request(body)
+
+
+async def handle_mcp_request(body: Any) -> Dict[str, Any]:
+    """Handle one MCP request object, returning an MCPResponse dict."""
+    request_id = body.get('id') if isinstance(body, dict) else None
+
+    try:
         mcp_request = MCPRequest(**body)
 
         logger.info(f"MCP request: {mcp_request.method}")
@@ -443,15 +1056,17 @@ async def mcp_handler(request: Request):
             )
         else:
             return MCPResponse(
-                error={"code": "method_not_found", "message": f"Unknown method: {mcp_request.method}"}
+                error={"code": "method_not_found", "message": f"Unknown method: {mcp_request.method}"},
+                id=request_id
             ).dict()
 
-        return MCPResponse(result=result).dict()
+        return MCPResponse(result=result, id=request_id).dict()
 
     except Exception as e:
         logger.error(f"MCP handler error: {str(e)}")
         return MCPResponse(
-            error={"code": "internal_error", "message": str(e)}
+            error={"code": "internal_error", "message": str(e)},
+            id=request_id
         ).dict()
 
 
@@ -527,13 +1142,56 @@ async def event_generator() -> AsyncIterator[str]:
     )
 
 
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/sse")
+async def sse_stream_endpoint(request: Request):
+    """
+    Stream a tools/call result over Server-Sent Events.
+
+    Emits progress events, then the upstream body chunk-by-chunk as it is
+    received, then a done (or error) event.
+    """
+    try:
+        mcp_request = MCPRequest(**(await request.json()))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid MCP request: {e}")
+
+    if mcp_request.method != "tools/call":
+        raise HTTPException(status_code=400, detail="Only tools/call can be streamed")
+
+    async def event_generator() -> AsyncIterator[str]:
+        try:
+            async for event in coordinator.stream_request(
+                mcp_request.method,
+                mcp_request.params,
+                mcp_request.server
+            ):
+                yield _sse_event(event['event'], event['data'])
+        except Exception as e:
+            logger.error(f"MCP stream error: {str(e)}")
+            yield _sse_event('error', {'code': 'internal_error', 'message': str(e)})
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
         "servers": list(coordinator.servers.keys()),
-        "pulser_hub_url": PULSER_HUB_URL
+        "pulser_hub_url": PULSER_HUB_URL,
+        "pools": coordinator.pool_metrics(),
+        "superset_token_cache": coordinator.superset_tokens.stats,
+        "result_cache": coordinator.result_cache.metrics() if coordinator.result_cache else None
     }
 
 
@@ -556,6 +1214,7 @@ async def root():
         "endpoints": {
             "mcp": "/mcp",
             "sse": "/sse",
+            "stream": "/sse (POST tools/call)",
             "health": "/health"
         },
         "docs": "/docs"
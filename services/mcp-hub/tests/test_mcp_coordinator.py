@@ -1,5 +1,17 @@
+import asyncio
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
 import pytest
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import coordinator as mcp  # noqa: E402
+
 pytestmark = pytest.mark.mcp
 
 def test_service_registration():
@@ -25,3 +37,364 @@ def test_circuit_breaker_logic():
 def test_multi_service_coordination():
     """Coordinator can orchestrate 8+ services in a flow."""
     pass
+
+
+# ---------------------------------------------------------------------------
+# Coordinator behaviour (backends mocked with httpx.MockTransport)
+# ---------------------------------------------------------------------------
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_pooled_client_reused_across_calls():
+    """Each backend gets one long-lived client that is reused per call."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"apps": []})
+
+    async def scenario():
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler))
+        await hub.start()
+        client = hub.clients["digitalocean"]
+        await hub.route_request("tools/call", {"name": "list_apps"}, "digitalocean")
+        await hub.route_request("tools/call", {"name": "list_apps"}, "digitalocean")
+        assert hub.clients["digitalocean"] is client
+        metrics = hub.pool_metrics()["digitalocean"]
+        await hub.close()
+        assert hub.clients == {}
+        return metrics
+
+    metrics = _run(scenario())
+    assert calls == ["/v2/apps", "/v2/apps"]
+    assert metrics["requests"] == 2
+    assert metrics["errors"] == 0
+    assert metrics["in_flight"] == 0
+
+
+def test_pool_metrics_count_transport_errors():
+    """Transport failures are counted against the backend pool."""
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def scenario():
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler))
+        try:
+            await hub.route_request("tools/call", {"name": "list_apps"}, "digitalocean")
+        except httpx.ConnectError:
+            pass
+        metrics = hub.pool_metrics()["digitalocean"]
+        await hub.close()
+        return metrics
+
+    metrics = _run(scenario())
+    assert metrics["requests"] == 1
+    assert metrics["errors"] == 1
+    assert metrics["in_flight"] == 0
+
+
+def _jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_superset_token_reused_until_expiry():
+    """Superset login happens once for many calls within the token lifetime."""
+    logins = []
+
+    def handler(request):
+        if request.url.path == "/api/v1/security/login":
+            logins.append(1)
+            return httpx.Response(200, json={"access_token": _jwt(time.time() + 900)})
+        return httpx.Response(200, json={"result": []})
+
+    async def scenario():
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler))
+        await asyncio.gather(*(
+            hub.route_request("tools/call", {"name": "list_datasets"}, "superset")
+            for _ in range(5)
+        ))
+        await hub.close()
+
+    _run(scenario())
+    assert len(logins) == 1
+
+
+def test_superset_401_triggers_single_relogin():
+    """A rejected token is dropped and the call retried once with a new one."""
+    tokens = iter([_jwt(time.time() + 900), _jwt(time.time() + 901)])
+    seen = []
+
+    def handler(request):
+        if request.url.path == "/api/v1/security/login":
+            return httpx.Response(200, json={"access_token": next(tokens)})
+        seen.append(request.headers["Authorization"])
+        if len(seen) == 1:
+            return httpx.Response(401, json={"msg": "Token has expired"})
+        return httpx.Response(200, json={"result": []})
+
+    async def scenario():
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler))
+        result = await hub.route_request("tools/call", {"name": "list_datasets"}, "superset")
+        stats = dict(hub.superset_tokens.stats)
+        await hub.close()
+        return result, stats
+
+    result, stats = _run(scenario())
+    assert result == {"result": []}
+    assert len(seen) == 2 and seen[0] != seen[1]
+    assert stats["logins"] == 2
+    assert stats["invalidations"] == 1
+
+
+def test_superset_token_refreshed_in_background_near_expiry():
+    """Tokens inside the refresh margin are served while a refresh runs."""
+    cache = mcp.SupersetTokenCache(refresh_margin=60)
+    logins = []
+
+    async def login():
+        logins.append(1)
+        return _jwt(time.time() + (30 if len(logins) == 1 else 900))
+
+    async def scenario():
+        first = await cache.get(("url", "admin"), login)
+        second = await cache.get(("url", "admin"), login)
+        await asyncio.sleep(0)
+        third = await cache.get(("url", "admin"), login)
+        await cache.close()
+        return first, second, third
+
+    first, second, third = _run(scenario())
+    assert first == second
+    assert third != first
+    assert len(logins) == 2
+
+
+@pytest.mark.parametrize("tool_name, server", [
+    ("list_datasets", "superset"),
+    ("superset_execute_sql", "superset"),
+    ("supabase_execute_sql", "supabase"),
+    ("n8n_list_workflows", "n8n"),
+    ("mattermost_send_expense_approval", "mattermost"),
+    ("github_create_pr", "github"),
+    ("do_list_apps", "digitalocean"),
+    ("do_create_deployment", "digitalocean"),
+    ("trigger_workflow", "n8n"),
+    ("run_workflow", "n8n"),
+    ("github_trigger_workflow", "github"),
+    ("query_database", "supabase"),
+    ("query_datasource", "github"),
+    ("get_workbook", "github"),
+    ("get_view", "github"),
+    ("create_page", "github"),
+    ("unknown_tool", "github"),
+])
+def test_routing_index(tool_name, server):
+    """Declared operations and domain keywords resolve via the compiled index."""
+    hub = mcp.MCPCoordinator()
+    assert hub.routing.resolve(tool_name) == server
+    assert server in mcp.DISPATCH_SERVERS
+
+
+class _FakeRequest:
+    def __init__(self, body):
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+
+def test_batch_tools_call_runs_concurrently(monkeypatch):
+    """Batch entries are dispatched together and answered in order with ids."""
+    active = {"now": 0, "peak": 0}
+
+    async def fake_dispatch(self, target_server, method, params, tool_name, arguments):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return {"server": target_server, "tool": tool_name}
+
+    monkeypatch.setattr(mcp.MCPCoordinator, "_dispatch", fake_dispatch)
+    monkeypatch.setattr(mcp, "coordinator", mcp.MCPCoordinator())
+
+    batch = [
+        {"id": i, "method": "tools/call", "params": {"name": "list_apps"}}
+        for i in range(20)
+    ]
+    batch.append({"id": "bad", "method": "nope"})
+
+    responses = _run(mcp.mcp_handler(_FakeRequest(batch)))
+
+    assert [r["id"] for r in responses] == list(range(20)) + ["bad"]
+    assert responses[0]["result"] == {"server": "digitalocean", "tool": "list_apps"}
+    assert responses[-1]["error"]["code"] == "method_not_found"
+    assert active["peak"] == 10  # digitalocean pool/concurrency limit
+
+
+def test_result_cache_coalesces_and_invalidates_on_mutation():
+    """Reads are cached per arguments; a successful write flushes the backend."""
+    hits = []
+
+    def handler(request):
+        hits.append((request.method, request.url.path))
+        return httpx.Response(200, json={"apps": len(hits)})
+
+    async def scenario():
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler), result_cache=True)
+        call = {"name": "list_apps", "arguments": {}}
+        first = await asyncio.gather(*(
+            hub.route_request("tools/call", call, "digitalocean") for _ in range(5)
+        ))
+        cached = await hub.route_request("tools/call", call, "digitalocean")
+        await hub.route_request(
+            "tools/call", {"name": "create_deployment", "arguments": {"app_id": "a1"}}, "digitalocean"
+        )
+        fresh = await hub.route_request("tools/call", call, "digitalocean")
+        metrics = hub.result_cache.metrics()
+        await hub.close()
+        return first, cached, fresh, metrics
+
+    first, cached, fresh, metrics = _run(scenario())
+    assert all(result == {"apps": 1} for result in first)
+    assert cached == {"apps": 1}
+    assert fresh == {"apps": 3}
+    assert len(hits) == 3
+    assert metrics["misses"] == 2
+    assert metrics["hits"] + metrics["coalesced"] == 5
+    assert metrics["invalidations"] == 1
+
+
+def test_result_cache_single_flight():
+    """Concurrent misses for one key share a single upstream fetch."""
+    cache = mcp.ResultCache()
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        await asyncio.sleep(0.01)
+        return {"datasets": []}
+
+    async def scenario():
+        key = cache.make_key("superset", "list_datasets", {})
+        return await asyncio.gather(*(cache.get_or_fetch(key, 60, fetch) for _ in range(10)))
+
+    results = _run(scenario())
+    assert len(fetches) == 1
+    assert all(result == {"datasets": []} for result in results)
+    assert cache.stats["coalesced"] == 9
+
+
+def test_result_cache_leader_cancellation_not_shared():
+    """A coalesced caller takes over the fetch when the leader is cancelled."""
+    cache = mcp.ResultCache()
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        await asyncio.sleep(0.01)
+        return {"datasets": len(fetches)}
+
+    async def scenario():
+        key = cache.make_key("superset", "list_datasets", {})
+        leader = asyncio.ensure_future(cache.get_or_fetch(key, 60, fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_fetch(key, 60, fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert _run(scenario()) == {"datasets": 2}
+    assert len(fetches) == 2
+    assert cache.stats["coalesced"] == 1
+
+
+def test_result_cache_is_opt_in():
+    """Without the cache every read goes upstream."""
+    hits = []
+
+    def handler(request):
+        hits.append(1)
+        return httpx.Response(200, json={"data": []})
+
+    async def scenario():
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler), result_cache=False)
+        for _ in range(3):
+            await hub.route_request("tools/call", {"name": "list_workflows"}, "n8n")
+        await hub.close()
+
+    _run(scenario())
+    assert len(hits) == 3
+
+
+def test_result_cache_lru_eviction():
+    """Oldest entries are evicted once max_entries is reached."""
+    cache = mcp.ResultCache(max_entries=2)
+
+    async def scenario():
+        for table in ("a", "b", "c"):
+            key = cache.make_key("supabase", "query", {"table": table})
+            await cache.get_or_fetch(key, 60, lambda: asyncio.sleep(0, result=table))
+
+    _run(scenario())
+    assert cache.metrics()["entries"] == 2
+    assert cache.stats["evictions"] == 1
+
+
+class _GatedStream(httpx.AsyncByteStream):
+    """Upstream body whose second chunk is held until the test releases it."""
+
+    def __init__(self, release):
+        self.release = release
+
+    async def __aiter__(self):
+        yield b'{"rows": [1, 2'
+        await self.release.wait()
+        yield b', 3]}'
+
+
+def test_stream_request_relays_chunks_before_upstream_finishes():
+    """First chunk reaches the subscriber while upstream is still sending."""
+    async def scenario():
+        release = asyncio.Event()
+
+        def handler(request):
+            return httpx.Response(200, stream=_GatedStream(release),
+                                  headers={"content-type": "application/json"})
+
+        hub = mcp.MCPCoordinator(transport=httpx.MockTransport(handler))
+        events = []
+        async for event in hub.stream_request(
+            "tools/call", {"name": "get_execution", "arguments": {"execution_id": "7"}}, "n8n"
+        ):
+            events.append(event)
+            if event["event"] == "chunk" and not release.is_set():
+                release.set()
+        await hub.close()
+        return events
+
+    events = _run(scenario())
+    kinds = [event["event"] for event in events]
+    assert kinds == ["progress", "progress", "chunk", "chunk", "done"]
+    assert "".join(e["data"]["text"] for e in events if e["event"] == "chunk") == '{"rows": [1, 2, 3]}'
+    assert events[-1]["data"]["bytes_received"] == 19
+
+
+def test_stream_request_falls_back_for_non_http_backends():
+    """Backends without an upstream HTTP API emit a single result event."""
+    async def scenario():
+        hub = mcp.MCPCoordinator()
+        events = [event async for event in hub.stream_request(
+            "tools/call", {"name": "send_message", "arguments": {"channel": "ops"}}, "mattermost"
+        )]
+        await hub.close()
+        return events
+
+    events = _run(scenario())
+    assert [event["event"] for event in events] == ["progress", "result"]
+    assert events[1]["data"]["status"] == "success"
@@ -0,0 +1,17 @@
+-- Wake outbox workers on new work (LISTEN odoo_outbox) instead of polling
+
+create or replace function ops.notify_odoo_outbox()
+returns trigger
+language plpgsql
+as $$
+begin
+  -- One notification per statement; payload-less, workers just drain the queue
+  perform pg_notify('odoo_outbox', '');
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_notify_odoo_outbox on ops.odoo_outbox;
+create trigger trg_notify_odoo_outbox
+after insert on ops.odoo_outbox
+for each statement execute function ops.notify_odoo_outbox();
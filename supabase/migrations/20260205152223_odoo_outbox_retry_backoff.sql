@@ -0,0 +1,9 @@
+-- Hold failed outbox records back until their retry backoff has elapsed
+
+alter table ops.odoo_outbox
+  add column if not exists next_attempt_at timestamptz;
+
+-- Claim query: queued records that are due (NULL = due immediately)
+create index if not exists odoo_outbox_queued_due_idx
+  on ops.odoo_outbox(created_at)
+  where status = 'queued';
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the Supabase → Odoo outbox worker.
+"""
+
+import importlib.util
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "outbox-worker.py"
+spec = importlib.util.spec_from_file_location("outbox_worker", SCRIPT)
+outbox_worker = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(outbox_worker)
+
+
+class StubOdooClient(outbox_worker.OdooClient):
+    """Records grouped calls; rejects payloads flagged as bad."""
+
+    def __init__(self):
+        super().__init__("http://odoo", "odoo", "admin", "admin")
+        self.calls = []
+
+    def upsert_many(self, model, values_list):
+        self.calls.append(("upsert", model, len(values_list)))
+        if any(values.get("bad") for values in values_list):
+            raise ValueError("invalid payload")
+        return list(range(len(values_list)))
+
+    def delete_many(self, model, record_ids):
+        self.calls.append(("delete", model, len(record_ids)))
+        return True
+
+
+def make_record(record_id, model="res.partner", operation="upsert", **payload):
+    return outbox_worker.OutboxRecord(
+        id=record_id,
+        model=model,
+        operation=operation,
+        payload=payload or {"odoo_id": record_id},
+        idempotency_key=f"key-{record_id}",
+        status="processing",
+        attempts=0,
+        locked_at=None,
+        locked_by="worker-test",
+        last_error=None,
+        created_at=datetime.now(),
+    )
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    worker = outbox_worker.OutboxWorker(
+        "postgresql://unused", StubOdooClient(), workers=4, group_size=3
+    )
+    applied = []
+    monkeypatch.setattr(worker, "_apply_outcomes", applied.extend)
+    worker.applied = applied
+    yield worker
+    worker.close()
+
+
+class TestConcurrentProcessing:
+    """Test grouped concurrent processing."""
+
+    def test_records_grouped_by_model_and_operation(self, worker):
+        """Records are sent as multi-record calls of at most group_size."""
+        batch = [make_record(i) for i in range(7)]
+        batch += [make_record(10, model="account.move", operation="delete")]
+
+        assert worker.process_batch_concurrent(batch) == 8
+
+        calls = sorted(worker.odoo_client.calls)
+        assert calls == [
+            ("delete", "account.move", 1),
+            ("upsert", "res.partner", 1),
+            ("upsert", "res.partner", 3),
+            ("upsert", "res.partner", 3),
+        ]
+        assert len(worker.applied) == 8
+        assert all(error is None for _, error in worker.applied)
+
+    def test_failed_group_retried_per_record(self, worker):
+        """One bad payload fails only its own record."""
+        batch = [make_record(1), make_record(2, bad=True), make_record(3)]
+
+        assert worker.process_batch_concurrent(batch) == 2
+
+        errors = {record.id: error for record, error in worker.applied}
+        assert errors[1] is None and errors[3] is None
+        assert errors[2] == "invalid payload"
+
+    def test_same_record_keeps_queue_order(self, worker, monkeypatch):
+        """An upsert then a delete of one record never race each other."""
+        upsert_many = worker.odoo_client.upsert_many
+
+        def slow_upsert_many(model, values_list):
+            time.sleep(0.05)
+            return upsert_many(model, values_list)
+
+        monkeypatch.setattr(worker.odoo_client, "upsert_many", slow_upsert_many)
+        batch = [
+            make_record(1, odoo_id=5),
+            make_record(2, odoo_id=6),
+            make_record(3, operation="delete", odoo_id=5),
+            make_record(4, odoo_id=6),
+        ]
+
+        assert worker.process_batch_concurrent(batch) == 4
+        assert worker.odoo_client.calls == [
+            ("upsert", "res.partner", 2),
+            ("delete", "res.partner", 1),
+            ("upsert", "res.partner", 1),
+        ]
+        assert [record.id for record, _ in worker.applied] == [1, 2, 3, 4]
+
+    def test_delete_without_id_is_rejected(self, worker):
+        """Delete payloads need an odoo_id or id."""
+        batch = [make_record(1, operation="delete", name="x")]
+
+        assert worker.process_batch_concurrent(batch) == 0
+        assert "requires 'odoo_id'" in worker.applied[0][1]
+
+
+class FakeListenConnection:
+    """Socket-backed stand-in for a LISTENing psycopg2 connection."""
+
+    def __init__(self):
+        import socket
+
+        self.reader, self.writer = socket.socketpair()
+        self.notifies = []
+
+    def fileno(self):
+        return self.reader.fileno()
+
+    def notify(self):
+        self.writer.send(b"x")
+
+    def poll(self):
+        self.reader.recv(1024)
+        self.notifies.append(("odoo_outbox", ""))
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+
+
+class TestListenMode:
+    """Test NOTIFY-driven wakeups."""
+
+    def test_wait_returns_on_notify(self, worker):
+        """A pending notification wakes the worker immediately."""
+        worker._listen_conn = FakeListenConnection()
+        worker._listen_conn.notify()
+
+        assert worker.wait_for_notify(timeout=5) is True
+        assert worker._listen_conn.notifies == []
+
+    def test_wait_times_out_without_querying(self, worker):
+        """Without notifications the wait ends at the timeout."""
+        worker._listen_conn = FakeListenConnection()
+
+        assert worker.wait_for_notify(timeout=0.05) is False
+
+    def test_drain_stops_after_short_batch(self, worker, monkeypatch):
+        """Full batches are fetched back to back until the queue empties."""
+        worker.batch_size = 2
+        batches = [[make_record(1), make_record(2)], [make_record(3)], [make_record(4)]]
+        monkeypatch.setattr(worker, "fetch_batch", lambda: batches.pop(0))
+
+        assert worker.drain() == 3
+        assert len(batches) == 1
+
+    def test_failed_records_wait_out_backoff(self, worker, monkeypatch):
+        """A failing record is not reclaimed until its backoff has elapsed."""
+        fetches, timeouts, rows = [], [], []
+
+        def fetch_batch():
+            fetches.append(time.monotonic())
+            return [make_record(1, bad=True)] if len(fetches) == 1 else []
+
+        def wait_for_notify(timeout):
+            timeouts.append(timeout)
+            worker.running = False
+            return False
+
+        monkeypatch.setattr(worker, "fetch_batch", fetch_batch)
+        monkeypatch.setattr(worker, "wait_for_notify", wait_for_notify)
+        monkeypatch.setattr(
+            worker, "_apply_outcomes", lambda outcomes: rows.extend(worker._outcome_rows(outcomes))
+        )
+        worker._listen_conn = FakeListenConnection()
+
+        worker.run_listen()
+
+        backoff = outbox_worker.INITIAL_BACKOFF_SECONDS * 2
+        assert rows == [(1, "queued", 1, "invalid payload", backoff)]
+        assert len(fetches) == 1  # drain stopped instead of re-claiming the record
+        assert backoff < timeouts[0] <= backoff + outbox_worker.RETRY_WAKE_SLACK_SECONDS
+        assert timeouts[0] < outbox_worker.LISTEN_FALLBACK_POLL_SECONDS
+
+    def test_retry_status_sets_backoff(self, worker):
+        """Retries carry a backoff; permanent failures do not."""
+        assert worker._retry_status(1, 0) == ("queued", 1, 20)
+        assert worker._retry_status(1, outbox_worker.MAX_RETRIES - 1) == (
+            "failed",
+            outbox_worker.MAX_RETRIES,
+            None,
+        )
+        assert 20 < worker.seconds_until_retry() <= 21
+
+
+class TestMetrics:
+    """Test the worker metrics surface."""
+
+    def test_batch_updates_counters_and_stages(self, worker):
+        """Processing a batch records throughput, stage timings and lag."""
+        worker.process_batch([make_record(1), make_record(2, bad=True)])
+
+        metrics = worker.metrics
+        assert metrics.counters["records_processed_total"] == 1
+        assert metrics.counters["records_failed_total"] == 1
+        assert metrics.counters["batches_total"] == 1
+        assert metrics.stage_seconds["odoo"].count == 3  # group + 2 individual retries
+        assert metrics.sync_lag_seconds.count == 1
+
+    def test_render_prometheus_text(self, worker):
+        """Metrics render in Prometheus text exposition format."""
+        worker.metrics.inc("lock_expiry_reclaims_total", 2)
+        with worker.metrics.time_stage("claim"):
+            pass
+
+        text = worker.metrics.render()
+        assert "outbox_lock_expiry_reclaims_total 2" in text
+        assert 'outbox_stage_duration_seconds_bucket{stage="claim",le="+Inf"} 1' in text
+        assert 'outbox_stage_duration_seconds_count{stage="claim"} 1' in text
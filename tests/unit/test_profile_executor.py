@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the shared repository snapshot and profile executor.
+"""
+
+import pickle
+
+import pytest
+
+from agents import profile_executor
+from agents.profile_executor import build_snapshot, run_profile_skills
+
+
+def make_module(root, name, depends=(), manifest=None):
+    module = root / name
+    module.mkdir(parents=True)
+    (module / "__init__.py").write_text("")
+    (module / "__manifest__.py").write_text(
+        manifest or repr({"name": name, "depends": list(depends)})
+    )
+    return module
+
+
+@pytest.fixture
+def repo(tmp_path):
+    addons = tmp_path / "odoo_addons"
+    make_module(addons, "ipai_base")
+    make_module(addons, "ipai_sales", depends=["ipai_base", "sale"])
+    make_module(addons, "broken", manifest="{'name': ")
+    (addons / "not_a_module").mkdir()
+    make_module(tmp_path / "addons", "ipai_base")
+    return tmp_path
+
+
+def test_snapshot_parses_each_manifest_once(repo):
+    snapshot = build_snapshot(repo)
+
+    assert snapshot.addons_path == repo / "odoo_addons"
+    assert [m.name for m in snapshot.modules] == ["broken", "ipai_base", "ipai_sales"]
+    assert snapshot.module("ipai_sales").depends == ("ipai_base", "sale")
+    assert snapshot.module("ipai_sales").has_file("__init__.py")
+    assert snapshot.module("broken").manifest is None
+    assert "Failed to load manifest" in snapshot.module("broken").manifest_error
+    assert snapshot.dependents("ipai_base") == ["ipai_sales"]
+    assert snapshot.addon_directories == {
+        "odoo_addons": ("broken", "ipai_base", "ipai_sales"),
+        "addons": ("ipai_base",),
+    }
+
+
+def test_snapshot_is_immutable_and_picklable(repo):
+    snapshot = build_snapshot(repo)
+
+    with pytest.raises(AttributeError):
+        snapshot.modules = ()
+    assert pickle.loads(pickle.dumps(snapshot)).dependents("ipai_base") == ["ipai_sales"]
+
+
+def test_snapshot_falls_back_to_repo_root(tmp_path):
+    make_module(tmp_path, "ipai_root")
+
+    snapshot = build_snapshot(tmp_path)
+
+    assert snapshot.addons_path == tmp_path
+    assert [m.name for m in snapshot.modules] == ["ipai_root"]
+
+
+@pytest.fixture
+def fake_skills(monkeypatch):
+    seen = []
+
+    def ok_skill(params):
+        seen.append(params)
+        return {"ok": True}
+
+    def failing_skill(params):
+        raise RuntimeError("boom")
+
+    skills = {"a.ok": ok_skill, "b.fail": failing_skill}
+    monkeypatch.setattr(
+        profile_executor,
+        "load_registry",
+        lambda: {"a.ok": {}, "b.fail": {}, "c.prompt": {"anthropic": True}},
+    )
+    monkeypatch.setattr(profile_executor, "get_skill", lambda sid: (skills[sid], {}))
+    monkeypatch.setattr(profile_executor, "validate_skill_inputs", lambda sid, p: None)
+    return seen
+
+
+def test_run_profile_skills_shares_snapshot(repo, fake_skills):
+    results = run_profile_skills(
+        ["c.prompt", "a.ok", "b.fail"], {"repo_path": str(repo)}, max_workers=1
+    )
+
+    assert list(results) == ["c.prompt", "a.ok", "b.fail"]
+    assert results["c.prompt"] == {"skipped": "Anthropic skill"}
+    assert results["a.ok"] == {"ok": True}
+    assert results["b.fail"] == {"error": "boom"}
+    assert fake_skills[0]["snapshot"].module("ipai_base") is not None
+
+
+def test_run_profile_skills_fix_reads_live_tree(repo, fake_skills):
+    run_profile_skills(["a.ok"], {"repo_path": str(repo), "fix": True})
+
+    assert "snapshot" not in fake_skills[0]